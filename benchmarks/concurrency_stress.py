@@ -0,0 +1,140 @@
+"""Several CampTrack processes writing the same data folder at once.
+
+Each writer process sends messages (marking some read, which compacts
+the message log), adds notifications, edits one shared camp (adds a
+camper, tops up its food stock, assigns a leader and logs food usage for
+a day, with a tiny compaction threshold so the camp snapshot is
+rewritten often), sets food requirements and disables accounts.
+Afterwards every write from every process must be on disk, and the food
+figures must add up; anything missing was clobbered by a concurrent
+save. Runs in a temporary folder, not data/.
+
+    python benchmarks/concurrency_stress.py [--writers 6] [--ops 40]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CAMP = "Stress Camp"
+FOOD_STOCK = 100
+
+
+def _writer(folder, writer, ops):
+    # imported here: the modules read CAMPTRACK_DATA_DIR when first imported
+    sys.path.insert(0, ROOT)
+    os.chdir(folder)  # logins.txt / disabled_logins.txt live in the working folder
+    from camp_class import read_from_file, save_to_file
+    from storage import camp_log
+    from features.notifications import add_notification
+    from features.scout import save_food_requirement
+    from user_logins import disabled_accounts
+    import messaging
+
+    camp_log.COMPACT_BYTES = 4_000
+    messaging.message_store.COMPACT_MARKERS = 3
+    me = f"writer{writer}"
+    for op in range(ops):
+        tag = f"{writer}:{op}"
+        messaging.send_message(me, "hub", tag)
+        messaging.send_message("hub", me, tag)
+        if op % 4 == 3:
+            messaging.mark_conversation_as_read(me, "hub")
+        add_notification(tag)
+        camp = read_from_file().find(CAMP)
+        camp.add_camper(f"cmp_{writer}_{op}", {"name": f"Camper {tag}", "age": "12", "activities": []})
+        # whole-field updates, saved as full values: these need merging, not just appending
+        camp.allocate_extra_food(1)
+        camp.scout_leaders.append(f"leader_{writer}_{op}")
+        camp.mark_dirty("scout_leaders")
+        date = f"2026-07-{op % 7 + 1:02d}"
+        camp.daily_food_usage[date] = camp.daily_food_usage.get(date, 0) + 1
+        camp.mark_dirty("daily_food_usage")
+        save_to_file()
+        save_food_requirement(f"camp {tag}", op)
+        disabled_accounts.disable(f"user_{writer}_{op}")
+
+
+def _check(folder, writers, ops):
+    """Names of the writes that did not survive, per kind."""
+    sys.path.insert(0, ROOT)
+    os.chdir(folder)
+    from camp_class import read_from_file
+    from features.notifications import load_notifications
+    from user_logins import disabled_accounts
+    import messaging
+
+    tags = {f"{w}:{op}" for w in range(writers) for op in range(ops)}
+    sent = [m for m in messaging.load_messages() if m["to"] == "hub"]
+    received = [m for m in messaging.load_messages() if m["from"] == "hub"]
+    with open(os.path.join(folder, "data", "food_requirements.json")) as file:
+        food = json.load(file)
+    camp = read_from_file().find(CAMP)
+    return {
+        "messages to hub": tags - {m["text"] for m in sent},
+        "messages from hub": tags - {m["text"] for m in received},
+        "duplicate messages": len(sent) + len(received) - 2 * len(tags),
+        "notifications": tags - {n["message"] for n in load_notifications()},
+        "campers": {f"cmp_{t.replace(':', '_')}" for t in tags} - set(camp.campers),
+        "duplicate campers": len(camp.campers) - len(set(camp.campers)),
+        "camper info": {f"cmp_{t.replace(':', '_')}" for t in tags} - set(camp.campers_info),
+        "leaders": {f"leader_{t.replace(':', '_')}" for t in tags} - set(camp.scout_leaders),
+        "duplicate leaders": len(camp.scout_leaders) - len(set(camp.scout_leaders)),
+        "food stock top-ups": len(tags) - (camp.food_stock - FOOD_STOCK),
+        "food usage units": len(tags) - sum(camp.daily_food_usage.values()),
+        "food requirements": {f"camp {t}" for t in tags} - set(food),
+        "disabled accounts": {f"user_{t.replace(':', '_')}" for t in tags} - set(disabled_accounts.names()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=6)
+    parser.add_argument("--ops", type=int, default=40, help="rounds of writes per process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        data = os.path.join(folder, "data")
+        os.makedirs(data)
+        os.environ["CAMPTRACK_DATA_DIR"] = data
+        with open(os.path.join(data, "camp_data.json"), "w") as file:
+            json.dump([{
+                "name": CAMP, "location": "Lakeside", "camp_type": "Day camp",
+                "start_date": "2026-07-01", "end_date": "2026-07-07", "food_stock": FOOD_STOCK,
+            }], file)
+
+        ctx = multiprocessing.get_context("spawn")
+        started = time.perf_counter()
+        procs = [ctx.Process(target=_writer, args=(folder, w, args.ops)) for w in range(args.writers)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        seconds = time.perf_counter() - started
+        if any(proc.exitcode for proc in procs):
+            sys.exit("a writer process failed")
+
+        with ctx.Pool(1) as pool:
+            lost = pool.apply(_check, (folder, args.writers, args.ops))
+
+    print(f"{args.writers} writers x {args.ops} rounds in {seconds:.1f}s")
+    failed = False
+    for kind, missing in lost.items():
+        count = missing if isinstance(missing, int) else len(missing)
+        if not count:
+            status = "ok"
+        elif isinstance(missing, int):
+            status = f"{count} extra" if kind.startswith("duplicate") else f"off by {count}"
+        else:
+            status = f"{count} lost"
+        print(f"  {kind:20} {status}")
+        failed = failed or bool(count)
+    assert not failed, "concurrent writers lost updates"
+
+
+if __name__ == "__main__":
+    main()
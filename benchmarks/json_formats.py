@@ -0,0 +1,106 @@
+"""Size and save/load time of camp_data.json in each on-disk format.
+
+Builds a synthetic set of camps with many activities, incidents and
+campers, then for every CAMPTRACK_JSON_FORMAT (and with and without
+orjson, when it is installed) times encoding + writing the snapshot and
+reading + decoding it again. A last table times parsing a message log
+line by line, as load_messages() does. Files go to a temporary folder.
+
+    python benchmarks/json_formats.py [--camps 50] [--days 30] [--messages 100000] [--runs 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from storage import serialization  # noqa: E402
+
+
+def _camps(count, days):
+    camps = []
+    for i in range(count):
+        campers = [f"cmp_{i:03d}{j:03d}" for j in range(60)]
+        activities = {
+            f"2026-07-{d % 28 + 1:02d}": [
+                {"activity": f"Activity {k}", "time": "10:00", "notes": "Went well, everyone took part.",
+                 "campers": campers[k::4], "food_used": 12}
+                for k in range(4)
+            ]
+            for d in range(days)
+        }
+        camps.append({
+            "name": f"Camp {i}", "location": "Lakeside", "camp_type": "Day camp",
+            "start_date": "2026-07-01", "end_date": "2026-07-28", "food_stock": 500,
+            "scout_leaders": [f"leader{i}"], "campers": campers,
+            "campers_info": {c: {"name": f"Camper {c}", "age": "12", "activities": ["Hiking"]} for c in campers},
+            "activities": activities,
+            "daily_food_usage": {date: 48 for date in activities},
+            "daily_records": {date: ["All fine."] for date in activities},
+            "pay_rate": 10,
+            "incidents": [{"date": date, "description": "Scraped knee", "campers": campers[:2]} for date in activities],
+        })
+    return camps
+
+
+def _best(runs, fn):
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--camps", type=int, default=50)
+    parser.add_argument("--days", type=int, default=30, help="activity days per camp")
+    parser.add_argument("--messages", type=int, default=100_000, help="lines in the message log table")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    camps = _camps(args.camps, args.days)
+    formats = [f for f in serialization.FORMATS if f != "zstd" or serialization.zstd is not None]
+    parsers = ["stdlib"] + (["orjson"] if serialization.orjson is not None else [])
+    installed_orjson = serialization.orjson
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "camp_data.json")
+        print(f"{args.camps} camps x {args.days} days; median of {args.runs} runs\n")
+        print(f"{'format':10} {'json lib':9} {'size KB':>9} {'save ms':>9} {'load ms':>9}")
+        for fmt in formats:
+            for lib in parsers:
+                serialization.orjson = installed_orjson if lib == "orjson" else None
+
+                def save():
+                    with open(path, "wb") as file:
+                        file.write(serialization.encode(camps, fmt))
+
+                save_ms = _best(args.runs, save)
+                load_ms = _best(args.runs, lambda: serialization.read_file(path))
+                assert serialization.read_file(path) == camps
+                size = os.path.getsize(path) / 1024
+                print(f"{fmt:10} {lib:9} {size:9.0f} {save_ms:9.1f} {load_ms:9.1f}")
+
+        message = {"from": "leader1", "to": "coordinator", "text": "Can we get more food for Camp 3 tomorrow?",
+                   "timestamp": "2026-07-04 10:15:00", "read": False}
+        lines = [(serialization.dumps_line(message) + "\n").encode()] * args.messages
+        print(f"\nparsing a {args.messages}-line message log")
+        print(f"{'line format':12} {'json lib':9} {'ms':>9}")
+        for label, line_set in (("json.dumps", [(json.dumps(message) + "\n").encode()] * args.messages),
+                                ("dumps_line", lines)):
+            for lib in parsers:
+                serialization.orjson = installed_orjson if lib == "orjson" else None
+                ms = _best(args.runs, lambda: [serialization.loads(line) for line in line_set])
+                print(f"{label:12} {lib:9} {ms:9.1f}")
+        serialization.orjson = installed_orjson
+
+
+if __name__ == "__main__":
+    main()
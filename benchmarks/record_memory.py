@@ -0,0 +1,66 @@
+"""Memory and conversion cost of the typed records against plain dicts.
+
+For direct messages, activity entries and incidents shaped like the ones
+CampTrack writes, measures the memory held per item (tracemalloc) as the
+JSON dicts they used to be and as records.* instances, plus the time to
+convert a batch with from_dict() and back with to_dict().
+
+    python benchmarks/record_memory.py [--items 200000]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from records import ActivityEntry, ChatMessage, Incident  # noqa: E402
+
+SAMPLES = {
+    ChatMessage: lambda i: {"from": f"leader{i % 50}", "to": "coordinator", "text": f"Message {i}",
+                            "timestamp": "2026-07-04 10:15:00", "read": False},
+    ActivityEntry: lambda i: {"activity": f"Activity {i % 20}", "time": "10:00", "notes": "Went well.",
+                              "food_used": 12, "campers": []},
+    Incident: lambda i: {"date": "2026-07-04", "time": "", "description": f"Incident {i}", "campers": []},
+}
+
+
+def _held_bytes(build):
+    """Bytes still allocated once build() has returned its result."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del kept
+    return held
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{args.items} items of each kind\n")
+    print(f"{'record':14} {'dict B':>7} {'record B':>9} {'from_dict ms':>13} {'to_dict ms':>11}")
+    for cls, sample in SAMPLES.items():
+        raw = [sample(i) for i in range(args.items)]
+        dict_bytes = _held_bytes(lambda: [dict(item) for item in raw])
+        record_bytes = _held_bytes(lambda: [cls.from_dict(item) for item in raw])
+
+        started = time.perf_counter()
+        records = [cls.from_dict(item) for item in raw]
+        load_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        dumped = [record.to_dict() for record in records]
+        dump_ms = (time.perf_counter() - started) * 1000
+        assert dumped == raw
+
+        print(f"{cls.__name__:14} {dict_bytes / args.items:7.0f} {record_bytes / args.items:9.0f} "
+              f"{load_ms:13.1f} {dump_ms:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Import cost of each CampTrack entry point, measured in fresh interpreters.
+
+Each entry point is imported in a new `python -X importtime` process
+(several runs, median reported) so nothing is cached between runs. The
+"charts" row is what the dashboard and plots load on first use.
+
+    python benchmarks/startup_time.py [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# what `python app.py` / `python gui.py` import before showing anything
+ENTRY_POINTS = {
+    "app.py (CLI)": "import user_logins, login_auth",
+    "gui.py": "import gui",
+    "charts (first dashboard/plot)": "import pandas, numpy, matplotlib.pyplot",
+}
+
+HEAVY = ("pandas", "numpy", "matplotlib")
+
+
+def _run(code):
+    """(import time in ms from -X importtime, wall time in ms, heavy modules imported)."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = (time.perf_counter() - started) * 1000
+    total_us = 0
+    heavy = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        if not name.startswith("  "):  # top-level imports only, nested ones are included in them
+            total_us += int(cumulative)
+        if name.strip() in HEAVY:
+            heavy.add(name.strip())
+    return total_us / 1000, wall, heavy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = statistics.median(_run("pass")[1] for _ in range(args.runs))
+    print(f"bare interpreter start: {baseline:.0f} ms (subtracted from wall times)\n")
+    print(f"{'entry point':32} {'imports ms':>11} {'wall ms':>9}  heavy modules loaded")
+    for label, code in ENTRY_POINTS.items():
+        results = [_run(code) for _ in range(args.runs)]
+        imports = statistics.median(r[0] for r in results)
+        wall = statistics.median(r[1] for r in results) - baseline
+        heavy = ", ".join(sorted(results[-1][2])) or "none"
+        print(f"{label:32} {imports:11.0f} {wall:9.0f}  {heavy}")
+
+
+if __name__ == "__main__":
+    main()
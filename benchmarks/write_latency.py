@@ -0,0 +1,101 @@
+"""Latency of saving CampTrack data files, before and after durable writes.
+
+"before" is what the saves used to do: open the file with "w" (or "a")
+and stream JSON into it, with no fsync. The other rows use
+storage.durable: an fsynced temp file renamed over the target, and
+fsynced log appends, once per save and with fsyncs coalesced over a
+flush delay. Files are written to a temporary folder, not data/.
+
+    python benchmarks/write_latency.py [--saves 200] [--camps 200] [--delay-ms 50]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from storage import durable  # noqa: E402
+
+
+def _camps(count):
+    return [
+        {
+            "name": f"Camp {i}", "location": "Lakeside", "camp_type": "Day camp",
+            "start_date": "2026-07-01", "end_date": "2026-07-07", "food_stock": 500,
+            "scout_leaders": [f"leader{i}"], "campers": [f"cmp_{i:04d}{j:02d}" for j in range(40)],
+            "activities": {}, "daily_food_usage": {}, "daily_records": {}, "pay_rate": 10,
+        }
+        for i in range(count)
+    ]
+
+
+def _old_rewrite(path, data):
+    with open(path, "w") as file:
+        json.dump(data, file, indent=4)
+
+
+def _old_append(path, lines):
+    with open(path, "a") as file:
+        for line in lines:
+            file.write(line + "\n")
+
+
+def _time(saves, save, finish=None):
+    """(median ms, p95 ms, total ms including finish()) over `saves` calls."""
+    latencies = []
+    started = time.perf_counter()
+    for i in range(saves):
+        t = time.perf_counter()
+        save(i)
+        latencies.append((time.perf_counter() - t) * 1000)
+    if finish:
+        finish()
+    total = (time.perf_counter() - started) * 1000
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saves", type=int, default=200)
+    parser.add_argument("--camps", type=int, default=200, help="camps in the snapshot being rewritten")
+    parser.add_argument("--delay-ms", type=int, default=50, help="flush delay for the coalesced rows")
+    args = parser.parse_args()
+
+    snapshot = _camps(args.camps)
+    change = json.dumps({"op": "update", "camp": "Camp 1", "fields": {"food_stock": 480}})
+
+    with tempfile.TemporaryDirectory(dir=ROOT) as folder:
+        snapshot_file = os.path.join(folder, "camp_data.json")
+        log_file = os.path.join(folder, "camp_changes.jsonl")
+        size_kb = len(json.dumps(snapshot, indent=4)) / 1024
+        print(f"{args.saves} saves; snapshot {size_kb:.0f} KB; fsync {'on' if durable.FSYNC else 'off'}\n")
+        print(f"{'save':44} {'median ms':>10} {'p95 ms':>8} {'total ms':>9}")
+
+        durable.set_flush_delay(0)
+        rows = [
+            ("snapshot rewrite, before (open 'w')", lambda i: _old_rewrite(snapshot_file, snapshot), None),
+            ("snapshot rewrite, durable", lambda i: durable.write_json(snapshot_file, snapshot), None),
+            ("change log append, before (open 'a')", lambda i: _old_append(log_file, [change]), None),
+            ("change log append, durable", lambda i: durable.append_lines(log_file, [change]), None),
+        ]
+        for label, save, finish in rows:
+            print(f"{label:44} " + "{:10.2f} {:8.2f} {:9.0f}".format(*_time(args.saves, save, finish)))
+
+        durable.set_flush_delay(args.delay_ms)
+        coalesced = [
+            (f"snapshot rewrite, durable, {args.delay_ms} ms delay", lambda i: durable.write_json(snapshot_file, snapshot)),
+            (f"change log append, durable, {args.delay_ms} ms delay", lambda i: durable.append_lines(log_file, [change])),
+        ]
+        for label, save in coalesced:
+            print(f"{label:44} " + "{:10.2f} {:8.2f} {:9.0f}".format(*_time(args.saves, save, durable.flush)))
+        durable.set_flush_delay(0)
+
+
+if __name__ == "__main__":
+    main()
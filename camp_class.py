@@ -1,8 +1,40 @@
 from datetime import datetime, timedelta
 import json
 import os
-from utils import data_path
+import threading
 import uuid
+from contextlib import contextmanager
+from records import ActivityEntry, ChatMessage, Incident
+from storage import camp_log, change_feed, serialization
+
+# every attribute that is persisted for a camp, in file order; group chat is
+# kept in its own per-camp log (see Camp.get_group_chat). "id" never changes
+# and is how the change log and stores tell camps apart (names may repeat).
+CAMP_FIELDS = (
+    "id",
+    "name",
+    "location",
+    "camp_type",
+    "start_date",
+    "end_date",
+    "food_stock",
+    "scout_leaders",
+    "campers",
+    "campers_info",
+    "activities",
+    "daily_food_usage",
+    "daily_records",
+    "pay_rate",
+    "incidents",
+)
+
+
+# fields whose concurrent changes add up when two sessions' saves are merged
+# (food used per day is only ever added to or taken from); other fields keep
+# the later save's value. food_stock also adds up while every unsaved change
+# to it was a top-up (Camp.allocate_extra_food); a stock set outright keeps
+# the later save's value like any other field.
+ADDITIVE_FIELDS = ("daily_food_usage",)
 
 
 def generate_camper_id():
@@ -10,10 +42,236 @@ def generate_camper_id():
     return "cmp_" + uuid.uuid4().hex[:8]
 
 
+class CampRegistry(list):
+    """List of camps that keeps name and leader lookups in step with its contents.
+
+    Camps report renames and leader changes back to the registry they are
+    in, so find() and for_leader() never need to scan the whole list.
+    """
+
+    def __init__(self, camps=()):
+        super().__init__()
+        self._by_name = {}    # name -> [camps], first one wins like a linear scan would
+        self._by_leader = {}  # username -> {id(camp): camp}
+        self._leaders_of = {}  # id(camp) -> leaders currently indexed for it
+        self._order = {}      # id(camp) -> insertion sequence, to keep results in list order
+        self._next_seq = 0
+        self.extend(camps)
+
+    # ---- lookups ----
+
+    def find(self, name):
+        matches = self._by_name.get(name)
+        return matches[0] if matches else None
+
+    def for_leader(self, username):
+        camps = self._by_leader.get(username, {}).values()
+        return sorted(camps, key=lambda camp: self._order[id(camp)])
+
+    # ---- index maintenance ----
+
+    def _index(self, camp):
+        camp._registry = self
+        self._order[id(camp)] = self._next_seq
+        self._next_seq += 1
+        self._by_name.setdefault(camp.name, []).append(camp)
+        self._leaders_of[id(camp)] = ()
+        self._reindex_leaders(camp)
+
+    def _unindex(self, camp):
+        camp._registry = None
+        self._by_name[camp.name].remove(camp)
+        if not self._by_name[camp.name]:
+            del self._by_name[camp.name]
+        for leader in self._leaders_of.pop(id(camp)):
+            self._by_leader[leader].pop(id(camp), None)
+            if not self._by_leader[leader]:
+                del self._by_leader[leader]
+        del self._order[id(camp)]
+
+    def _rename(self, camp, old_name):
+        self._by_name[old_name].remove(camp)
+        if not self._by_name[old_name]:
+            del self._by_name[old_name]
+        # keep list order among camps sharing the new name
+        matches = self._by_name.setdefault(camp.name, [])
+        matches.append(camp)
+        matches.sort(key=lambda c: self._order[id(c)])
+
+    def _reindex_leaders(self, camp):
+        old = self._leaders_of.get(id(camp), ())
+        new = tuple(camp.scout_leaders)
+        for leader in set(old) - set(new):
+            self._by_leader[leader].pop(id(camp), None)
+            if not self._by_leader[leader]:
+                del self._by_leader[leader]
+        for leader in new:
+            self._by_leader.setdefault(leader, {})[id(camp)] = camp
+        self._leaders_of[id(camp)] = new
+
+    def _rebuild(self):
+        for matches in self._by_name.values():
+            for camp in matches:
+                camp._registry = None
+        self._by_name.clear()
+        self._by_leader.clear()
+        self._leaders_of.clear()
+        self._order.clear()
+        for camp in self:
+            self._index(camp)
+
+    # ---- list mutations ----
+
+    def append(self, camp):
+        super().append(camp)
+        self._index(camp)
+
+    def extend(self, camps):
+        for camp in camps:
+            self.append(camp)
+
+    def __iadd__(self, camps):
+        self.extend(camps)
+        return self
+
+    def remove(self, camp):
+        super().remove(camp)
+        if camp not in self:
+            self._unindex(camp)
+
+    def pop(self, i=-1):
+        camp = super().pop(i)
+        self._rebuild()
+        return camp
+
+    def insert(self, i, camp):
+        super().insert(i, camp)
+        self._rebuild()
+
+    def clear(self):
+        super().clear()
+        self._rebuild()
+
+    def __delitem__(self, i):
+        super().__delitem__(i)
+        self._rebuild()
+
+    def __setitem__(self, i, value):
+        super().__setitem__(i, value)
+        self._rebuild()
+
+
+def _field_values(record):
+    """Camp attribute values for a stored camp record (defaults for fields it lacks)."""
+    return {
+        "id": record["id"],
+        "name": record["name"],
+        "location": record["location"],
+        "camp_type": record["camp_type"],
+        "start_date": record["start_date"],
+        "end_date": record["end_date"],
+        "food_stock": record["food_stock"],
+        "scout_leaders": record.get("scout_leaders", []),
+        "campers": record.get("campers", []),
+        "campers_info": record.get("campers_info", {}),
+        "activities": {
+            date: [ActivityEntry.from_dict(entry) for entry in entries]
+            for date, entries in record.get("activities", {}).items()
+        },
+        "daily_food_usage": record.get("daily_food_usage", {}),
+        "daily_records": record.get("daily_records", {}),
+        "pay_rate": record.get("pay_rate", 0),
+        "incidents": [Incident.from_dict(incident) for incident in record.get("incidents", [])],
+    }
+
+
+def _copy(value):
+    """A copy of a field value that in-place edits of the field cannot reach."""
+    if isinstance(value, list):
+        return list(value)
+    if isinstance(value, dict):
+        return {key: list(item) if isinstance(item, list) else dict(item) if isinstance(item, dict) else item
+                for key, item in value.items()}
+    return value
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _empty_like(value):
+    if isinstance(value, list):
+        return []
+    if isinstance(value, dict):
+        return {}
+    return 0 if _is_number(value) else None
+
+
+def _item_key(item):
+    return item if isinstance(item, str) else serialization.dumps_line(item)
+
+
+def _merge_value(base, ours, theirs, additive=False):
+    """Three-way merge of one field: our changes from `base` to `ours`, made on top of `theirs`.
+
+    Dicts merge key by key and lists item by item (items we added are
+    appended, items we removed are dropped); numbers in additive fields
+    sum both sides' changes. Anything else both sides changed keeps ours.
+    """
+    if ours == base:
+        return theirs
+    if theirs == base:
+        return ours
+    if isinstance(ours, dict) and isinstance(theirs, dict):
+        base = base if isinstance(base, dict) else {}
+        merged = {key: value for key, value in theirs.items() if key in ours or key not in base}
+        for key, value in ours.items():
+            if key in theirs:
+                merged[key] = _merge_value(base.get(key, _empty_like(value)), value, theirs[key], additive)
+            elif key not in base:
+                merged[key] = value
+        return merged
+    if isinstance(ours, list) and isinstance(theirs, list):
+        base_keys = {_item_key(item) for item in base} if isinstance(base, list) else set()
+        removed = base_keys - {_item_key(item) for item in ours}
+        merged = [item for item in theirs if _item_key(item) not in removed]
+        present = {_item_key(item) for item in merged}
+        for item in ours:
+            key = _item_key(item)
+            if key not in base_keys and key not in present:
+                merged.append(item)
+                present.add(key)
+        return merged
+    if additive and _is_number(base) and _is_number(ours) and _is_number(theirs):
+        return theirs + ours - base
+    return ours
+
+
 class Camp:
-    all_camps = []
+    # no per-camp __dict__: the persisted fields plus the bookkeeping set in __init__
+    __slots__ = CAMP_FIELDS + ("_registry", "_saved_name", "_dirty", "_appends", "_version", "_group_chat", "_base",
+                               "_increments")
+
+    all_camps = CampRegistry()
 
     def __init__(self, name, location, camp_type, start_date, end_date, initial_food_stock):
+        self._registry = None  # CampRegistry this camp is indexed in
+
+        # Dirty tracking for save_to_file(): assigned fields are marked by
+        # __setattr__, in-place list/dict edits must call mark_dirty().
+        self._saved_name = None  # name on disk, None until first saved
+        self._dirty = set()
+        self._appends = []  # (op, field, key, value) appended/put since last save
+        self._version = 0  # bumped on every change, so caches can tell which camps changed
+        self._increments = set()  # dirty fields changed only by top-ups since the last save
+        # field values as last loaded/saved, which a save merges our edits
+        # against when another session saved in between (see CampRepository._merge)
+        self._base = None
+
+        # group chat is read from the store on first use: (signature, messages)
+        self._group_chat = None
+
+        self.id = camp_log.new_camp_id()
         self.name = name
         self.location = location
         self.camp_type = camp_type
@@ -29,16 +287,92 @@ class Camp:
         self.daily_food_usage = {}
         self.daily_records = {}
         self.pay_rate = 0
-        self.group_chat = []  # Add group chat to each camp
         self.incidents = []
 
         Camp.all_camps.append(self)
 
+    def __setattr__(self, attr, value):
+        old_name = getattr(self, "name", None)
+        super().__setattr__(attr, value)
+        if attr in CAMP_FIELDS:
+            self._increments.discard(attr)
+            self.mark_dirty(attr)
+            if attr == "name" and self._registry is not None and old_name != value:
+                self._registry._rename(self, old_name)
+
+    def mark_dirty(self, *fields):
+        """Flag fields edited in place so the next save writes them in full."""
+        if "scout_leaders" in fields and self._registry is not None:
+            self._registry._reindex_leaders(self)
+        self._version += 1
+        self._dirty.update(fields)
+        self._appends = [a for a in self._appends if a[1] not in fields]
+
+    def _record_append(self, field, value, key=None):
+        """Remember a single appended item so the save can log just that item."""
+        self._version += 1
+        if field not in self._dirty:
+            self._appends.append(("append", field, key, value))
+
+    def _record_put(self, field, key, value):
+        """Remember a single dict entry set so the save can log just that entry."""
+        self._version += 1
+        if field not in self._dirty:
+            self._appends.append(("put", field, key, value))
+
+    def _mark_clean(self):
+        if self._base is None:
+            self._base = {field: _copy(getattr(self, field)) for field in CAMP_FIELDS}
+        else:
+            # bring the base up to what was just saved, touching only what changed
+            for field in self._dirty:
+                self._base[field] = _copy(getattr(self, field))
+            for op, field, key, value in self._appends:
+                target = self._base[field]
+                if op == "put":
+                    target[key] = value
+                elif key is None:
+                    target.append(value)
+                else:
+                    target.setdefault(key, []).append(value)
+        self._saved_name = self.name
+        self._dirty.clear()
+        self._increments.clear()
+        self._appends = []
+
+    def _restore(self, record):
+        """Take every field from a stored camp record; fields that already
+        match are left alone, so _version only moves if something changed."""
+        for field, value in _field_values(record).items():
+            if getattr(self, field) != value:
+                setattr(self, field, value)
+        self._base = None
+        self._mark_clean()
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in CAMP_FIELDS}
+
+    def pending_changes(self):
+        """Change-log records describing what changed since the last save."""
+        if self._saved_name is None:
+            return [{"op": "create", "id": self.id, "camp": self.name, "record": self.to_dict()}]
+        changes = []
+        for op, field, key, value in self._appends:
+            change = {"op": op, "id": self.id, "camp": self._saved_name, "field": field, "value": value}
+            if key is not None:
+                change["key"] = key
+            changes.append(change)
+        if self._dirty:
+            fields = {field: getattr(self, field) for field in CAMP_FIELDS if field in self._dirty}
+            changes.append({"op": "update", "id": self.id, "camp": self._saved_name, "fields": fields})
+        return changes
+
     # --------------- CAMP OPERATIONS --------------- #
 
     def assign_leader(self, leader_choice):
         if leader_choice not in self.scout_leaders:
             self.scout_leaders.append(leader_choice)
+            self.mark_dirty("scout_leaders")
             self.message_group_chat("System", f"{leader_choice} has joined the group chat.")
         else:
             print(f"\nLeader '{leader_choice}' is already assigned to this camp.")
@@ -47,34 +381,70 @@ class Camp:
         for camper in camper_list:
             if camper not in self.campers:
                 self.campers.append(camper)
+                self.mark_dirty("campers")
             else:
                 print(f"\nCamper '{camper}' is already assigned to this camp.")
 
+    def add_camper(self, camper_id, info):
+        """Add a camper who is not in this camp yet (callers check, usually against a set)."""
+        self.campers.append(camper_id)
+        self._record_append("campers", camper_id)
+        if self.campers_info is None:
+            self.campers_info = {}
+        self.campers_info[camper_id] = info
+        self._record_put("campers_info", camper_id, info)
+
     def assign_activity(self, activity, date):
         if date not in self.activities:
             self.activities[date] = []
         self.activities[date].append(activity)
+        self._record_append("activities", activity, key=date)
+
+    def add_incident(self, incident):
+        self.incidents.append(incident)
+        self._record_append("incidents", incident)
 
     def allocate_extra_food(self, amount):
+        """Top up the food stock; a save adds this to other sessions' top-ups."""
+        topped_up_only = "food_stock" not in self._dirty or "food_stock" in self._increments
         self.food_stock += amount
+        if topped_up_only:
+            self._increments.add("food_stock")
 
     def note_daily_record(self, date, notes):
         if date not in self.daily_records:
             self.daily_records[date] = []
         self.daily_records[date].append(notes)
+        self._record_append("daily_records", notes, key=date)
 
     def message_group_chat(self, from_user, message_text):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        message = {
-            "from": from_user,
-            "text": message_text,
-            "timestamp": timestamp
-        }
-        self.group_chat.append(message)
-        save_to_file()
+        message = ChatMessage(sender=from_user, text=message_text, timestamp=timestamp)
+        save_to_file()  # the camp (and any pending edits) must be on disk first
+        camp_repository.store.append_group_chat(self.id, message)
+        change_feed.publish("group_chat", {"camp": self.name, "message": message})
 
     def get_group_chat(self):
-        return self.group_chat
+        """This camp's group chat, loaded from its log on first call.
+
+        Later calls only read messages appended since (by this or another
+        session); a camp that was never saved has no chat yet.
+        """
+        if self._saved_name is None:
+            return []
+        store = camp_repository.store
+        signature = self.group_chat_signature()
+        if self._group_chat is None:
+            self._group_chat = (signature, [ChatMessage.from_dict(m) for m in store.load_group_chat(self.id)])
+        elif self._group_chat[0] != signature:
+            messages = self._group_chat[1]
+            messages.extend(ChatMessage.from_dict(m) for m in store.load_group_chat(self.id, start=len(messages)))
+            self._group_chat = (signature, messages)
+        return self._group_chat[1]
+
+    def group_chat_signature(self):
+        """Changes whenever a message is added to this camp's chat (by any session)."""
+        return camp_repository.store.group_chat_signature(self.id)
 
     def summary(self):
         print("\n--- Camp Summary ---")
@@ -92,67 +462,195 @@ class Camp:
 # SAVE / LOAD FUNCTIONS
 # -------------------------------------------------
 
-def save_to_file():
-    data = []
-    for camp in Camp.all_camps:
-        data.append({
-            "name": camp.name,
-            "location": camp.location,
-            "camp_type": camp.camp_type,
-            "start_date": camp.start_date,
-            "end_date": camp.end_date,
-            "food_stock": camp.food_stock,
-            "scout_leaders": camp.scout_leaders,
-            "campers": camp.campers,
-            "campers_info" : camp.campers_info,
-            "activities": camp.activities,
-            "daily_food_usage": camp.daily_food_usage,
-            "daily_records": camp.daily_records,
-            "pay_rate": camp.pay_rate,
-            "group_chat": camp.group_chat,
-            "incidents": camp.incidents,
-        })
-
-    with open(data_path("camp_data.json"), "w") as file:
-        json.dump(data, file, indent=4)
+class CampRepository:
+    """Holds the camps loaded from disk and reloads only when the files change.
 
+    A reload happens when the snapshot or change log has a different
+    mtime/size than at the last load/save, or when invalidate() was called.
+    Unsaved edits in memory are never thrown away: they are newer than the
+    files, so with unchanged files the camps are returned as they are, and
+    otherwise they are saved before the reload. A reload updates the camps
+    already loaded in place (matched by id), so Camp objects other code
+    holds, such as a worker thread's, stay the ones in Camp.all_camps.
+    If another process saved since our load, our edits are merged into
+    what it wrote (see _merge()) instead of overwriting it.
 
-def read_from_file():
-    if not os.path.exists(data_path("camp_data.json")):
-        print("\ncamp_data.json not found")
-        return []
+    Loads and saves hold a lock, so the GUI's worker threads and the Tk
+    thread never interleave them, and the store's file lock, so other
+    CampTrack processes never load or save halfway through ours.
+    """
 
-    if os.path.getsize(data_path("camp_data.json")) == 0:
-        return []
+    def __init__(self, store):
+        self.store = store  # storage.camp_log (JSON) or storage.camp_db (SQLite)
+        self._signature = None
+        self.persisted = {}  # id -> name of the camps currently on disk
+        self._lock = threading.RLock()
 
-    try:
-        with open(data_path("camp_data.json"), "r") as file:
-            data = json.load(file)
-    except json.JSONDecodeError:
-        print("\nError reading camp_data.json — file is corrupted.")
-        return []
+    def invalidate(self):
+        self._signature = None
+
+    def is_fresh(self):
+        """True while the files are as we last loaded or saved them."""
+        return self._signature is not None and self._signature == self.store.file_signature()
+
+    def has_unsaved_changes(self):
+        live_ids = {camp.id for camp in Camp.all_camps}
+        if any(camp_id not in live_ids for camp_id in self.persisted):
+            return True  # a camp was removed from Camp.all_camps
+        return any(camp._saved_name is None or camp._dirty or camp._appends for camp in Camp.all_camps)
+
+    def load(self):
+        with self._lock, self.store.lock():
+            return self._load()
+
+    def _load(self):
+        if self.is_fresh():
+            return Camp.all_camps
+        if self.has_unsaved_changes():
+            self._save()
+            if self.is_fresh():
+                return Camp.all_camps
+        if not self.store.exists():
+            print("\ncamp_data.json not found")
+            return CampRegistry()
+
+        try:
+            data = self.store.load_records()
+        except json.JSONDecodeError:
+            print("\nError reading camp_data.json — file is corrupted.")
+            return CampRegistry()
+        # after load_records(): a one-off migration there may rewrite the files
+        signature = self.store.file_signature()
+        self._refresh(data)
+        self._signature = signature
+        return Camp.all_camps
+
+    def _refresh(self, records):
+        """Make Camp.all_camps hold exactly the stored `records`.
 
-    Camp.all_camps = []
-
-    for camp_data in data:
-        camp = Camp(
-            camp_data["name"],
-            camp_data["location"],
-            camp_data["camp_type"],
-            camp_data["start_date"],
-            camp_data["end_date"],
-            camp_data["food_stock"]
-        )
-
-        # Restore saved values
-        camp.scout_leaders = camp_data.get("scout_leaders", [])
-        camp.campers = camp_data.get("campers", [])
-        camp.campers_info = camp_data.get("campers_info", {})
-        camp.activities = camp_data.get("activities", {})
-        camp.daily_food_usage = camp_data.get("daily_food_usage", {})
-        camp.daily_records = camp_data.get("daily_records", {})
-        camp.pay_rate = camp_data.get("pay_rate", 0)
-        camp.group_chat = camp_data.get("group_chat", [])
-        camp.incidents = camp_data.get("incidents", [])
-
-    return Camp.all_camps
+        The registry itself is kept, not replaced, so a caller still holding
+        it (camps = read_from_file()) sees the reload rather than writing
+        an outdated list back.
+        """
+        registry = Camp.all_camps
+        loaded = {camp.id: camp for camp in registry}
+        camps = []
+        for camp_data in records:
+            camp = loaded.get(camp_data["id"])
+            if camp is None:
+                camp = Camp(  # registers itself; the slice assignment below puts it in order
+                    camp_data["name"],
+                    camp_data["location"],
+                    camp_data["camp_type"],
+                    camp_data["start_date"],
+                    camp_data["end_date"],
+                    camp_data["food_stock"]
+                )
+            camp._restore(camp_data)
+            camps.append(camp)
+        registry[:] = camps
+        self.persisted = {camp.id: camp.name for camp in registry}
+
+    @contextmanager
+    def editing(self):
+        """Load the camps and keep other threads' loads and saves out until the block ends.
+
+        Every edit-then-save takes it, on the Tk thread as well as on
+        workers: otherwise a load or save on another thread can run between
+        the edits and our save and mark them saved before they are written.
+        Look camps up inside the block, and save_to_file() before leaving
+        it. Worker threads that walk the camps' contents take it too, so no
+        edit changes them mid-walk.
+        """
+        with self._lock:
+            yield self.load()
+
+    def save(self):
+        """Persist only what changed since the last load/save.
+
+        Changes are handed to the store as change-log records; with the JSON
+        store the full snapshot is rewritten only once the log needs compacting.
+        """
+        with self._lock, self.store.lock():
+            self._save()
+
+    def _save(self):
+        # our own write must not look like an outside change, unless the files
+        # were already modified by someone else since we last looked
+        up_to_date = self.is_fresh()
+
+        live_ids = {camp.id for camp in Camp.all_camps if camp._saved_name is not None}
+
+        # deletions first so a new camp may reuse a deleted camp's name
+        changes = [{"op": "delete", "id": camp_id, "camp": name}
+                   for camp_id, name in self.persisted.items() if camp_id not in live_ids]
+        for camp in Camp.all_camps:
+            if camp._saved_name is not None and camp.id not in self.persisted:
+                camp._saved_name = None  # stale object whose record is gone from disk; write it in full
+            changes.extend(camp.pending_changes())
+
+        if up_to_date:
+            self.store.append_changes(changes)
+            if self.store.needs_compaction():
+                self.store.write_snapshot([camp.to_dict() for camp in Camp.all_camps])
+            for camp in Camp.all_camps:
+                camp._mark_clean()
+            self.persisted = {camp.id: camp.name for camp in Camp.all_camps}
+        else:
+            # another process saved since our load: write our edits on top of
+            # theirs, then take the merged files as the camps' new state
+            self.store.append_changes(self._merge(changes))
+            records = self.store.load_records()
+            if self.store.needs_compaction():
+                self.store.write_snapshot(records)
+            self._refresh(records)
+        self._signature = self.store.file_signature()
+
+    def _merge(self, changes):
+        """Rebase our "update" changes onto what the files hold now.
+
+        An update carries whole field values, computed from the camp as we
+        last loaded it; written as they are they would undo whatever other
+        sessions saved since. Each field is merged three ways instead (see
+        _merge_value). Appends, puts, creates and deletes are deltas already.
+        """
+        stored = {record["id"]: _field_values(record) for record in self.store.load_records()}
+        camps = {camp.id: camp for camp in Camp.all_camps}
+        merged = []
+        for change in changes:
+            camp = camps.get(change.get("id"))
+            if change["op"] == "update" and change["id"] in stored and camp is not None and camp._base is not None:
+                base, theirs = camp._base, stored[change["id"]]
+                change = dict(change, fields={
+                    field: _merge_value(base[field], value, theirs[field],
+                                        field in ADDITIVE_FIELDS or field in camp._increments)
+                    for field, value in change["fields"].items()
+                })
+            merged.append(change)
+        return merged
+
+
+def _select_store():
+    """JSON change log by default; SQLite when CAMPTRACK_STORAGE=sqlite.
+
+    The first SQLite run migrates the existing JSON camp data into the database.
+    """
+    if os.environ.get("CAMPTRACK_STORAGE", "json") == "sqlite":
+        from storage import camp_db
+        # under the lock, so sessions starting together migrate only once
+        with camp_db.lock():
+            if not camp_db.exists() and camp_log.exists():
+                camp_db.migrate_from_json()
+        return camp_db
+    return camp_log
+
+
+camp_repository = CampRepository(_select_store())
+
+
+def save_to_file():
+    camp_repository.save()
+
+
+def read_from_file():
+    return camp_repository.load()
@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 
-from camp_class import Camp, save_to_file, read_from_file
+from camp_class import Camp, save_to_file, read_from_file, camp_repository
 from utils import get_int
 from features.notifications import add_notification 
 
@@ -55,17 +55,16 @@ def edit_camp():
         print("Invalid number. Keeping current value.")
         return current_value
 
+    # nothing is assigned until every answer is in, so cancelling leaves the camp untouched
     new_name = update_text("New Name", camp.name)
     if new_name is None:
         print("Edit cancelled.")
         return
-    camp.name = new_name
 
     new_loc = update_text("New Location", camp.location)
     if new_loc is None:
         print("Edit cancelled.")
         return
-    camp.location = new_loc
 
     new_type_raw = update_text('Please enter the new camp type:'
           '\nSelect [1] for Day Camp'
@@ -74,25 +73,34 @@ def edit_camp():
     if new_type_raw is None:
         print("Edit cancelled.")
         return
-    camp.camp_type = get_int(str(new_type_raw), 1, 3)
+    new_type = get_int(str(new_type_raw), 1, 3)
 
+    new_start, new_end = camp.start_date, camp.end_date
     date_change = input("Update dates? (y/n): ").strip().lower()
     if date_change == ("y"):
-        new_start, new_end = get_dates(camp.camp_type)
-        camp.start_date = new_start
-        camp.end_date = new_end
+        new_start, new_end = get_dates(new_type)
     new_food = update_number("New Daily Food Stock", camp.food_stock)
     if new_food is None:
         print("Edit cancelled.")
         return
-    camp.food_stock = new_food
     new_pay = update_number("New Pay Rate", camp.pay_rate)
     if new_pay is None:
         print("Edit cancelled.")
         return
-    camp.pay_rate = new_pay
+
+    with camp_repository.editing() as camps:
+        if camp not in camps:  # deleted by another session meanwhile
+            print("\nCamp not found.")
+            return
+        camp.name = new_name
+        camp.location = new_loc
+        camp.camp_type = new_type
+        camp.start_date = new_start
+        camp.end_date = new_end
+        camp.food_stock = new_food
+        camp.pay_rate = new_pay
+        save_to_file()
     add_notification(f"camp {camp.name} edited")
-    save_to_file()
     print("\nCamp updated successfully!")
 
 
@@ -123,10 +131,10 @@ def delete_camp():
     
     add_notification(f"camp {camp.name} deleted")
 
-    del camps[choice - 1]
-    Camp.all_camps = camps
-
-    save_to_file()
+    with camp_repository.editing() as camps:
+        if camp in camps:  # unless another session deleted it meanwhile
+            camps.remove(camp)
+        save_to_file()
     print("\nCamp deleted successfully!")
 
 
@@ -172,17 +180,18 @@ def create_camp():
         print("Please enter Y or N.")
 
     if confirm == 'y':
-        Camp(
-            name,
-            location,
-            camp_type,
-            start_date,
-            end_date,
-            initial_food_stock,
-
-        )
+        with camp_repository.editing():
+            Camp(
+                name,
+                location,
+                camp_type,
+                start_date,
+                end_date,
+                initial_food_stock,
+
+            )
+            save_to_file()
         add_notification(f"camp {name} created")
-        save_to_file()
         print("\nCamp successfully created!")
     else:
         print("\nCamp creation cancelled.")
@@ -2,14 +2,19 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 
 from messaging import (
-    get_conversations_for_user,
-    get_conversation,
+    get_conversation_page,
     send_message,
-    count_unread_messages,
+    unread_counts_for_user,
     mark_conversation_as_read,
+    message_store,
+    MESSAGES_LOG,
 )
 from user_logins import users
 from camp_class import read_from_file
+from storage import change_feed
+
+# messages loaded per page in the chat view; older pages load on scroll-up
+CHAT_PAGE_SIZE = 100
 
 
 def _get_all_usernames():
@@ -78,9 +83,9 @@ def open_chat_window(master, username, role=None):
     def refresh_conversation_list():
         partners.clear()
         listbox.delete(0, tk.END)
-        convos = get_conversations_for_user(username)
-        for other in convos:
-            unread = count_unread_messages(username, other)
+        unread_counts = unread_counts_for_user(username)
+        for other in sorted(unread_counts):
+            unread = unread_counts[other]
             label = other if unread == 0 else f"{other} ({unread})"
             partners.append(other)
             listbox.insert(tk.END, label)
@@ -163,12 +168,22 @@ def open_chat_window(master, username, role=None):
     entry.pack(fill="x", pady=(0, 6))
 
     current_partner = tk.StringVar(value="")
+    # how much of the current thread is shown, for loading older pages
+    page_state = {"partner": None, "loaded": 0, "has_more": False, "loading": False}
+
+    def format_messages(messages, partner):
+        lines = []
+        for msg in messages:
+            who = "You" if msg["from"] == username else partner
+            lines.append(f"{msg['timestamp']} - {who}: {msg['text']}\n")
+        return "".join(lines)
 
     def refresh_chat(partner):
         # mark messages as read first
         mark_conversation_as_read(username, partner)
 
-        thread = get_conversation(username, partner)
+        thread, has_more = get_conversation_page(username, partner, limit=CHAT_PAGE_SIZE)
+        page_state.update(partner=partner, loaded=len(thread), has_more=has_more)
 
         chat_text.config(state="normal")
         chat_text.delete("1.0", tk.END)
@@ -176,13 +191,43 @@ def open_chat_window(master, username, role=None):
         if not thread:
             chat_text.insert(tk.END, "(No messages yet – say hi!)\n")
         else:
-            for msg in thread:
-                who = "You" if msg["from"] == username else partner
-                chat_text.insert(tk.END, f"{msg['timestamp']} - {who}: {msg['text']}\n")
+            chat_text.insert(tk.END, format_messages(thread, partner))
 
         chat_text.config(state="disabled")
+        chat_text.see(tk.END)
         refresh_conversation_list()  # update unread counters
 
+    def load_older_messages():
+        partner = page_state["partner"]
+        if not partner or not page_state["has_more"] or page_state["loading"]:
+            return
+        page_state["loading"] = True
+        older, has_more = get_conversation_page(
+            username, partner, limit=CHAT_PAGE_SIZE, offset=page_state["loaded"]
+        )
+        page_state["loaded"] += len(older)
+        page_state["has_more"] = has_more
+
+        chat_text.config(state="normal")
+        chat_text.insert("1.0", format_messages(older, partner))
+        chat_text.config(state="disabled")
+        # keep the line that was at the top in place
+        chat_text.yview(f"{len(older) + 1}.0")
+        page_state["loading"] = False
+
+    def on_chat_scroll(first, last):
+        if float(first) <= 0.0 and page_state["has_more"]:
+            chat_text.after_idle(load_older_messages)
+
+    def on_chat_wheel(event):
+        # already at the top: the view does not move, so yscrollcommand never fires
+        if chat_text.yview()[0] <= 0.0 and page_state["has_more"]:
+            load_older_messages()
+
+    chat_text.configure(yscrollcommand=on_chat_scroll)
+    chat_text.bind("<MouseWheel>", on_chat_wheel, add="+")
+    chat_text.bind("<Button-4>", on_chat_wheel, add="+")
+
     def send_current_message(event=None):
         partner = current_partner.get()
         if not partner:
@@ -193,9 +238,8 @@ def open_chat_window(master, username, role=None):
         if not text:
             return
 
-        send_message(username, partner, text)
+        send_message(username, partner, text)  # shows up through on_new_message
         entry.delete(0, tk.END)
-        refresh_chat(partner)
 
     ttk.Button(right_frame, text="Send", style="Primary.TButton", command=send_current_message).pack(fill="x")
     entry.bind("<Return>", send_current_message)
@@ -214,6 +258,35 @@ def open_chat_window(master, username, role=None):
 
     listbox.bind("<<ListboxSelect>>", on_select)
 
+    # live updates: append new messages instead of reloading the thread
+    def on_new_message(msg):
+        if username not in (msg["from"], msg["to"]):
+            return
+        other = msg["to"] if msg["from"] == username else msg["from"]
+        if other == page_state["partner"]:
+            chat_text.config(state="normal")
+            if page_state["loaded"] == 0:
+                chat_text.delete("1.0", tk.END)  # drop the "no messages yet" line
+            chat_text.insert(tk.END, format_messages([msg], other))
+            chat_text.config(state="disabled")
+            chat_text.see(tk.END)
+            page_state["loaded"] += 1
+            if msg["to"] == username:
+                mark_conversation_as_read(username, other)
+        refresh_conversation_list()
+
+    def on_messages_reset(_payload):
+        if page_state["partner"]:
+            refresh_chat(page_state["partner"])
+        else:
+            refresh_conversation_list()
+
+    change_feed.subscribe_while_open(convo_win, "message", on_new_message)
+    change_feed.subscribe_while_open(convo_win, "message_read", lambda _payload: refresh_conversation_list())
+    change_feed.subscribe_while_open(convo_win, "messages_reset", on_messages_reset)
+    # messages written by other CampTrack sessions
+    change_feed.watch(convo_win, lambda: change_feed.file_signature(MESSAGES_LOG), message_store.refresh)
+
 
 def open_group_chat_window(master, username):
     """Separate window: group chats for camps supervised by this scout leader."""
@@ -257,8 +330,7 @@ def open_group_chat_window(master, username):
     camp_scroll.pack(side="left", fill="y", pady=(4, 0))
 
     # Gather camps supervised by this leader
-    all_camps = read_from_file()
-    assigned_camps = [c for c in all_camps if username in c.scout_leaders]
+    assigned_camps = read_from_file().for_leader(username)
 
     for c in assigned_camps:
         camp_listbox.insert(tk.END, c.name)
@@ -281,14 +353,20 @@ def open_group_chat_window(master, username):
     msg_entry.pack(fill="x", pady=(0, 6))
 
     current_camp_name = tk.StringVar(value="")
+    shown = {"count": 0}  # group chat messages currently in group_text
 
     def _get_camp_by_name(name):
-        # Reload to pick up new messages from others
-        camps = read_from_file()
-        for c in camps:
-            if c.name == name:
-                return c
-        return None
+        # cached unless the camp data changed on disk
+        return read_from_file().find(name)
+
+    def format_group_messages(messages):
+        lines = []
+        for msg in messages:
+            who = msg.get("from", "Unknown")
+            ts = msg.get("timestamp", "")
+            txt = msg.get("text", "")
+            lines.append(f"{ts} - {who}: {txt}\n")
+        return "".join(lines)
 
     def refresh_group_chat():
         name = current_camp_name.get()
@@ -315,13 +393,39 @@ def open_group_chat_window(master, username):
         if not thread:
             group_text.insert(tk.END, "(No messages yet in this group.)\n")
         else:
-            for msg in thread:
-                who = msg.get("from", "Unknown")
-                ts = msg.get("timestamp", "")
-                txt = msg.get("text", "")
-                group_text.insert(tk.END, f"{ts} - {who}: {txt}\n")
+            group_text.insert(tk.END, format_group_messages(thread))
+        shown["count"] = len(thread)
 
         group_text.config(state="disabled")
+        group_text.see(tk.END)
+
+    def append_group_messages(messages):
+        group_text.config(state="normal")
+        if shown["count"] == 0:
+            group_text.delete("1.0", tk.END)  # drop the "no messages yet" line
+        group_text.insert(tk.END, format_group_messages(messages))
+        group_text.config(state="disabled")
+        group_text.see(tk.END)
+        shown["count"] += len(messages)
+
+    def on_group_message(payload):
+        if payload["camp"] == current_camp_name.get():
+            append_group_messages([payload["message"]])
+
+    def current_chat_signature():
+        name = current_camp_name.get()
+        camp = _get_camp_by_name(name) if name else None
+        return camp.group_chat_signature() if camp is not None else None
+
+    def on_chat_log_change():
+        # written by another CampTrack session: show only what we have not shown yet
+        name = current_camp_name.get()
+        camp = _get_camp_by_name(name) if name else None
+        if camp is None:
+            return
+        thread = camp.get_group_chat()
+        if len(thread) > shown["count"]:
+            append_group_messages(thread[shown["count"]:])
 
     def on_camp_select(event):
         sel = camp_listbox.curselection()
@@ -350,12 +454,14 @@ def open_group_chat_window(master, username):
             messagebox.showerror("Error", "Camp not found; it may have been deleted.")
             return
 
-        camp.message_group_chat(username, text)
+        camp.message_group_chat(username, text)  # shows up through on_group_message
         msg_entry.delete(0, tk.END)
-        refresh_group_chat()
 
     ttk.Button(right, text="Send to Group", style="Primary.TButton", command=send_group_message).pack(fill="x")
     msg_entry.bind("<Return>", send_group_message)
 
+    change_feed.subscribe_while_open(win, "group_chat", on_group_message)
+    change_feed.watch(win, current_chat_signature, on_chat_log_change)
+
     # Initial state
     refresh_group_chat()
\ No newline at end of file
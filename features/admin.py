@@ -1,14 +1,14 @@
-from user_logins import users, save_logins, disabled_logins, enable_login
+from user_logins import users, save_logins, disabled_logins, enable_login, set_password, disabled_accounts
 from utils import get_int
 
 
 def list_users():
     print('\n--- All Users ---')
     for admin in users['admin']:
-        print(f"Role: admin, Username: {admin['username']}, Password: {admin['password']}")
+        print(f"Role: admin, Username: {admin['username']}")
     for role in ['scout leader', 'logistics coordinator']:
         for user in users[role]:
-            print(f"Role: {role}, Username: {user['username']}, Password: {user['password']}")
+            print(f"Role: {role}, Username: {user['username']}")
 
 
 def add_user():
@@ -55,10 +55,12 @@ def add_user():
             continue
         break
 
+    new_user = {'username': new_username, 'password': ''}
+    set_password(new_user, new_password)
     if new_role == 'admin':
-        users['admin'].append({'username': new_username, 'password': new_password})
+        users['admin'].append(new_user)
     else:
-        users[new_role].append({'username': new_username, 'password': new_password})
+        users[new_role].append(new_user)
     print(f"\nUser {new_username} added successfully as {new_role}!")
     save_logins()
 
@@ -82,7 +84,7 @@ def edit_user_password():
             option2 = get_int('Input your option: ', 1, len(users['admin']))
             chosen_admin = users['admin'][option2 - 1]
             new_admin_password = str(input(f"Enter a new password for {chosen_admin['username']}: "))
-            chosen_admin['password'] = new_admin_password
+            set_password(chosen_admin, new_admin_password)
             print("\nPassword updated successfully")
             save_logins()
             break
@@ -102,9 +104,8 @@ def edit_user_password():
             option3 = get_int('\nInput your option: ', 1, len(scout_leader_user_list))
             if option3 <= len(scout_leader_user_list):
                 chosen_leader = scout_leader_user_list[option3 - 1]
-                print(f"\nThe current password is {chosen_leader['password']}.")
                 new_leader_password = str(input(f"Enter a new password for {chosen_leader['username']}: "))
-                chosen_leader['password'] = new_leader_password
+                set_password(chosen_leader, new_leader_password)
                 print('\nPassword updated successfully')
                 save_logins()
                 break
@@ -126,9 +127,8 @@ def edit_user_password():
             option4 = get_int('\nInput your option: ', 1, len(logistics_coordinator_user_list))
             if option4 <= len(logistics_coordinator_user_list):
                 chosen_coordinator = logistics_coordinator_user_list[option4 - 1]
-                print(f"\nThe current password is {chosen_coordinator['password']}.")
                 new_coordinator_password = str(input(f"Enter a new password for {chosen_coordinator['username']}: "))
-                chosen_coordinator['password'] = new_coordinator_password
+                set_password(chosen_coordinator, new_coordinator_password)
                 print('\nPassword updated successfully')
                 save_logins()
                 break
@@ -238,14 +238,7 @@ def disable_user():
 
 def enable_user():
     while True:
-        disabled_usernames = []
-        try:
-            with open('disabled_logins.txt', 'r') as file:
-                disabled_login = file.read().strip(',')
-                if disabled_login != "":
-                    disabled_usernames.extend(disabled_login.split(','))
-        except FileNotFoundError:
-            pass
+        disabled_usernames = disabled_accounts.names()
 
         if disabled_usernames == []:
             print("\nThere are no disabled users.")
@@ -0,0 +1,133 @@
+import bisect
+from datetime import datetime, timedelta
+from storage import change_feed
+
+# burn rate = average units used per day over the last WINDOW_DAYS days with usage data
+WINDOW_DAYS = 7
+
+
+def _parse_date(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+class _UsageSeries:
+    """Running view of one camp's daily_food_usage: sorted dates plus a total.
+
+    Dates are kept parsed, so they order and subtract as dates even where
+    the strings would not (e.g. "2026-7-9" against "2026-07-10").
+    """
+
+    def __init__(self, usage):
+        self.source = usage  # the camp dict this was built from; a reload swaps it out
+        self.units = {}  # datetime.date -> units
+        self.total = 0
+        for date, units in usage.items():
+            day = _parse_date(date)
+            if day is not None:
+                self.units[day] = self.units.get(day, 0) + units
+                self.total += units
+        self.dates = sorted(self.units)
+
+    def add(self, date, units):
+        day = _parse_date(date)
+        if day is None:
+            return
+        if day not in self.units:
+            bisect.insort(self.dates, day)
+            self.units[day] = 0
+        self.units[day] += units
+        self.total += units
+        if self.units[day] <= 0:
+            self.total -= self.units.pop(day)
+            self.dates.remove(day)
+
+    def burn_rate(self):
+        """(units per day over the trailing window, last usage date) or (0, None)."""
+        if not self.dates:
+            return 0, None
+        last, first = self.dates[-1], self.dates[0]
+        cutoff = last - timedelta(days=WINDOW_DAYS - 1)
+        window_units = 0
+        for day in reversed(self.dates):
+            if day < cutoff:
+                break
+            window_units += self.units[day]
+        span = min(WINDOW_DAYS, (last - first).days + 1)
+        return window_units / span, last
+
+
+class FoodProjection:
+    """Per-camp food burn-down: burn rate and predicted stock-out date.
+
+    Series are built from a camp's daily_food_usage the first time it is
+    projected; after that each "food_usage" change-feed event adjusts the
+    series instead of rescanning the history. A camp object whose usage
+    dict is not the one a series was built from (the camps were reloaded)
+    gets a fresh series. Series are keyed by camp id, since names repeat.
+    """
+
+    def __init__(self):
+        self._series = {}  # camp id -> _UsageSeries
+        change_feed.subscribe("food_usage", self._on_usage)
+
+    def _on_usage(self, payload):
+        series = self._series.get(payload["camp_id"])
+        if series is not None:
+            series.add(payload["date"], payload["units"])
+
+    def _series_for(self, camp):
+        series = self._series.get(camp.id)
+        if series is None or series.source is not camp.daily_food_usage:
+            series = self._series[camp.id] = _UsageSeries(camp.daily_food_usage)
+        return series
+
+    def project(self, camp):
+        """Burn-down figures for one camp.
+
+        supply is the daily stock over the camp's days (as in the shortage
+        check), remaining is supply minus recorded usage, and stockout_date
+        is when remaining runs out at the current burn rate (None while
+        nothing has been used).
+        """
+        series = self._series_for(camp)
+        start, end = _parse_date(camp.start_date), _parse_date(camp.end_date)
+        days = max((end - start).days + 1, 1) if start and end else 1
+        supply = camp.food_stock * days
+        remaining = supply - series.total
+        rate, last = series.burn_rate()
+
+        stockout = None
+        if last is not None and rate > 0:
+            stockout = last + timedelta(days=int(max(remaining, 0) // rate))
+        return {
+            "camp_name": camp.name,
+            "used": series.total,
+            "supply": supply,
+            "remaining": remaining,
+            "burn_rate": round(float(rate), 2),
+            "last_usage": last.isoformat() if last else None,
+            "stockout_date": stockout.isoformat() if stockout else None,
+            "runs_out_early": stockout is not None and end is not None and stockout < end,
+        }
+
+    def project_all(self, camps):
+        """{camp id: project(camp)} for every camp."""
+        return {camp.id: self.project(camp) for camp in camps}
+
+
+food_projection = FoodProjection()
+
+
+def describe_projection(projection):
+    """One line for the shortage screens."""
+    if projection["stockout_date"] is None:
+        return "No food usage recorded yet, so no stock-out date can be projected."
+    line = (f"Burning about {projection['burn_rate']} units/day; "
+            f"{projection['remaining']} of {projection['supply']} units left, "
+            f"projected to run out on {projection['stockout_date']}")
+    if projection["runs_out_early"]:
+        line += " (before the camp ends - schedule a top-up)"
+    return line + "."
@@ -1,31 +1,62 @@
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, date
+from io import BytesIO
 import json
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
+import threading
 from camp_ops import create_camp, edit_camp, delete_camp, get_dates
-from camp_class import Camp, save_to_file, read_from_file
-from features.notifications import add_notification
+from camp_class import Camp, save_to_file, read_from_file, camp_repository
+from features.notifications import add_notification, add_notifications
+from features.food_projection import food_projection, describe_projection
+from storage import serialization
 from utils import get_int, data_path
 
+# pandas, numpy and matplotlib are imported inside the dashboard, forecast and
+# plot functions: they take most of a second to import and most sessions
+# never open a chart.
 
-def _engagement_score(camp):
-    """Simple engagement proxy based on recorded activities and daily reports."""
-    activity_events = sum(len(events) for events in camp.activities.values())
-    record_entries = sum(len(entries) for entries in camp.daily_records.values())
-    return activity_events + record_entries
+
+def _camp_overview(camp_name=None):
+    """Per-camp figures used by the shortage checks and forecast.
+
+    With the SQLite store these come from one indexed query instead of
+    loading every camp's activities.
+    """
+    store = camp_repository.store
+    if hasattr(store, "camp_overview") and store.exists():
+        return store.camp_overview(camp_name)
+
+    camps = read_from_file()
+    if camp_name is not None:
+        camp = camps.find(camp_name)
+        camps = [camp] if camp is not None else []
+    return [
+        {
+            "name": camp.name,
+            "location": camp.location,
+            "camp_type": camp.camp_type,
+            "start_date": camp.start_date,
+            "end_date": camp.end_date,
+            "food_stock": camp.food_stock,
+            "pay_rate": getattr(camp, "pay_rate", 0),
+            "leaders": len(camp.scout_leaders),
+            "campers": len(camp.campers),
+            "activity_entries": sum(len(events) for events in camp.activities.values()),
+            "record_entries": sum(len(entries) for entries in camp.daily_records.values()),
+        }
+        for camp in camps
+    ]
 
 
 def top_up_food_data(camp_name, amount):
     if not isinstance(amount, int) or amount < 0:
         return {"status": "invalid_amount"}
-    camps = read_from_file()
-    for camp in camps:
-        if camp.name == camp_name:
-            camp.food_stock += amount
-            save_to_file()
-            return {"status": "ok", "camp_name": camp_name, "amount": amount}
-    return {"status": "camp_not_found"}
+    with camp_repository.editing() as camps:
+        camp = camps.find(camp_name)
+        if camp is None:
+            return {"status": "camp_not_found"}
+        camp.allocate_extra_food(amount)
+        save_to_file()
+    return {"status": "ok", "camp_name": camp_name, "amount": amount}
 
 
 def top_up_food(camp_name, amount):
@@ -42,13 +73,13 @@ def top_up_food(camp_name, amount):
 def set_food_stock_data(camp_name, new_stock):
     if not isinstance(new_stock, int) or new_stock < 0:
         return {"status": "invalid_amount"}
-    camps = read_from_file()
-    for camp in camps:
-        if camp.name == camp_name:
-            camp.food_stock = new_stock
-            save_to_file()
-            return {"status": "ok", "camp_name": camp_name, "new_stock": new_stock}
-    return {"status": "camp_not_found"}
+    with camp_repository.editing() as camps:
+        camp = camps.find(camp_name)
+        if camp is None:
+            return {"status": "camp_not_found"}
+        camp.food_stock = new_stock
+        save_to_file()
+    return {"status": "ok", "camp_name": camp_name, "new_stock": new_stock}
 
 
 def set_food_stock(camp_name, new_stock):
@@ -62,13 +93,20 @@ def set_food_stock(camp_name, new_stock):
         print(f"Daily food stock for {camp_name} set to {new_stock}.")
 
 #Shortage Notifications
-def load_food_requirement(camp_name):
+def load_food_requirements():
+    """{camp name: food per camper per day} as set by scout leaders."""
     try:
-        with open(data_path("food_requirements.json"), "r") as file:
-            data = json.load(file)
-        return data.get(camp_name)
+        return serialization.read_file(data_path("food_requirements.json"))
     except (FileNotFoundError, json.JSONDecodeError):
-        return None
+        return {}
+
+
+def load_food_requirement(camp_name):
+    return load_food_requirements().get(camp_name)
+
+
+def _shortage_message(camp_name, available, required):
+    return f"Food shortage at {camp_name}! Only {available} units left but {required} needed."
 
 
 def compute_food_shortage(camp_name):
@@ -76,36 +114,36 @@ def compute_food_shortage(camp_name):
     food_per_camper = load_food_requirement(camp_name)
     if food_per_camper is None:
         return {"status": "missing_requirement"}
-    if not isinstance(food_per_camper, int) or food_per_camper < 0:
+    if not isinstance(food_per_camper, int) or isinstance(food_per_camper, bool) or food_per_camper < 0:
         return {"status": "invalid_requirement"}
-    camps = read_from_file()
-    for camp in camps:
-        if camp.name == camp_name:
-            try:
-                start = datetime.strptime(camp.start_date, "%Y-%m-%d")
-                end = datetime.strptime(camp.end_date, "%Y-%m-%d")
-                camp_duration_days = max((end - start).days + 1, 1)
-            except (TypeError, ValueError):
-                camp_duration_days = 1
-
-            camper_count = len(camp.campers)
-
-            total_available = camp.food_stock * camp_duration_days
-            required_amount = camper_count * food_per_camper * camp_duration_days
-            status = "shortage" if total_available < required_amount else "ok"
-            if status == "shortage":
-                add_notification(f"Food shortage at {camp.name}! Only {total_available} units left but {required_amount} needed.")
-            return {
-                "status": status,
-                "required": required_amount,
-                "available": total_available,
-                "camp_name": camp.name,
-                "campers": camper_count,
-                "days": camp_duration_days,
-                "food_per_camper": food_per_camper,
-                "camp_food_stock": camp.food_stock,
-            }
-    return {"status": "camp_not_found"}
+    rows = _camp_overview(camp_name)
+    if not rows:
+        return {"status": "camp_not_found"}
+    camp = rows[0]
+    try:
+        start = datetime.strptime(camp["start_date"], "%Y-%m-%d")
+        end = datetime.strptime(camp["end_date"], "%Y-%m-%d")
+        camp_duration_days = max((end - start).days + 1, 1)
+    except (TypeError, ValueError):
+        camp_duration_days = 1
+
+    camper_count = camp["campers"]
+
+    total_available = camp["food_stock"] * camp_duration_days
+    required_amount = camper_count * food_per_camper * camp_duration_days
+    status = "shortage" if total_available < required_amount else "ok"
+    if status == "shortage":
+        add_notification(_shortage_message(camp["name"], total_available, required_amount))
+    return {
+        "status": status,
+        "required": required_amount,
+        "available": total_available,
+        "camp_name": camp["name"],
+        "campers": camper_count,
+        "days": camp_duration_days,
+        "food_per_camper": food_per_camper,
+        "camp_food_stock": camp["food_stock"],
+    }
 
 
 def check_food_shortage(camp_name):
@@ -125,6 +163,9 @@ def check_food_shortage(camp_name):
         add_notification(f"Food shortage at {camp_name}! Only {res['camp_food_stock']} units left but {res['required']} needed.")
     else:
         print("Food stock is sufficient.")
+    projection = food_burn_down(camp_name)
+    if projection is not None:
+        print(describe_projection(projection))
 #check_food_shortage takes food_per_camper, validates it, computes the total requirement (campers × per-day × duration), 
 # prints that forecast, and either logs a detailed shortage notification or confirms stock sufficiency. 
 # It also guards against malformed dates while calculating the duration. 
@@ -134,46 +175,219 @@ def check_food_shortage(camp_name):
  #adjust this function later to calculate required amount automatically - once leader features are ready
 
 
+FORECAST_COLUMNS = [
+    "Camp", "Status", "Campers", "Food per Camper", "Days", "Daily Stock",
+    "Required", "Available", "Surplus", "Days of Cover",
+]
+
+
+def forecast_food_shortages(active_on=None, notify=True):
+    """Shortage forecast for every camp in one vectorised pass.
+
+    Same arithmetic as compute_food_shortage(), as a DataFrame with one row
+    per camp (see FORECAST_COLUMNS). Surplus is available - required, so a
+    negative surplus is a shortage; Days of Cover is how many days the
+    stock lasts at the camp's daily need. With active_on (a date) camps that
+    ended before it are left out. Shortages are notified in one write.
+    """
+    import numpy as np
+    import pandas as pd
+
+    camps = _camp_overview()
+    if not camps:
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+    df = pd.DataFrame(camps)
+    start = pd.to_datetime(df["start_date"], format="%Y-%m-%d", errors="coerce")
+    end = pd.to_datetime(df["end_date"], format="%Y-%m-%d", errors="coerce")
+    if active_on is not None:
+        active = end.isna() | (end >= pd.Timestamp(active_on))
+        df, start, end = df[active], start[active], end[active]
+        if df.empty:
+            return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+    # + 1 so a camp starting and ending on the same day is 1 day; bad dates count as 1 day
+    days = ((end - start).dt.days + 1).clip(lower=1).fillna(1).astype(int)
+
+    # checked on the raw values, as compute_food_shortage() does: once mapped,
+    # one camp without a requirement turns the whole column into floats
+    requirements = load_food_requirements()
+    usable = {name: value for name, value in requirements.items()
+              if isinstance(value, int) and not isinstance(value, bool) and value >= 0}
+    has_requirement = df["name"].map(lambda name: requirements.get(name) is not None).astype(bool)
+    valid = df["name"].isin(list(usable))
+    per_camper = df["name"].map(usable).where(valid, 0).astype("int64")
+
+    daily_need = df["campers"] * per_camper
+    required = daily_need * days
+    available = df["food_stock"] * days
+    surplus = available - required
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cover = np.where(daily_need > 0, available / daily_need.where(daily_need > 0, 1), np.inf)
+
+    status = np.select(
+        [~has_requirement, ~valid, surplus < 0],
+        ["missing_requirement", "invalid_requirement", "shortage"],
+        default="ok",
+    )
+    forecast = pd.DataFrame({
+        "Camp": df["name"],
+        "Status": status,
+        "Campers": df["campers"],
+        "Food per Camper": per_camper.where(valid).astype("Int64"),
+        "Days": days,
+        "Daily Stock": df["food_stock"],
+        "Required": required.where(valid).astype("Int64"),
+        "Available": available,
+        "Surplus": surplus.where(valid).astype("Int64"),
+        "Days of Cover": pd.Series(np.round(cover, 1), index=df.index).where(valid),
+    }).reset_index(drop=True)
+
+    if notify:
+        short = forecast[forecast["Status"] == "shortage"]
+        add_notifications([
+            _shortage_message(name, int(available), int(required))
+            for name, available, required in zip(short["Camp"], short["Available"], short["Required"])
+        ])
+    return forecast
+
+
+def food_shortage_sweep(today=None):
+    """Morning check of every camp that has not finished yet."""
+    return forecast_food_shortages(active_on=today or date.today())
+
+
+def print_food_shortage_sweep():
+    forecast = food_shortage_sweep()
+    if forecast.empty:
+        print("\nNo active camps found.")
+        return
+    print("\n--- Food Shortage Forecast ---")
+    print(forecast.to_string(index=False))
+    short = int((forecast["Status"] == "shortage").sum())
+    print(f"\n{short} camp(s) short of food; notifications sent." if short else "\nAll camps with requirements have enough food.")
+
+
+def food_burn_down(camp_name):
+    """Burn rate and projected stock-out for one camp (None if not found)."""
+    camp = read_from_file().find(camp_name)
+    return food_projection.project(camp) if camp is not None else None
+
+
 #Shows a dashboard using Pandas
+DASHBOARD_COLUMNS = [
+    "Camp", "Location", "Type", "Start Date", "End Date", "Leaders", "Campers",
+    "Camper %", "Leader/Camper Ratio", "Engagement Score", "Food Stock",
+    "Burn Rate", "Stock-out Date", "Pay Rate",
+]
+
+
+def _dashboard_row(camp):
+    """The per-camp dashboard figures; Camper % and the ratio are filled in per frame."""
+    projection = food_projection.project(camp)
+    return [
+        camp.name,
+        camp.location,
+        camp.camp_type,
+        camp.start_date,
+        camp.end_date,
+        len(camp.scout_leaders),
+        len(camp.campers),
+        0.0,
+        0.0,
+        # engagement = recorded activities + daily reports
+        sum(len(events) for events in camp.activities.values())
+        + sum(len(entries) for entries in camp.daily_records.values()),
+        camp.food_stock,
+        projection["burn_rate"],
+        projection["stockout_date"],
+        getattr(camp, "pay_rate", 0),
+    ]
+
+
+class DashboardCache:
+    """One dashboard DataFrame shared by the dashboard, its window and the plots.
+
+    Each row remembers the camp object and Camp._version it was computed
+    from; on the next call only camps that changed (or were reloaded from
+    disk) are recomputed and written into the existing frame. The frame
+    is shared, so callers must not modify it; code on another thread should
+    use snapshot(), since the frame may be rewritten while it reads.
+    """
+
+    def __init__(self):
+        self._rows = {}    # id(camp) -> (camp, version, row)
+        self._order = None  # ids of the camps in frame order
+        self._df = None
+        self._summary = None
+        self.version = 0   # bumped whenever the frame's contents change
+        self._lock = threading.Lock()
+
+    def data(self):
+        with self._lock:
+            return self._refresh()
+
+    def snapshot(self):
+        """(copy of the frame, summary, version), safe to use on any thread."""
+        with self._lock:
+            df, summary = self._refresh()
+            return (None if df is None else df.copy()), summary, self.version
+
+    def _refresh(self):
+        import pandas as pd
+
+        # the rows are read from the live camps, which no edit may change meanwhile
+        with camp_repository.editing() as camps:
+            if not camps:
+                return None, None
+
+            order = tuple(id(camp) for camp in camps)
+            changed = []
+            rows = {}
+            for i, camp in enumerate(camps):
+                cached = self._rows.get(id(camp))
+                if cached is not None and cached[0] is camp and cached[1] == camp._version:
+                    rows[id(camp)] = cached
+                else:
+                    rows[id(camp)] = (camp, camp._version, _dashboard_row(camp))
+                    changed.append(i)
+        self._rows = rows
+
+        if order == self._order and not changed:
+            return self._df, self._summary
+        if order == self._order:
+            try:
+                for i in changed:
+                    self._df.iloc[i] = rows[order[i]][2]
+            except (TypeError, ValueError):
+                self._order = None  # a value no longer fits its column's dtype
+        if order != self._order:
+            self._df = pd.DataFrame([rows[camp_id][2] for camp_id in order], columns=DASHBOARD_COLUMNS)
+        self._order = order
+        self.version += 1
+
+        df = self._df
+        total_campers = int(df["Campers"].sum())
+        total_leaders = int(df["Leaders"].sum())
+        df["Camper %"] = (df["Campers"] / total_campers * 100).round(2) if total_campers else 0.0
+        df["Leader/Camper Ratio"] = (df["Leaders"] / df["Campers"].where(df["Campers"] > 0)).round(2).fillna(0.0)
+        self._summary = {
+            "Total Campers": total_campers,
+            "Total Leaders": total_leaders,
+            "Average Engagement": round(df["Engagement Score"].mean(), 2) if not df.empty else 0,
+            "Average Leader/Camper Ratio": round(df["Leader/Camper Ratio"].mean(), 2) if not df.empty else 0
+        }
+        return df, self._summary
+
+
+dashboard_cache = DashboardCache()
+
+
 def build_dashboard_data():
-    """Return (df, summary) for camps without printing/plotting."""
-    camps = read_from_file()
-    if not camps:
-        return None, None
-
-    total_campers = sum(len(camp.campers) for camp in camps)
-    total_leaders = sum(len(camp.scout_leaders) for camp in camps)
-
-    data = []
-    for camp in camps:
-        campers = len(camp.campers)
-        leaders = len(camp.scout_leaders)
-        engagement = _engagement_score(camp)
-        camper_pct = round((campers / total_campers) * 100, 2) if total_campers else 0
-        leader_ratio = round(leaders / campers, 2) if campers else 0
-        data.append({
-            "Camp": camp.name,
-            "Location": camp.location,
-            "Type": camp.camp_type,
-            "Start Date": camp.start_date,
-            "End Date": camp.end_date,
-            "Leaders": leaders,
-            "Campers": campers,
-            "Camper %": camper_pct,
-            "Leader/Camper Ratio": leader_ratio,
-            "Engagement Score": engagement,
-            "Food Stock": camp.food_stock,
-            "Pay Rate": getattr(camp, "pay_rate", 0)
-        })
-
-    df = pd.DataFrame(data)
-    summary = {
-        "Total Campers": total_campers,
-        "Total Leaders": total_leaders,
-        "Average Engagement": round(df["Engagement Score"].mean(), 2) if not df.empty else 0,
-        "Average Leader/Camper Ratio": round(df["Leader/Camper Ratio"].mean(), 2) if not df.empty else 0
-    }
-    return df, summary
+    """Return (df, summary) for camps without printing/plotting.
+
+    The frame is the shared, cached one from dashboard_cache; do not modify it.
+    """
+    return dashboard_cache.data()
 
 
 def dashboard():
@@ -202,63 +416,106 @@ def _ensure_dataframe(df):
     return df
 
 
-def plot_food_stock(df=None, show=True):
-    df = _ensure_dataframe(df or build_dashboard_data()[0])
+CHARTS = {
+    "food_stock": "Food Stock per Camp",
+    "camper_distribution": "Camper Distribution",
+    "leaders": "Leaders per Camp",
+    "engagement": "Engagement Score per Camp",
+}
+
+
+def _draw_chart(kind, df, ax):
+    title = CHARTS[kind]
+    if kind == "food_stock":
+        df.plot(kind="bar", x="Camp", y="Food Stock", title=title, ax=ax)
+        ax.set_ylabel("Units")
+    elif kind == "camper_distribution":
+        df.set_index("Camp")["Campers"].plot(kind="pie", autopct="%1.1f%%", title=title, ylabel="", ax=ax)
+    elif kind == "leaders":
+        df.plot(kind="bar", x="Camp", y="Leaders", title=title, color="orange", ax=ax)
+        ax.set_ylabel("Leaders")
+    elif kind == "engagement":
+        df.plot(kind="bar", x="Camp", y="Engagement Score", title=title, color="green", ax=ax)
+        ax.set_ylabel("Engagement Score")
+
+
+def _plot(kind, df, show):
+    import matplotlib.pyplot as plt
+
+    df = _ensure_dataframe(df if df is not None else build_dashboard_data()[0])
     if df is None:
         return
-    ax = df.plot(kind="bar", x="Camp", y="Food Stock", title="Food Stock per Camp")
-    ax.set_ylabel("Units")
+    _, ax = plt.subplots()
+    _draw_chart(kind, df, ax)
     plt.tight_layout()
     if show:
         plt.show()
     return ax
 
 
+def plot_food_stock(df=None, show=True):
+    return _plot("food_stock", df, show)
+
+
 def plot_camper_distribution(df=None, show=True):
-    df = _ensure_dataframe(df or build_dashboard_data()[0])
-    if df is None:
-        return
-    ax = df.set_index("Camp")["Campers"].plot(kind="pie", autopct="%1.1f%%", title="Camper Distribution", ylabel="")
-    plt.tight_layout()
-    if show:
-        plt.show()
-    return ax
+    return _plot("camper_distribution", df, show)
 
 
 def plot_leaders_per_camp(df=None, show=True):
-    df = _ensure_dataframe(df or build_dashboard_data()[0])
-    if df is None:
-        return
-    ax = df.plot(kind="bar", x="Camp", y="Leaders", title="Leaders per Camp", color="orange")
-    ax.set_ylabel("Leaders")
-    plt.tight_layout()
-    if show:
-        plt.show()
-    return ax
+    return _plot("leaders", df, show)
 
 
 def plot_engagement_scores(df=None, show=True):
-    df = _ensure_dataframe(df or build_dashboard_data()[0])
-    if df is None:
-        return
-    ax = df.plot(kind="bar", x="Camp", y="Engagement Score", title="Engagement Score per Camp", color="green")
-    ax.set_ylabel("Engagement Score")
-    plt.tight_layout()
-    if show:
-        plt.show()
-    return ax
+    return _plot("engagement", df, show)
+
+
+def render_chart_png(kind, df, dpi=100):
+    """Draw a chart on an off-screen Agg canvas and return it as PNG bytes.
+
+    Uses a standalone Figure rather than pyplot, so it is safe to call from
+    a worker thread while Tk keeps running.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(6.4, 4.8), dpi=dpi)
+    FigureCanvasAgg(fig)
+    _draw_chart(kind, df, fig.add_subplot())
+    fig.tight_layout()
+    buf = BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+_chart_cache = {}  # (kind, dashboard version) -> PNG bytes
+_chart_lock = threading.Lock()
+
+
+def cached_chart(kind, version):
+    with _chart_lock:
+        return _chart_cache.get((kind, version))
+
+
+def store_chart(kind, version, png):
+    """Keep a rendered chart; renders of older dashboard versions are dropped."""
+    with _chart_lock:
+        if any(key[1] > version for key in _chart_cache):
+            return  # a newer render already replaced this version
+        for key in [key for key in _chart_cache if key[1] < version]:
+            del _chart_cache[key]
+        _chart_cache[(kind, version)] = png
 
 
 def set_pay_rate_data(camp_name, rate):
     if not isinstance(rate, int) or rate < 0:
         return {"status": "invalid_amount"}
-    camps = read_from_file()
-    for camp in camps:
-        if camp.name == camp_name:
-            camp.pay_rate = rate
-            save_to_file()
-            return {"status": "ok", "camp_name": camp_name, "rate": rate}
-    return {"status": "camp_not_found"}
+    with camp_repository.editing() as camps:
+        camp = camps.find(camp_name)
+        if camp is None:
+            return {"status": "camp_not_found"}
+        camp.pay_rate = rate
+        save_to_file()
+    return {"status": "ok", "camp_name": camp_name, "rate": rate}
 
 
 def set_pay_rate(camp_name, rate):
@@ -1,35 +1,44 @@
 import json
 from datetime import datetime
+from records import Notification
 from utils import data_path
+from storage import change_feed, durable, serialization
+
+NOTIFICATIONS_FILE = data_path("notifications.json")
 
 
 def load_notifications():
     try:
-        with open(data_path("notifications.json"), "r") as f:
-            return json.load(f)
+        return [Notification.from_dict(n) for n in serialization.read_file(NOTIFICATIONS_FILE)]
     except (FileNotFoundError, json.JSONDecodeError):
         return []
 
 
 def save_notifications(notifications):
-    with open(data_path("notifications.json"), "w") as f:
-        json.dump(notifications, f, indent=4)
+    durable.write_json(NOTIFICATIONS_FILE, notifications)
 
 
 def add_notification(message):
-    data = load_notifications()
-    data.append({
-        "message": message,
-        "read": False,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M")
-    })
-    save_notifications(data)
+    add_notifications([message])
+
+
+def add_notifications(messages):
+    """Add several notifications with a single read and write of the file."""
+    if not messages:
+        return
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
+    notes = [Notification(message=message, read=False, timestamp=timestamp) for message in messages]
+    # under the file lock, so notifications added by other sessions meanwhile are kept
+    durable.update_json(NOTIFICATIONS_FILE, lambda data: data.extend(notes), list)
+    for note in notes:
+        change_feed.publish("notification", note)
 
 def mark_all_as_read():
-    data = load_notifications()
-    for n in data:
-        n["read"] = True
-    save_notifications(data)
+    def mark(data):
+        for n in data:
+            n["read"] = True
+
+    durable.update_json(NOTIFICATIONS_FILE, mark, list)
 
 
 
@@ -1,39 +1,104 @@
 import os
-import json
+import bisect
 import csv
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 
-from camp_class import Camp, save_to_file, read_from_file, generate_camper_id
+from camp_class import Camp, save_to_file, read_from_file, generate_camper_id, camp_repository
+from records import ActivityEntry, Incident
+from storage import change_feed, durable
 from utils import get_int, data_path
 
 
+@lru_cache(maxsize=4096)
+def _parse_range(start_date, end_date):
+    try:
+        return (datetime.strptime(start_date, "%Y-%m-%d").date(),
+                datetime.strptime(end_date, "%Y-%m-%d").date())
+    except (TypeError, ValueError):
+        return None
+
+
+def camp_range(camp):
+    """(start, end) dates of a camp, parsed once per distinct pair of date
+    strings; None if the dates are missing or malformed (such a camp never
+    counts as overlapping)."""
+    return _parse_range(camp.start_date, camp.end_date)
+
+
 def camps_overlap(camp1, camp2):
-    s1 = datetime.strptime(camp1.start_date, "%Y-%m-%d")
-    e1 = datetime.strptime(camp1.end_date, "%Y-%m-%d")
-    s2 = datetime.strptime(camp2.start_date, "%Y-%m-%d")
-    e2 = datetime.strptime(camp2.end_date, "%Y-%m-%d")
-    return not (s1 > e2 or s2 > e1)
+    r1, r2 = camp_range(camp1), camp_range(camp2)
+    if r1 is None or r2 is None:
+        return False
+    return not (r1[0] > r2[1] or r2[0] > r1[1])
 
 
 def camps_conflict(selected_camps):
-    for camp_a in selected_camps:
-        for camp_b in selected_camps:
-            if camp_a is camp_b:
-                continue
-            if camps_overlap(camp_a, camp_b):
-                return True
+    """True if any two of the camps overlap: sort by start date, then each
+    camp only has to start after the latest end date seen so far. A camp
+    selected twice does not conflict with itself."""
+    unique = {id(camp): camp for camp in selected_camps}.values()
+    ranges = sorted(r for r in map(camp_range, unique) if r is not None)
+    latest_end = None
+    for start, end in ranges:
+        if latest_end is not None and start <= latest_end:
+            return True
+        latest_end = end if latest_end is None else max(latest_end, end)
     return False
 
 
-def save_selected_camps(leader_username, selected_camp_names):
-    camps = read_from_file()
-    for camp in camps:
-        if camp.name in selected_camp_names:
-            camp.assign_leader(leader_username)
+def _merged_ranges(camps):
+    """Date ranges of `camps` merged into sorted, disjoint (starts, ends) lists."""
+    starts, ends = [], []
+    for start, end in sorted(r for r in map(camp_range, camps) if r is not None):
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
         else:
-            if leader_username in camp.scout_leaders:
-                camp.scout_leaders.remove(leader_username)
-    save_to_file()
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
+def camps_clear_of(camps, taken):
+    """Camps in `camps` (other than those in `taken`) that overlap none of `taken`."""
+    starts, ends = _merged_ranges(taken)
+    taken_ids = {id(camp) for camp in taken}
+    clear = []
+    for camp in camps:
+        if id(camp) in taken_ids:
+            continue
+        r = camp_range(camp)
+        if r is not None:
+            # the last merged range starting on or before this camp's end is the only candidate
+            i = bisect.bisect_right(starts, r[1]) - 1
+            if i >= 0 and ends[i] >= r[0]:
+                continue
+        clear.append(camp)
+    return clear
+
+
+def camps_available_to_leader(leader_username, camps=None):
+    """Camps the leader does not supervise yet and could take on without a
+    date overlap with the camps they already supervise."""
+    if camps is None:
+        camps = read_from_file()
+    return camps_clear_of(camps, camps.for_leader(leader_username))
+
+
+def save_selected_camps(leader_username, selected_camp_names):
+    with camp_repository.editing() as camps:
+        for camp in camps:
+            if camp.name in selected_camp_names:
+                camp.assign_leader(leader_username)
+            else:
+                if leader_username in camp.scout_leaders:
+                    camp.scout_leaders.remove(leader_username)
+                    camp.mark_dirty("scout_leaders")
+        save_to_file()
 
 
 def view_leader_camp_assignments():
@@ -52,83 +117,268 @@ def view_leader_camp_assignments():
         print("\nNo leader has been assigned camps yet")
 
 
+# campers saved per batch by import_campers()
+IMPORT_BATCH_SIZE = 1000
+
+# roster CSVs picked up by the bulk import
+CAMPERS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "campers")
+
+
+def _read_roster_rows(filepath):
+    """Yield the camper info dict for each row of a campers CSV."""
+    with open(filepath, newline="") as file:
+        for row in csv.DictReader(file):
+            activities = (row.get("Activities") or "").split(";")
+            yield {
+                "name": (row.get("Name") or "").strip(),
+                "age": (row.get("Age") or "").strip(),
+                "activities": [a.strip() for a in activities if a.strip()],
+            }
+
+
+def iter_campers_csv(filepath):
+    """Yield (camper_id, info) for each row of a campers CSV, one row at a time.
+
+    Raises FileNotFoundError if the file does not exist.
+    """
+    for info in _read_roster_rows(filepath):
+        yield generate_camper_id(), info
+
+
 def load_campers_csv(filepath):
-    campers = {}
     try:
-        with open(filepath) as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                name = row["Name"].strip()
-                age = row["Age"].strip()
-                activities = row["Activities"].split(';')
-
-                camper_id = generate_camper_id()
-                campers[camper_id] = {
-                    "name" : name,
-                    "age": age,
-                    "activities": [a.strip() for a in activities]
-                }
+        return dict(iter_campers_csv(filepath))
     except FileNotFoundError:
         print("\nCSV file not found.")
-    return campers
+        return {}
 
 
-def save_campers(camp_name, campers):
-    camps = read_from_file()
+def _camper_key(info):
+    # the same child on two rosters gets two fresh ids, so match on name + age
+    return info.get("name", "").casefold(), str(info.get("age", ""))
+
+
+def _valid_camper(info):
+    return bool(info.get("name")) and str(info.get("age", "")).isdigit()
+
+
+def _assigned_campers(camps):
+    """Camper ids and name/age keys already assigned to any camp, built once per import."""
+    ids, keys = set(), set()
     for camp in camps:
-        if camp.name == camp_name:
-            if camp.campers_info is None:
-                camp.campers_info = {}
-            for camper_id, info in campers.items():
-                value = False
-                for other_camp in camps:
-                    if other_camp.name != camp_name and camper_id in other_camp.campers:
-                        # camper already assigned elsewhere
-                        value = True
-                        break
-                if value is False:
-                    if camper_id not in camp.campers:
-                        camp.campers.append(camper_id)
-                    camp.campers_info[camper_id] = info
+        info = camp.campers_info or {}
+        for camper_id in camp.campers:
+            ids.add(camper_id)
+            if camper_id in info:
+                keys.add(_camper_key(info[camper_id]))
+    return ids, keys
+
+
+def _camp_with_id(camps, camp_id):
+    return next((camp for camp in camps if camp.id == camp_id), None)
+
+
+def import_campers(camp_name, rows, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """Assign campers from an iterable of (camper_id, info) rows to a camp.
+
+    Rows are consumed lazily and saved every `batch_size` rows. Rows without a
+    name or whole-number age are counted as invalid; campers already in any
+    camp (same id, or same name and age) or earlier in the import are skipped.
+    progress(rows_read, seconds) is called after each batch.
+
+    Each batch is added and saved under camp_repository.editing(), so loads
+    and saves on other threads (the GUI runs imports on a worker) cannot
+    come in between; the camp is looked up again, by id, for every batch.
+    """
+    camps = read_from_file()
+    camp = camps.find(camp_name)
+    if camp is None:
+        return {"status": "camp_not_found"}
+    camp_id = camp.id
+    assigned_ids, assigned_keys = _assigned_campers(camps)
+
+    added, skipped, invalid, rows_read = [], 0, 0, 0
+    started = time.perf_counter()
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
             break
-    save_to_file()
-    return {"status": "ok", "camp": camp_name, "added": list(campers.keys())}
+        rows_read += len(batch)
+        with camp_repository.editing() as camps:
+            camp = _camp_with_id(camps, camp_id)
+            if camp is None:  # deleted since the import started
+                return {"status": "camp_not_found"}
+            for camper_id, info in batch:
+                if not _valid_camper(info):
+                    invalid += 1
+                    continue
+                key = _camper_key(info)
+                if camper_id in assigned_ids or key in assigned_keys:
+                    skipped += 1
+                    continue
+                assigned_ids.add(camper_id)
+                assigned_keys.add(key)
+                camp.add_camper(camper_id, info)
+                added.append(camper_id)
+            save_to_file()
+        if progress:
+            progress(rows_read, time.perf_counter() - started)
+
+    seconds = time.perf_counter() - started
+    return {
+        "status": "ok",
+        "camp": camp_name,
+        "added": added,
+        "skipped": skipped,
+        "invalid": invalid,
+        "rows": rows_read,
+        "seconds": seconds,
+        "rows_per_second": rows_read / seconds if seconds else 0,
+    }
 
 
-def find_camp_by_name(camp_name):
+def list_roster_files(folder=CAMPERS_DIR):
+    """Paths of the CSV files in the campers folder, sorted by name."""
+    if not os.path.isdir(folder):
+        return []
+    return [os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.endswith(".csv")]
+
+
+def _parse_roster_file(filepath):
+    """Process-pool worker: (valid rows as (row number, info), invalid row count)."""
+    rows, invalid = [], 0
+    for row_no, info in enumerate(_read_roster_rows(filepath), start=1):
+        if _valid_camper(info):
+            rows.append((row_no, info))
+        else:
+            invalid += 1
+    return rows, invalid
+
+
+def _roster_camper_id(filepath, row_no, info, taken):
+    # derived from the file and row, so importing the same rosters gives the same ids
+    seed = f"{os.path.basename(filepath)}\0{row_no}\0{info['name']}\0{info['age']}"
+    attempt = 0
+    while True:
+        digest = hashlib.sha1(f"{seed}\0{attempt}".encode()).hexdigest()
+        camper_id = "cmp_" + digest[:8]
+        if camper_id not in taken:
+            return camper_id
+        attempt += 1
+
+
+def import_roster_files(assignments, workers=None, progress=None):
+    """Import many roster CSVs at once; `assignments` maps file path -> camp name.
+
+    Files are parsed in parallel worker processes, then merged in file name
+    order: duplicates are skipped across files as well as against existing
+    camps, ids are derived from file name and row number, and everything is
+    saved with a single save_to_file(). progress(rows_read, seconds) is
+    called once parsing is done, before any camp is changed, so a progress
+    callback that raises cancels the import with nothing saved.
+    """
+    paths = sorted(assignments, key=lambda path: (os.path.basename(path), path))
+    if not paths:
+        return {"status": "no_campers"}
+    for path in paths:
+        if not os.path.exists(path):
+            return {"status": "file_not_found", "file": path}
     camps = read_from_file()
-    for camp in camps:
-        if camp.name == camp_name:
-            return camp
-    return None
+    for path in paths:
+        if camps.find(assignments[path]) is None:
+            return {"status": "camp_not_found", "camp": assignments[path]}
+
+    started = time.perf_counter()
+    if len(paths) == 1 or workers == 1:
+        parsed = [_parse_roster_file(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(_parse_roster_file, paths))
+    if progress:
+        progress(sum(len(rows) + invalid for rows, invalid in parsed), time.perf_counter() - started)
+
+    files = {}
+    # camps are looked up again after parsing, under the same lock as the save
+    with camp_repository.editing() as camps:
+        for path in paths:
+            if camps.find(assignments[path]) is None:
+                return {"status": "camp_not_found", "camp": assignments[path]}
+        assigned_ids, assigned_keys = _assigned_campers(camps)
+        for path, (rows, invalid) in zip(paths, parsed):
+            camp = camps.find(assignments[path])
+            added, skipped = [], 0
+            for row_no, info in rows:
+                key = _camper_key(info)
+                if key in assigned_keys:
+                    skipped += 1
+                    continue
+                camper_id = _roster_camper_id(path, row_no, info, assigned_ids)
+                assigned_ids.add(camper_id)
+                assigned_keys.add(key)
+                camp.add_camper(camper_id, info)
+                added.append(camper_id)
+            files[path] = {"camp": camp.name, "added": added, "skipped": skipped, "invalid": invalid,
+                           "rows": len(rows) + invalid}
+        save_to_file()
+
+    seconds = time.perf_counter() - started
+    rows_read = sum(f["rows"] for f in files.values())
+    if not rows_read:
+        return {"status": "no_campers"}
+    return {
+        "status": "ok",
+        "files": files,
+        "added": [camper_id for f in files.values() for camper_id in f["added"]],
+        "skipped": sum(f["skipped"] for f in files.values()),
+        "invalid": sum(f["invalid"] for f in files.values()),
+        "rows": rows_read,
+        "seconds": seconds,
+        "rows_per_second": rows_read / seconds if seconds else 0,
+    }
+
+
+def import_roster_folder(camp_name, folder=CAMPERS_DIR, workers=None, progress=None):
+    """Import every CSV in the campers folder into one camp."""
+    return import_roster_files({path: camp_name for path in list_roster_files(folder)}, workers, progress)
+
+
+def save_campers(camp_name, campers):
+    return import_campers(camp_name, campers.items())
+
+
+def find_camp_by_name(camp_name):
+    return read_from_file().find(camp_name)
 
 
 def bulk_assign_campers_data(selected_camp, campers):
     """Assign campers dict to the given Camp instance; returns status dict."""
     if selected_camp is None:
         return {"status": "no_camp"}
-    # prevent duplicates across camps
-    camps = read_from_file()
-    for name in list(campers.keys()):
-        for other_camp in camps:
-            if other_camp.name != selected_camp.name and name in other_camp.campers:
-                # remove camper already assigned elsewhere
-                campers.pop(name, None)
-                break
     return save_campers(selected_camp.name, campers)
 
 
-def bulk_assign_campers_from_csv(camp_name, filepath):
-    """Pure helper: assign campers from a CSV to a named camp."""
+def bulk_assign_campers_from_csv(camp_name, filepath, batch_size=IMPORT_BATCH_SIZE, progress=None):
+    """Pure helper: stream campers from a CSV into a named camp."""
     if not os.path.exists(filepath):
         return {"status": "file_not_found"}
-    selected_camp = find_camp_by_name(camp_name)
-    if selected_camp is None:
+    if find_camp_by_name(camp_name) is None:
         return {"status": "camp_not_found"}
-    campers = load_campers_csv(filepath)
-    if not campers:
+    res = import_campers(camp_name, iter_campers_csv(filepath), batch_size, progress)
+    if res.get("status") == "ok" and not res["rows"]:
         return {"status": "no_campers"}
-    return bulk_assign_campers_data(selected_camp, campers)
+    return res
+
+
+def import_summary(res):
+    """One-line description of an import_campers() / import_roster_files() result."""
+    target = f"to {res['camp']}" if "camp" in res else f"from {len(res['files'])} roster file(s)"
+    line = f"Assigned {len(res['added'])} of {res['rows']} campers {target}"
+    if res["skipped"]:
+        line += f", {res['skipped']} already assigned"
+    if res["invalid"]:
+        line += f", {res['invalid']} invalid"
+    return line + f" ({res['rows_per_second']:.0f} rows/s)."
 
 
 def assign_camps_to_leader(camps, leader_username, selected_indices):
@@ -145,15 +395,18 @@ def assign_camps_to_leader(camps, leader_username, selected_indices):
     if camps_conflict(selected_camps):
         return {"status": "overlap"}
     # apply assignments
-    for camp in camps:
-        if camp.name in selected_camp_names:
-            if leader_username not in camp.scout_leaders:
-                camp.scout_leaders.append(leader_username)
-        else:
-            if leader_username in camp.scout_leaders:
-                camp.scout_leaders.remove(leader_username)
-
-    save_to_file()
+    with camp_repository.editing():
+        for camp in camps:
+            if camp.name in selected_camp_names:
+                if leader_username not in camp.scout_leaders:
+                    camp.scout_leaders.append(leader_username)
+                    camp.mark_dirty("scout_leaders")
+            else:
+                if leader_username in camp.scout_leaders:
+                    camp.scout_leaders.remove(leader_username)
+                    camp.mark_dirty("scout_leaders")
+
+        save_to_file()
     return {"status": "ok", "selected": selected_camp_names}
 
 def assign_camps_to_leader_ui(leader_username):
@@ -205,16 +458,10 @@ def assign_camps_to_leader_ui(leader_username):
 
 
 def save_food_requirement(camp_name, food_per_camper):
-    try:
-        with open(data_path("food_requirements.json"), "r") as file:
-            data = json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        data = {}
-
-    data[camp_name] = food_per_camper
+    def put(data):
+        data[camp_name] = food_per_camper
 
-    with open(data_path("food_requirements.json"), 'w') as file:
-        json.dump(data, file, indent=4)
+    durable.update_json(data_path("food_requirements.json"), put, dict)
     return {"status": "ok", "camp": camp_name, "food_per_camper": food_per_camper}
 
 
@@ -328,28 +575,26 @@ def record_daily_activity():
 
 def add_activity_entry(camp, date, activity_name, activity_time, notes, food_units=None, campers=None):
     """Pure helper to add an activity entry to a camp."""
-    entry = {
-        "activity": activity_name or "unspecified",
-        "time": activity_time,
-        "notes": notes,
-    }
+    entry = ActivityEntry(activity=activity_name or "unspecified", time=activity_time, notes=notes)
     if food_units is not None:
-        entry["food_used"] = food_units
+        entry.food_used = food_units
 
     if campers:
-        entry["campers"] = campers
+        entry.campers = campers
 
-    if date not in camp.activities:
-        camp.activities[date] = []
-    camp.activities[date].append(entry)
+    with camp_repository.editing():
+        camp.assign_activity(entry, date)
 
-    camp.note_daily_record(date, notes)
+        camp.note_daily_record(date, notes)
 
+        if food_units is not None:
+            if date not in camp.daily_food_usage:
+                camp.daily_food_usage[date] = 0
+            camp.daily_food_usage[date] += food_units
+            camp.mark_dirty("daily_food_usage")
+        save_to_file()
     if food_units is not None:
-        if date not in camp.daily_food_usage:
-            camp.daily_food_usage[date] = 0
-        camp.daily_food_usage[date] += food_units
-    save_to_file()
+        change_feed.publish("food_usage", {"camp": camp.name, "camp_id": camp.id, "date": date, "units": food_units})
     return entry
 
 
@@ -414,21 +659,17 @@ def activity_participation_data(camp):
         return {"status": "ok", "entries": summary}
 
 def record_incident_entry_data(camp_name, date, description, campers_involved, time=None):
-    camp = find_camp_by_name(camp_name)
-    if camp is None:
-        return {"status":"camp_not_found"}
-    
-    if campers_involved is None:
-        campers_involved = []
-    
-    incident = {
-        "date": date,
-        "time": time or "",
-        "description": description,
-        "campers" : campers_involved,
-    }
-    camp.incidents.append(incident)
-    save_to_file()
+    with camp_repository.editing() as camps:
+        camp = camps.find(camp_name)
+        if camp is None:
+            return {"status":"camp_not_found"}
+
+        if campers_involved is None:
+            campers_involved = []
+
+        incident = Incident(date=date, time=time or "", description=description, campers=campers_involved)
+        camp.add_incident(incident)
+        save_to_file()
     return {"status": "ok"}
 
 def incidents_for_camp_data(camp):
@@ -441,10 +682,8 @@ def incidents_for_camp_data(camp):
 
 
 def info_from_json():
-    with open(data_path('camp_data.json'), 'r') as file:
-        data = json.load(file)
-        for camp in data:
-            print(camp)
+    for camp in read_from_file():
+        print(camp.to_dict())
 
 
 def money_earned_per_camp():
@@ -550,8 +789,7 @@ def bulk_assign_campers():
             continue
 
         selected_camp = camps[choice - 1]
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        csv_folder = os.path.join(os.path.dirname(base_dir), "campers")
+        csv_folder = CAMPERS_DIR
 
         if not os.path.exists(csv_folder):
             print("\nCSV folder not found. Create a 'campers' folder in the project root and add CSV files before bulk assigning.")
@@ -569,27 +807,37 @@ def bulk_assign_campers():
         for f in files:
             n+=1
             print(f"[{n}] {f}")
+        print("[0] All files")
 
         try:
             file_choice = int(input("\nSelect a CSV file to import: "))
-            if not (1<= file_choice <= len(files)):
+            if not (0<= file_choice <= len(files)):
                 print("Invalid output. Please try again.")
                 continue
         except ValueError:
             print("Invalid output. Please try again.")
             continue
 
+        if file_choice == 0:
+            res = import_roster_folder(selected_camp.name, csv_folder)
+            if res.get("status") == "ok" and res["added"]:
+                print("\n" + import_summary(res))
+            else:
+                print("\nNo campers were assigned.")
+            break
+
         selected_file = files[file_choice - 1]
         filepath = os.path.join(csv_folder, selected_file)
 
-        campers = load_campers_csv(filepath)
-        if not campers:
+        res = bulk_assign_campers_from_csv(
+            selected_camp.name, filepath,
+            progress=lambda rows, seconds: print(f"  {rows} rows read ({rows / seconds:.0f} rows/s)"),
+        )
+        if res.get("status") == "no_campers":
             print("\nCSV contained no campers.")
             continue
-
-        res = bulk_assign_campers_data(selected_camp, campers)
-        if res and res.get("status") == "ok":
-            print(f"\nSuccessfully assigned {len(campers)} campers to {selected_camp.name}!")
+        if res.get("status") == "ok" and res["added"]:
+            print("\n" + import_summary(res))
         else:
             print("\nNo campers were assigned.")
         break
@@ -1,29 +1,41 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime,timedelta
+from io import BytesIO
 from PIL import Image, ImageTk
 from chat_window import open_chat_window, open_group_chat_window
 
 
-from user_logins import users, load_logins, check_disabled_logins, save_logins, disabled_logins, enable_login
+from user_logins import users, load_logins, check_disabled_logins, save_logins, disabled_logins, enable_login, set_password, verify_login, disabled_accounts
 from features.admin import list_users
-from camp_class import Camp, save_to_file, read_from_file
+from camp_class import Camp, save_to_file, read_from_file, camp_repository
 from features.logistics import (
     set_food_stock_data,
     top_up_food_data,
     set_pay_rate_data,
     compute_food_shortage,
-    build_dashboard_data,
-    plot_food_stock,
-    plot_camper_distribution,
-    plot_leaders_per_camp,
-    plot_engagement_scores,
+    food_shortage_sweep,
+    food_burn_down,
+    dashboard_cache,
+    CHARTS,
+    render_chart_png,
+    cached_chart,
+    store_chart,
 )
-from features.notifications import load_notifications, mark_all_as_read, add_notification
+from features.notifications import load_notifications, mark_all_as_read, add_notification, NOTIFICATIONS_FILE
+from storage import change_feed
+from features.food_projection import describe_projection
 from features.scout import (
     assign_camps_to_leader,
+    camps_clear_of,
+    camps_conflict,
     bulk_assign_campers_from_csv,
+    import_summary,
+    import_roster_folder,
     assign_food_amount_pure,
     record_activity_entry_data,
     activity_participation_data,
@@ -36,6 +48,110 @@ from features.scout import (
 )
 from messaging import get_conversations_for_user, get_conversation, send_message
 
+class TaskCancelled(Exception):
+    """Raised inside a background task once its Task was cancelled."""
+
+
+class Task:
+    """A blocking call running on BackgroundTasks' pool for a Tk widget.
+
+    on_done(result) / on_error(exc) / on_progress(*progress) run on the Tk
+    thread. cancel(), or destroying the widget, drops the result. Work that
+    has already started only stops early if it calls report().
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, widget, on_done, on_error, on_progress):
+        self.widget = widget
+        self.cancelled = False
+        self.future = None
+        self.progress = None  # latest report() arguments, from the worker
+        self._shown_progress = None
+        self._on_done = on_done
+        self._on_error = on_error
+        self._on_progress = on_progress
+        self._busy = False
+
+    def report(self, *progress):
+        """Progress callback for the worker: records progress and stops the
+        job with TaskCancelled once the task was cancelled."""
+        if self.cancelled:
+            raise TaskCancelled()
+        self.progress = progress
+
+    def cancel(self):
+        if self.cancelled:
+            return
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+        self._set_busy(False)
+
+    def _set_busy(self, busy):
+        # busy cursor on the task's window while any of its tasks run
+        if busy == self._busy:
+            return
+        self._busy = busy
+        try:
+            top = self.widget.winfo_toplevel()
+            top._busy_tasks = getattr(top, "_busy_tasks", 0) + (1 if busy else -1)
+            top.configure(cursor="watch" if top._busy_tasks else "")
+        except tk.TclError:
+            pass  # window already gone
+
+    def _poll(self):
+        if self.cancelled:
+            return
+        if not self.widget.winfo_exists():
+            self.cancel()
+            return
+        if self._on_progress and self.progress is not None and self.progress is not self._shown_progress:
+            self._shown_progress = self.progress
+            self._on_progress(*self.progress)
+        if not self.future.done():
+            self.widget.after(self.POLL_MS, self._poll)
+            return
+        self._set_busy(False)
+        try:
+            result = self.future.result()
+        except TaskCancelled:
+            return
+        except Exception as exc:
+            if self._on_error:
+                self._on_error(exc)
+            else:
+                show_error_toast(self.widget, "Error", str(exc))
+            return
+        if self._on_done:
+            self._on_done(result)
+
+
+class BackgroundTasks:
+    """Runs file I/O and number crunching off the Tk thread.
+
+    run() hands fn to a small thread pool and returns a Task that polls it
+    with after(), so results are applied on the Tk thread while the window
+    keeps redrawing.
+    """
+
+    def __init__(self, workers=3):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gui-task")
+
+    def run(self, widget, fn, *args, on_done=None, on_error=None, on_progress=None, pass_task=False):
+        """Call fn(*args) on the pool; with pass_task=True it is called as
+        fn(task, *args) so it can call task.report()."""
+        task = Task(widget, on_done, on_error, on_progress)
+        if pass_task:
+            args = (task,) + args
+        task.future = self._executor.submit(fn, *args)
+        task._set_busy(True)
+        widget.after(Task.POLL_MS, task._poll)
+        return task
+
+
+background_tasks = BackgroundTasks()
+
 LOGO_GREEN = "#487C56"       # match logo green
 THEME_BG = "#0b1f36"         # window background
 THEME_CARD = "#12263f"       # card background
@@ -48,6 +164,13 @@ THEME_ACCENT_PRESSED = "#388e3c"
 
 _GIF_CACHE = {}
 
+# resized background frames kept across all windows, in bytes of RGBA pixels
+FRAME_CACHE_BYTES = 160 * 1024 * 1024
+# wait this long after the last resize event before resizing the frames
+RESIZE_DEBOUNCE_MS = 120
+# once the size has held this long, swap the quick resize for a LANCZOS one
+RESIZE_SETTLE_MS = 600
+
 
 def _load_gif_frames_raw(name):
     """Return list of raw RGBA frames for a gif, cached."""
@@ -69,46 +192,159 @@ def _load_gif_frames_raw(name):
     return frames
 
 
+class FrameCache:
+    """Resized gif frames shared by every animated background.
+
+    Keyed by (gif name, width, height, quality). When the frames together
+    take more than max_bytes, the least recently used sizes are dropped.
+    Thread-safe: frames are resized on FRAME_EXECUTOR.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (frames, bytes)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, frames):
+        size = sum(frame.width * frame.height * 4 for frame in frames)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (frames, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, freed) = self._entries.popitem(last=False)
+                self.total_bytes -= freed
+
+
+frame_cache = FrameCache(FRAME_CACHE_BYTES)
+FRAME_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gif-resize")
+
+
+def _resized_frames(gif_name, size, quality):
+    """Frames of a gif at `size`, from the cache or resized now (worker thread)."""
+    key = (gif_name, size[0], size[1], quality)
+    frames = frame_cache.get(key)
+    if frames is None:
+        resample = Image.LANCZOS if quality else Image.NEAREST
+        frames = [frame.resize(size, resample) for frame in _load_gif_frames_raw(gif_name)]
+        frame_cache.put(key, frames)
+    return frames
+
+
 def _attach_gif_background(container, gif_name="campfire.gif", delay=100, start_delay=100):
-    """Attach a full-window animated gif to a container."""
+    """Attach a full-window animated gif to a container.
+
+    Frames are resized off the UI thread: a quick NEAREST resize once the
+    window has stopped changing size for RESIZE_DEBOUNCE_MS, then a LANCZOS
+    one when it has held for RESIZE_SETTLE_MS. Until then the previous
+    frames stay up. PhotoImages are made per frame as the animation
+    reaches it, and only for the size on screen.
+    """
     container.bg_label = tk.Label(container, bd=0, highlightthickness=0)
     container.bg_label.place(relx=0, rely=0, relwidth=1, relheight=1)
     container.bg_label.configure(bg=THEME_BG)
     container.bg_label.lower()
-    container._bg_frames_raw = _load_gif_frames_raw(gif_name)
-    container._bg_frame_index = 0
-    container._bg_photo = None
-    container._bg_last_size = None
-    container._bg_resized_cache = {}
-
-    def render(index):
-        if not container._bg_frames_raw:
-            return
+    raw_frames = _load_gif_frames_raw(gif_name)
+    if not raw_frames:
+        return
+
+    state = {
+        "size": None,       # size of the frames being shown
+        "quality": False,   # whether they are the LANCZOS ones
+        "frames": [],       # PIL frames being shown
+        "photos": [],       # PhotoImage per frame, made on first display
+        "index": 0,
+        "job": None,        # (future, size, quality) of the resize in flight
+        "debounce": None,
+        "settle": None,
+    }
+
+    def window_size():
         w = max(container.winfo_width(), container.winfo_reqwidth(), 1)
         h = max(container.winfo_height(), container.winfo_reqheight(), 1)
-        if w == 1 and h == 1:
-            container.after(30, lambda: render(index))
+        return None if (w, h) == (1, 1) else (w, h)
+
+    def show(frames, size, quality):
+        state.update(frames=frames, size=size, quality=quality, photos=[None] * len(frames))
+
+    def request(size, quality):
+        frames = frame_cache.get((gif_name, size[0], size[1], quality))
+        if frames is not None:
+            show(frames, size, quality)
             return
-        size_key = (w, h)
-        if size_key != container._bg_last_size:
-            resized = [ImageTk.PhotoImage(frame.resize((w, h), Image.LANCZOS)) for frame in container._bg_frames_raw]
-            container._bg_resized_cache[size_key] = resized
-            container._bg_last_size = size_key
-        frames = container._bg_resized_cache.get(size_key)
-        if frames:
-            frame = frames[index % len(frames)]
-            container.bg_label.configure(image=frame)
+        job = (FRAME_EXECUTOR.submit(_resized_frames, gif_name, size, quality), size, quality)
+        state["job"] = job
+        container.after(30, lambda: poll(job))
+
+    def poll(job):
+        if not container.winfo_exists() or state["job"] is not job:
+            return  # window gone, or a newer size was requested
+        future, size, quality = job
+        if not future.done():
+            container.after(30, lambda: poll(job))
+            return
+        state["job"] = None
+        try:
+            frames = future.result()
+        except Exception:
+            return
+        if size == window_size():
+            show(frames, size, quality)
+
+    def settle():
+        state["settle"] = None
+        size = window_size()
+        if size is not None and size == state["size"] and not state["quality"]:
+            request(size, True)
+
+    def on_size_change():
+        state["debounce"] = None
+        size = window_size()
+        if size is None:
+            state["debounce"] = container.after(30, on_size_change)
+            return
+        if size != state["size"]:
+            if frame_cache.get((gif_name, size[0], size[1], True)) is not None:
+                request(size, True)
+            else:
+                request(size, False)
+        if state["settle"] is not None:
+            container.after_cancel(state["settle"])
+        state["settle"] = container.after(RESIZE_SETTLE_MS, settle)
+
+    def on_configure(event):
+        if event.widget is not container or window_size() == state["size"]:
+            return
+        if state["debounce"] is not None:
+            container.after_cancel(state["debounce"])
+        state["debounce"] = container.after(RESIZE_DEBOUNCE_MS, on_size_change)
 
     def animate():
-        if not container._bg_frames_raw:
+        if not container.winfo_exists():
             return
-        render(container._bg_frame_index)
-        container._bg_frame_index = (container._bg_frame_index + 1) % max(1, len(container._bg_frames_raw))
+        frames = state["frames"]
+        if frames:
+            i = state["index"] % len(frames)
+            if state["photos"][i] is None:
+                state["photos"][i] = ImageTk.PhotoImage(frames[i])
+            container.bg_label.configure(image=state["photos"][i])
+            state["index"] = i + 1
         container.after(delay, animate)
 
-    if container._bg_frames_raw:
-        render(0)
-        container.after(start_delay, animate)
+    container.bind("<Configure>", on_configure, add="+")
+    on_size_change()
+    container.after(start_delay, animate)
 
 
 def show_error_toast(master, title, message, duration=2000):
@@ -160,15 +396,8 @@ class LoginWindow(ttk.Frame):
         self.pack(fill="both", expand=True)
 
         # --- Animated background ---
-        self.bg_label = tk.Label(self, bd=0, highlightthickness=0)
-        self.bg_label.place(relx=0, rely=0, relwidth=1, relheight=1)
-        self.bg_label.configure(bg=THEME_BG)
-        self.bg_frames = []
-        self.bg_frame_index = 0
-        self._load_campfire_frames()
-        if self.bg_frames:
-            # delay start so login shows theme bg momentarily
-            self.after(100, self._animate_background)
+        # delay start so login shows theme bg momentarily
+        _attach_gif_background(self, gif_name="campfire.gif", delay=80, start_delay=100)
 
         # center the login form in a padded, fixed-width container
         card = ttk.Frame(self, padding=24, width=420, style="Card.TFrame")
@@ -233,38 +462,6 @@ class LoginWindow(ttk.Frame):
             style="Primary.TButton",
         ).grid(row=row, column=0, pady=(16, 0), sticky="ew")
 
-    def _load_campfire_frames(self):
-        """Load frames from campfire.gif into self.bg_frames."""
-        gif_path = os.path.join(os.path.dirname(__file__), "campfire.gif")
-        if not os.path.exists(gif_path):
-            return
-        try:
-            im = Image.open(gif_path)
-        except Exception:
-            return
-
-        frames = []
-        try:
-            while True:
-                frame = im.copy()
-                w = max(self.master.winfo_screenwidth(), 800)
-                h = max(self.master.winfo_screenheight(), 700)
-                frame = frame.resize((w, h), Image.LANCZOS)
-                frames.append(ImageTk.PhotoImage(frame))
-                im.seek(im.tell() + 1)
-        except EOFError:
-            pass
-        self.bg_frames = frames
-
-    def _animate_background(self):
-        """Loop through GIF frames on the background label."""
-        if not self.bg_frames:
-            return
-        frame = self.bg_frames[self.bg_frame_index]
-        self.bg_label.configure(image=frame)
-        self.bg_frame_index = (self.bg_frame_index + 1) % len(self.bg_frames)
-        self.after(80, self._animate_background)
-
     def attempt_login(self):
         state_info = capture_window_state(self.master)
 
@@ -275,20 +472,10 @@ class LoginWindow(ttk.Frame):
             show_error_toast(self.master, "Login failed", "This account has been disabled.")
             return
         role = None
-        for u in users["admin"]:
-            if u["username"] == uname and u["password"] == pwd:
-                role = "admin"
+        for candidate in ("admin", "scout leader", "logistics coordinator"):
+            role = verify_login(uname, pwd, candidate)
+            if role:
                 break
-        if role is None:
-            for u in users["scout leader"]:
-                if u["username"] == uname and u["password"] == pwd:
-                    role = "scout leader"
-                    break
-        if role is None:
-            for u in users["logistics coordinator"]:
-                if u["username"] == uname and u["password"] == pwd:
-                    role = "logistics coordinator"
-                    break
         if role:
             root = self.master
             for child in list(root.winfo_children()):
@@ -361,7 +548,7 @@ class AdminWindow(ttk.Frame):
         ttk.Separator(frame).pack(fill="x", pady=(0, 10))
 
         # load disabled usernames
-        columns = ("Role", "Username", "Password", "Status")
+        columns = ("Role", "Username", "Status")
         tree = ttk.Treeview(frame, columns=columns, show="headings", height=12)
         for col in columns:
             anchor = "center" if col != "Username" else "w"
@@ -394,36 +581,20 @@ class AdminWindow(ttk.Frame):
         tree.bind("<Configure>", refresh_scrollbar)
         tree.after_idle(refresh_scrollbar)
 
-        def load_disabled_set():
-            s = set()
-            try:
-                with open('disabled_logins.txt', 'r') as file:
-                    disabled_login = file.read().strip(',')
-                    if disabled_login:
-                        s = {x for x in disabled_login.split(',') if x}
-            except FileNotFoundError:
-                pass
-            return s
-
-        def save_disabled_set(s):
-            with open('disabled_logins.txt', 'w') as f:
-                f.write(",".join(sorted(s)))
-
-        def add_row(role, user, ds):
-            status = "Disabled" if user['username'] in ds else "Active"
-            tree.insert("", "end", values=(role, user['username'], user['password'], status))
+        def add_row(role, user):
+            status = "Disabled" if disabled_accounts.is_disabled(user['username']) else "Active"
+            tree.insert("", "end", values=(role, user['username'], status))
 
         def refresh_tree():
             for child in tree.get_children():
                 tree.delete(child)
-            ds = load_disabled_set()
             for admin in users['admin']:
-                add_row("Admin", admin, ds)
+                add_row("Admin", admin)
             for role in ['scout leader', 'logistics coordinator']:
                 for user in users[role]:
-                    add_row(role.title(), user, ds)
+                    add_row(role.title(), user)
             if len(tree.get_children()) == 0:
-                tree.insert("", "end", values=("—", "No users found.", "", ""))
+                tree.insert("", "end", values=("—", "No users found.", ""))
             refresh_scrollbar()
             tree.after_idle(refresh_scrollbar)
 
@@ -436,7 +607,7 @@ class AdminWindow(ttk.Frame):
             if not vals or vals[0] == "—":
                 show_error_toast(self.master, "Error", "Please select a valid user.")
                 return None
-            return {"role": vals[0], "username": vals[1], "password": vals[2], "item": sel[0]}
+            return {"role": vals[0], "username": vals[1], "item": sel[0]}
 
         def ensure_unique_username(name):
             existing = {u['username'] for u in users['admin']}
@@ -464,7 +635,7 @@ class AdminWindow(ttk.Frame):
                 role_key = sel['role'].lower()
                 for u in users[role_key]:
                     if u['username'] == sel['username']:
-                        u['password'] = new_pwd
+                        set_password(u, new_pwd)
                         break
                 save_logins()
                 refresh_tree()
@@ -485,27 +656,19 @@ class AdminWindow(ttk.Frame):
             role_key = sel['role'].lower()
             users[role_key] = [u for u in users[role_key] if u['username'] != sel['username']]
             # also remove from disabled list if present
-            ds = load_disabled_set()
-            if sel['username'] in ds:
-                ds.remove(sel['username'])
-                save_disabled_set(ds)
+            disabled_accounts.enable(sel['username'])
             save_logins()
             refresh_tree()
 
         def toggle_disable(enable=False):
-            sel = get_selected()
-            if not sel:
+            # every selected row at once, in a single write
+            if not get_selected():
                 return
-            ds = load_disabled_set()
+            names = [tree.item(item, "values")[1] for item in tree.selection()]
             if enable:
-                if sel['username'] in ds:
-                    ds.remove(sel['username'])
-                    save_disabled_set(ds)
-                enable_login(sel['username'])
+                disabled_accounts.enable(*names)
             else:
-                disabled_logins(sel['username'])
-                ds.add(sel['username'])
-                save_disabled_set(ds)
+                disabled_accounts.disable(*names)
             refresh_tree()
 
         def change_username():
@@ -537,11 +700,7 @@ class AdminWindow(ttk.Frame):
                     if u['username'] == sel['username']:
                         u['username'] = new_name
                         break
-                ds = load_disabled_set()
-                if sel['username'] in ds:
-                    ds.remove(sel['username'])
-                    ds.add(new_name)
-                    save_disabled_set(ds)
+                disabled_accounts.rename(sel['username'], new_name)
                 save_logins()
                 refresh_tree()
                 dlg.destroy()
@@ -643,7 +802,8 @@ class AdminWindow(ttk.Frame):
                 return
             pwd = pwd_entry.get()
             target_list = users['admin'] if role == "admin" else users[role]
-            target_list.append({'username': username, 'password': pwd})
+            target_list.append({'username': username, 'password': ''})
+            set_password(target_list[-1], pwd)
             save_logins()
             messagebox.showinfo("Success", f"Added {role}: {username}")
             top.destroy()
@@ -697,7 +857,7 @@ class AdminWindow(ttk.Frame):
             new_pwd = pwd_entry.get()
             for u in users[role]:
                 if u['username'] == target_user:
-                    u['password'] = new_pwd
+                    set_password(u, new_pwd)
                     break
             save_logins()
             messagebox.showinfo("Success", "Password updated.")
@@ -780,14 +940,7 @@ class AdminWindow(ttk.Frame):
         ttk.Button(frame, text="Disable", command=submit, style="Danger.TButton").pack(fill="x", pady=(4, 0))
 
     def enable_user_ui(self):
-        disabled_usernames = []
-        try:
-            with open('disabled_logins.txt', 'r') as file:
-                disabled_login = file.read().strip(',')
-                if disabled_login != "":
-                    disabled_usernames.extend([x for x in disabled_login.split(',') if x])
-        except FileNotFoundError:
-            pass
+        disabled_usernames = disabled_accounts.names()
         if not disabled_usernames:
             messagebox.showinfo("Info", "No disabled users.")
             return
@@ -895,6 +1048,7 @@ class LogisticsWindow(ttk.Frame):
         ttk.Button(frame, text="Set Daily Food Stock", command=self.set_food_stock_ui, style="Primary.TButton").pack(fill="x", pady=4)
         ttk.Button(frame, text="Top-Up Food Stock", command=self.top_up_food_ui).pack(fill="x", pady=4)
         ttk.Button(frame, text="Check Food Shortage", command=self.shortage_ui).pack(fill="x", pady=4)
+        ttk.Button(frame, text="Check All Active Camps", command=self.shortage_sweep_ui).pack(fill="x", pady=4)
 
     def set_food_stock_ui(self):
         camps = read_from_file()
@@ -1080,21 +1234,45 @@ class LogisticsWindow(ttk.Frame):
             message = "No food requirement set. Ask scout leader to set daily food per camper."
         else:
             message = status
+        projection = food_burn_down(camp)
+        if projection is not None:
+            message += "\n\n" + describe_projection(projection)
         messagebox.showinfo("Shortage Check", message)
 
-    def dashboard_ui(self):
-        df, summary = build_dashboard_data()
-        if df is None:
-            messagebox.showinfo("Dashboard", "No camps found.")
+    def shortage_sweep_ui(self):
+        forecast = food_shortage_sweep()
+        if forecast.empty:
+            messagebox.showinfo("Shortage Check", "No active camps found.")
             return
         top = tk.Toplevel(self)
-        top.title("Dashboard Summary")
-        text = tk.Text(top, width=80, height=20)
+        top.title("Food Shortage Forecast")
+        text = tk.Text(top, width=110, height=20)
         text.pack(fill="both", expand=True)
-        text.insert("end", df.to_string(index=False))
-        text.insert("end", "\n\nSummary:\n")
-        for k, v in summary.items():
-            text.insert("end", f"{k}: {v}\n")
+        text.insert("end", forecast.to_string(index=False))
+        short = int((forecast["Status"] == "shortage").sum())
+        text.insert("end", f"\n\n{short} camp(s) short of food." if short else "\n\nNo shortages forecast.")
+        text.config(state="disabled")
+
+    def dashboard_ui(self):
+        def build():
+            df, summary, _ = dashboard_cache.snapshot()
+            if df is None:
+                return None
+            lines = [df.to_string(index=False), "\nSummary:"]
+            lines.extend(f"{k}: {v}" for k, v in summary.items())
+            return "\n".join(lines) + "\n"
+
+        def show(report):
+            if report is None:
+                messagebox.showinfo("Dashboard", "No camps found.")
+                return
+            top = tk.Toplevel(self)
+            top.title("Dashboard Summary")
+            text = tk.Text(top, width=80, height=20)
+            text.pack(fill="both", expand=True)
+            text.insert("end", report)
+
+        background_tasks.run(self, build, on_done=show)
 
     def notifications_ui(self):
         notif_win = tk.Toplevel(self)
@@ -1118,14 +1296,31 @@ class LogisticsWindow(ttk.Frame):
         listbox.pack(side="left", fill="both", expand=True, padx=(4, 0), pady=4)
         scrollbar.pack(side="right", fill="y", padx=(0, 4), pady=4)
         notes = load_notifications()
-        if not notes:
-            listbox.insert("end", "No notifications.")
-        else:
-            for n in notes:
+        shown = {"count": 0}
+
+        def add_rows(new_notes):
+            if shown["count"] == 0:
+                listbox.delete(0, "end")  # drop the "No notifications." line
+            for n in new_notes:
                 status = "✓" if n.get("read") else "•"
                 timestamp = n.get("timestamp", "")
                 message = n.get("message", "")
                 listbox.insert("end", f"{status} {timestamp} — {message}")
+            shown["count"] += len(new_notes)
+
+        if not notes:
+            listbox.insert("end", "No notifications.")
+        else:
+            add_rows(notes)
+
+        def on_file_change():
+            # notifications added by another CampTrack session
+            current = load_notifications()
+            if len(current) > shown["count"]:
+                add_rows(current[shown["count"]:])
+
+        change_feed.subscribe_while_open(notif_win, "notification", lambda note: add_rows([note]))
+        change_feed.watch(notif_win, lambda: change_feed.file_signature(NOTIFICATIONS_FILE), on_file_change)
 
         mark_all_as_read()
         
@@ -1137,10 +1332,43 @@ class LogisticsWindow(ttk.Frame):
         frame.pack(fill="both", expand=True, padx=12, pady=12)
         ttk.Label(frame, text="Visualise Camp Data", style="Header.TLabel").pack(pady=(0, 8))
         ttk.Separator(frame).pack(fill="x", pady=(0, 10))
-        ttk.Button(frame, text="Food Stock per Camp", command=plot_food_stock, style="Primary.TButton").pack(fill="x", pady=4)
-        ttk.Button(frame, text="Camper Distribution", command=plot_camper_distribution).pack(fill="x", pady=4)
-        ttk.Button(frame, text="Leaders per Camp", command=plot_leaders_per_camp).pack(fill="x", pady=4)
-        ttk.Button(frame, text="Engagement Overview", command=plot_engagement_scores).pack(fill="x", pady=4)
+        ttk.Button(frame, text="Food Stock per Camp", command=lambda: self.show_chart("food_stock"), style="Primary.TButton").pack(fill="x", pady=4)
+        ttk.Button(frame, text="Camper Distribution", command=lambda: self.show_chart("camper_distribution")).pack(fill="x", pady=4)
+        ttk.Button(frame, text="Leaders per Camp", command=lambda: self.show_chart("leaders")).pack(fill="x", pady=4)
+        ttk.Button(frame, text="Engagement Overview", command=lambda: self.show_chart("engagement")).pack(fill="x", pady=4)
+
+    def show_chart(self, kind):
+        """Open a chart in a Toplevel; it is drawn off the UI thread unless
+        this dashboard version was already rendered."""
+        top = tk.Toplevel(self)
+        top.title(CHARTS[kind])
+        top.configure(bg=THEME_BG)
+        label = tk.Label(top, text="Rendering chart...", bg=THEME_BG, fg=THEME_FG)
+        label.pack(fill="both", expand=True, padx=12, pady=12)
+
+        def render():
+            df, _, version = dashboard_cache.snapshot()
+            if df is None or df.empty:
+                return None
+            png = cached_chart(kind, version)
+            if png is None:
+                png = render_chart_png(kind, df)
+                store_chart(kind, version, png)
+            return png
+
+        def show(png):
+            if png is None:
+                top.destroy()
+                messagebox.showinfo("Visualise", "No data available for visualisation.")
+                return
+            image = ImageTk.PhotoImage(Image.open(BytesIO(png)))
+            label.configure(image=image, text="")
+            label.image = image  # keep a reference or Tk drops the image
+
+        background_tasks.run(
+            top, render, on_done=show,
+            on_error=lambda exc: label.configure(text=f"Could not render chart: {exc}"),
+        )
 
     def financial_settings_ui(self):
         self.set_pay_rate_ui()
@@ -1204,10 +1432,10 @@ class LogisticsWindow(ttk.Frame):
                 show_error_toast(self.master, "Error", "Food stock must be a non-negative integer.")
                 return
 
-            read_from_file()
-            Camp(name, location, camp_type, start_date, end_date, food_stock)
+            with camp_repository.editing():
+                Camp(name, location, camp_type, start_date, end_date, food_stock)
+                save_to_file()
             add_notification(f"Camp {name} created")
-            save_to_file()
             messagebox.showinfo("Success", f"Camp {name} created.")
             top.destroy()
 
@@ -1252,22 +1480,20 @@ class LogisticsWindow(ttk.Frame):
         pay_entry = add_labeled_entry("Daily pay rate", str(camp.pay_rate))
 
         def on_select(*args):
-            selected = camp_var.get()
-            for c in camps:
-                if c.name == selected:
-                    name_entry.delete(0, tk.END); name_entry.insert(0, c.name)
-                    loc_entry.delete(0, tk.END); loc_entry.insert(0, c.location)
-                    type_entry.delete(0, tk.END); type_entry.insert(0, str(c.camp_type))
-                    start_entry.delete(0, tk.END); start_entry.insert(0, c.start_date)
-                    end_entry.delete(0, tk.END); end_entry.insert(0, c.end_date)
-                    food_entry.delete(0, tk.END); food_entry.insert(0, str(c.food_stock))
-                    pay_entry.delete(0, tk.END); pay_entry.insert(0, str(c.pay_rate))
-                    break
+            c = camps.find(camp_var.get())
+            if c is not None:
+                name_entry.delete(0, tk.END); name_entry.insert(0, c.name)
+                loc_entry.delete(0, tk.END); loc_entry.insert(0, c.location)
+                type_entry.delete(0, tk.END); type_entry.insert(0, str(c.camp_type))
+                start_entry.delete(0, tk.END); start_entry.insert(0, c.start_date)
+                end_entry.delete(0, tk.END); end_entry.insert(0, c.end_date)
+                food_entry.delete(0, tk.END); food_entry.insert(0, str(c.food_stock))
+                pay_entry.delete(0, tk.END); pay_entry.insert(0, str(c.pay_rate))
         camp_var.trace_add("write", on_select)
 
         def submit():
             selected = camp_var.get()
-            camp_obj = next((c for c in camps if c.name == selected), None)
+            camp_obj = camps.find(selected)
             if not camp_obj:
                 return
             try:
@@ -1300,15 +1526,19 @@ class LogisticsWindow(ttk.Frame):
                     show_error_toast(self.master, "Error", "Invalid date format.")
                     return
 
-            camp_obj.name = name_entry.get().strip() or camp_obj.name
-            camp_obj.location = loc_entry.get().strip() or camp_obj.location
-            camp_obj.camp_type = ct
-            camp_obj.start_date = new_start or camp_obj.start_date
-            camp_obj.end_date = new_end or camp_obj.end_date
-            camp_obj.food_stock = nf
-            camp_obj.pay_rate = pr
+            with camp_repository.editing() as current:
+                if camp_obj not in current:  # deleted by another session meanwhile
+                    show_error_toast(self.master, "Error", "Camp not found.")
+                    return
+                camp_obj.name = name_entry.get().strip() or camp_obj.name
+                camp_obj.location = loc_entry.get().strip() or camp_obj.location
+                camp_obj.camp_type = ct
+                camp_obj.start_date = new_start or camp_obj.start_date
+                camp_obj.end_date = new_end or camp_obj.end_date
+                camp_obj.food_stock = nf
+                camp_obj.pay_rate = pr
+                save_to_file()
             add_notification(f"Camp {camp_obj.name} edited")
-            save_to_file()
             messagebox.showinfo("Success", "Camp updated.")
             top.destroy()
 
@@ -1334,15 +1564,16 @@ class LogisticsWindow(ttk.Frame):
 
         def delete():
             selected = camp_var.get()
-            camp_obj = next((c for c in camps if c.name == selected), None)
+            camp_obj = camps.find(selected)
             if not camp_obj:
                 return
             if not messagebox.askyesno("Confirm", f"Delete camp '{camp_obj.name}'?"):
                 return
-            camps.remove(camp_obj)
-            Camp.all_camps = camps
+            with camp_repository.editing() as current:
+                if camp_obj in current:  # unless another session deleted it meanwhile
+                    current.remove(camp_obj)
+                save_to_file()
             add_notification(f"Camp {camp_obj.name} deleted")
-            save_to_file()
             messagebox.showinfo("Success", f"Camp '{camp_obj.name}' deleted.")
             top.destroy()
 
@@ -1465,7 +1696,23 @@ class ScoutWindow(ttk.Frame):
         if not camps:
             messagebox.showinfo("Select Camps", "No camps exist.")
             return
-        indices = select_camp_dialog("Select camps to supervise", camps, allow_multiple=True)
+        current = [i for i, camp in enumerate(camps) if self.username in camp.scout_leaders]
+
+        def flag_conflicts(indices):
+            selected = [camps[i] for i in indices]
+            clear = {id(camp) for camp in camps_clear_of(camps, selected)}
+            flagged = {i for i, camp in enumerate(camps) if i not in indices and id(camp) not in clear}
+            if camps_conflict(selected):
+                return flagged, "Selected camps overlap in dates."
+            return flagged, f"{len(camps) - len(indices) - len(flagged)} more camp(s) fit your selection; red ones overlap it."
+
+        indices = select_camp_dialog(
+            "Select camps to supervise",
+            camps,
+            allow_multiple=True,
+            preselect=current,
+            flag=flag_conflicts,
+        )
         if not indices:
             messagebox.showinfo("Select Camps", "No camps selected.")
             return
@@ -1485,7 +1732,7 @@ class ScoutWindow(ttk.Frame):
         if not camps:
             messagebox.showinfo("Stop Supervising", "No camps exist.")
             return
-        supervised = [c for c in camps if self.username in c.scout_leaders]
+        supervised = camps.for_leader(self.username)
         if not supervised:
             messagebox.showinfo("Stop Supervising", "You are not supervising any camps yet.")
             return
@@ -1499,21 +1746,28 @@ class ScoutWindow(ttk.Frame):
         if not indices:
             return
         
-        for i in indices:
-            camp = supervised[i]
-            if self.username in camp.scout_leaders:
-                camp.scout_leaders.remove(self.username)
-        
-        save_to_file()
+        with camp_repository.editing():
+            for i in indices:
+                camp = supervised[i]
+                if self.username in camp.scout_leaders:
+                    camp.scout_leaders.remove(self.username)
+                    camp.mark_dirty("scout_leaders")
+
+            save_to_file()
         messagebox.showinfo("Updated", "You are no longer supervising the selected camp(s).")
 
 
     def bulk_assign_ui(self):
-        camps = read_from_file()
-        if not camps:
+        def load():
+            with camp_repository.editing() as camps:
+                return camps.for_leader(self.username) if camps else None
+
+        background_tasks.run(self, load, on_done=self._bulk_assign_window)
+
+    def _bulk_assign_window(self, supervised):
+        if supervised is None:
             messagebox.showinfo("Bulk Assign", "No camps exist.")
             return
-        supervised = [c for c in camps if self.username in c.scout_leaders]
         if not supervised:
             messagebox.showinfo("Bulk Assign", "You are not supervisiing any camps yet.")
             return
@@ -1561,6 +1815,42 @@ class ScoutWindow(ttk.Frame):
 
         ttk.Button(frame, text="Browse", command=browse).pack(fill="x", pady=(0, 10))
 
+        # imports run in the background; only one at a time per window
+        running = {"task": None}
+        status_var = tk.StringVar()
+
+        def start(fn, *args, on_done, pass_task=False):
+            import_btn.state(["disabled"])
+            import_all_btn.state(["disabled"])
+            cancel_btn.state(["!disabled"])
+            status_var.set("Importing...")
+
+            def done(res):
+                stop()
+                on_done(res)
+
+            def failed(exc):
+                stop()
+                show_error_toast(self.master, "Error", str(exc))
+
+            running["task"] = background_tasks.run(
+                top, fn, *args, on_done=done, on_error=failed, pass_task=pass_task,
+                on_progress=lambda rows, seconds: status_var.set(f"Imported {rows} rows ({seconds:.1f}s)..."),
+            )
+
+        def stop():
+            running["task"] = None
+            import_btn.state(["!disabled"])
+            import_all_btn.state(["!disabled"])
+            cancel_btn.state(["disabled"])
+            status_var.set("")
+
+        def cancel():
+            if running["task"] is not None:
+                running["task"].cancel()
+                stop()
+                status_var.set("Import cancelled; campers saved before that were kept.")
+
         def submit():
             sel = camp_list.curselection()
             if not sel:
@@ -1571,11 +1861,15 @@ class ScoutWindow(ttk.Frame):
                 show_error_toast(self.master, "Error", "Please choose a CSV file.")
                 return
             camp = supervised[int(sel[0])]
-            res = bulk_assign_campers_from_csv(camp.name, filepath)
+            start(
+                lambda task: bulk_assign_campers_from_csv(camp.name, filepath, progress=task.report),
+                on_done=imported, pass_task=True,
+            )
+
+        def imported(res):
             status = res.get("status")
             if status == "ok":
-                added = res.get("added", [])
-                messagebox.showinfo("Success", f"Assigned {len(added)} campers to {camp.name}.")
+                messagebox.showinfo("Success", import_summary(res))
                 top.destroy()
             elif status == "file_not_found":
                 show_error_toast(self.master, "Error", "CSV file not found.")
@@ -1586,14 +1880,45 @@ class ScoutWindow(ttk.Frame):
             else:
                 show_error_toast(self.master, "Error", status or "Unknown error")
 
-        ttk.Button(frame, text="Import", command=submit, style="Primary.TButton").pack(fill="x", pady=(4, 0))
+        import_btn = ttk.Button(frame, text="Import", command=submit, style="Primary.TButton")
+        import_btn.pack(fill="x", pady=(4, 0))
+
+        def submit_all():
+            sel = camp_list.curselection()
+            if not sel:
+                show_error_toast(self.master, "Error", "Please select a camp.")
+                return
+            camp = supervised[int(sel[0])]
+            start(
+                lambda task: import_roster_folder(camp.name, progress=task.report),
+                on_done=imported_all, pass_task=True,
+            )
+
+        def imported_all(res):
+            status = res.get("status")
+            if status == "ok":
+                messagebox.showinfo("Success", import_summary(res))
+                top.destroy()
+            elif status == "no_campers":
+                messagebox.showinfo("Result", "No campers in the campers folder.")
+            elif status == "camp_not_found":
+                show_error_toast(self.master, "Error", "Camp not found.")
+            else:
+                show_error_toast(self.master, "Error", status or "Unknown error")
+
+        import_all_btn = ttk.Button(frame, text="Import all files in campers/", command=submit_all)
+        import_all_btn.pack(fill="x", pady=(6, 0))
+        cancel_btn = ttk.Button(frame, text="Cancel Import", command=cancel)
+        cancel_btn.pack(fill="x", pady=(6, 0))
+        cancel_btn.state(["disabled"])
+        ttk.Label(frame, textvariable=status_var, style="Subtitle.TLabel").pack(anchor="w", pady=(6, 0))
 
     def food_req_ui(self):
         camps = read_from_file()
         if not camps:
             messagebox.showinfo("Food", "No camps exist.")
             return
-        supervised = [c for c in camps if self.username in c.scout_leaders]
+        supervised = camps.for_leader(self.username)
         if not supervised:
             messagebox.showinfo("Bulk Assign", "You are not supervisiing any camps yet.")
             return
@@ -1616,7 +1941,7 @@ class ScoutWindow(ttk.Frame):
         if not camps:
             messagebox.showinfo("Activity", "No camps exist.")
             return
-        supervised = [c for c in camps if self.username in c.scout_leaders]
+        supervised = camps.for_leader(self.username)
         if not supervised:
             messagebox.showinfo("Activity", "You are not supervising any camps yet.")
             return
@@ -1752,12 +2077,17 @@ class ScoutWindow(ttk.Frame):
         ttk.Button(frame, text="Save Entry", command=submit, style="Primary.TButton").pack(fill="x", pady=(4, 0))
 
     def view_activities_ui(self):
-        camps = read_from_file()
-        if not camps:
+        def load():
+            with camp_repository.editing() as camps:
+                return camps.for_leader(self.username) if camps else None
+
+        background_tasks.run(self, load, on_done=self._view_activities)
+
+    def _view_activities(self, supervised):
+        if supervised is None:
             messagebox.showinfo("Activities", "No camps exist.")
             return
         
-        supervised = [c for c in camps if self.username in c.scout_leaders]
         if not supervised:
             messagebox.showinfo("Activities", "You are not supervising any camps yet.")
             return
@@ -1900,21 +2230,29 @@ class ScoutWindow(ttk.Frame):
             entry = info.get("entry")
             food_used = info.get("food_used", None)
 
-            if date in camp.activities:
-                entries = camp.activities[date]
-                try:
-                    entries.remove(entry)
-                except ValueError:
-                    pass
-                if not entries:
-                    del camp.activities[date]
-
-            if food_used:
-                if date in camp.daily_food_usage:
-                    camp.daily_food_usage[date] -= food_used
-                    if camp.daily_food_usage[date] <= 0:
-                        del camp.daily_food_usage[date]
-            save_to_file()
+            usage_changed = False
+            with camp_repository.editing():
+                if date in camp.activities:
+                    entries = camp.activities[date]
+                    try:
+                        entries.remove(entry)
+                    except ValueError:
+                        pass
+                    if not entries:
+                        del camp.activities[date]
+                    camp.mark_dirty("activities")
+
+                if food_used:
+                    if date in camp.daily_food_usage:
+                        camp.daily_food_usage[date] -= food_used
+                        if camp.daily_food_usage[date] <= 0:
+                            del camp.daily_food_usage[date]
+                        camp.mark_dirty("daily_food_usage")
+                        usage_changed = True
+                save_to_file()
+            if usage_changed:
+                change_feed.publish("food_usage", {"camp": camp.name, "camp_id": camp.id, "date": date,
+                                                   "units": -food_used})
 
             tree.delete(item_id)
             del item_details[item_id]
@@ -1936,7 +2274,7 @@ class ScoutWindow(ttk.Frame):
         if not camps:
             messagebox.showinfo("Incident", "No camps exist.")
             return
-        supervised = [c for c in camps if self.username in c.scout_leaders]
+        supervised = camps.for_leader(self.username)
         if not supervised:
             messagebox.showinfo("Incident", "You are not supervising any camps yet.")
             return
@@ -2058,7 +2396,7 @@ class ScoutWindow(ttk.Frame):
             messagebox.showinfo("Incidents", "No camps exist.")
             return
 
-        supervised = [c for c in camps if self.username in c.scout_leaders]
+        supervised = camps.for_leader(self.username)
         if not supervised:
             messagebox.showinfo("Incidents", "You are not supervising any camps yet.")
             return
@@ -2169,11 +2507,13 @@ class ScoutWindow(ttk.Frame):
             if not confirm:
                 return
 
-            try:
-                camp.incidents.remove(info)
-            except ValueError:
-                pass
-            save_to_file()
+            with camp_repository.editing():
+                try:
+                    camp.incidents.remove(info)
+                    camp.mark_dirty("incidents")
+                except ValueError:
+                    pass
+                save_to_file()
 
             tree.delete(item_id)
             del item_details[item_id]
@@ -2193,18 +2533,26 @@ class ScoutWindow(ttk.Frame):
 
 
     def stats_ui(self):
-        camps = read_from_file()
+        def load():
+            with camp_repository.editing() as camps:
+                if not camps:
+                    return None, None
+                lines = []
+                lines.append("Engagement:")
+                for name, score in engagement_scores_data():
+                    lines.append(f"{name}: {score}")
+                lines.append("\nMoney per camp:")
+                for name, earned in money_earned_per_camp_data():
+                    lines.append(f"{name}: ${earned}")
+                lines.append(f"\nTotal money: ${total_money_earned_value()}")
+                return camps, lines
+
+        background_tasks.run(self, load, on_done=lambda result: self._show_stats(*result))
+
+    def _show_stats(self, camps, lines):
         if not camps:
             messagebox.showinfo("Stats", "No camps exist.")
             return
-        lines = []
-        lines.append("Engagement:")
-        for name, score in engagement_scores_data():
-            lines.append(f"{name}: {score}")
-        lines.append("\nMoney per camp:")
-        for name, earned in money_earned_per_camp_data():
-            lines.append(f"{name}: ${earned}")
-        lines.append(f"\nTotal money: ${total_money_earned_value()}")
 
         # optional activity detail
         indices = select_camp_dialog("Select a camp for activity stats (cancel to skip)", camps, allow_multiple=False, allow_cancel=True)
@@ -2249,8 +2597,13 @@ def simple_prompt_int(prompt):
     return val
 
 
-def select_camp_dialog(title, camps, allow_multiple=False, allow_cancel=False):
-    """Return list of selected indices from camps via a listbox dialog."""
+def select_camp_dialog(title, camps, allow_multiple=False, allow_cancel=False, preselect=(), flag=None):
+    """Return list of selected indices from camps via a listbox dialog.
+
+    `preselect` indices start selected. If given, flag(selected_indices)
+    returns (indices to show in red, status text) and is re-run on every
+    selection change.
+    """
     top = tk.Toplevel()
     top.title(title)
     center_window(top, width=520, height=380)
@@ -2279,6 +2632,26 @@ def select_camp_dialog(title, camps, allow_multiple=False, allow_cancel=False):
     for camp in camps:
         leaders = ",".join(camp.scout_leaders) if camp.scout_leaders else "None"
         listbox.insert("end", f"{camp.name} ({camp.location}) {camp.start_date}->{camp.end_date} | Leaders: {leaders}")
+    for i in preselect:
+        listbox.selection_set(i)
+
+    if flag is not None:
+        status_var = tk.StringVar()
+        ttk.Label(wrapper, textvariable=status_var, style="Subtitle.TLabel").pack(anchor="w", padx=6)
+        flagged = set()
+
+        def on_selection_change(event=None):
+            new_flagged, status = flag([int(i) for i in listbox.curselection()])
+            for i in flagged - new_flagged:
+                listbox.itemconfig(i, fg=THEME_FG)
+            for i in new_flagged - flagged:
+                listbox.itemconfig(i, fg="#fca5a5")
+            flagged.clear()
+            flagged.update(new_flagged)
+            status_var.set(status)
+
+        listbox.bind("<<ListboxSelect>>", on_selection_change)
+        on_selection_change()
 
     result = {"indices": None}
 
@@ -1,7 +1,7 @@
 from menus.admin_menu import run as admin_menu
 from menus.logistics_menu import run as logistics_coordinator_menu
 from menus.scout_menu import run as scout_leader_menu
-from user_logins import users, check_disabled_logins
+from user_logins import users, check_disabled_logins, verify_login
 from utils import get_int
 
 
@@ -15,13 +15,11 @@ def login_admin():
             print("This account has been disabled.")
             return
         matched = False
-        for admin in users['admin']:
-            if admin['username'] == ask_username and admin['password'] == ask_password:
-                print('\nLogin successful! Welcome Application Administrator.\n')
-                matched = True
-                login = False
-                admin_menu()
-                break
+        if verify_login(ask_username, ask_password, 'admin'):
+            print('\nLogin successful! Welcome Application Administrator.\n')
+            matched = True
+            login = False
+            admin_menu()
         if not matched:
             print('\nInvalid username or password.\n')
         break
@@ -37,13 +35,11 @@ def login_scoutleader():
             print("This account has been disabled.")
             return
         matched = False
-        for user in users['scout leader']:
-            if user['username'] == ask_username and user['password'] == ask_password:
-                print('\nLogin successful! Welcome Scout Leader.\n')
-                matched = True
-                login = False
-                scout_leader_menu(ask_username)
-                break
+        if verify_login(ask_username, ask_password, 'scout leader'):
+            print('\nLogin successful! Welcome Scout Leader.\n')
+            matched = True
+            login = False
+            scout_leader_menu(ask_username)
         if not matched:
             print('\nInvalid username or password.\n')
         break
@@ -59,13 +55,11 @@ def login_logisticscoordinator():
             print("This account has been disabled.")
             return
         matched = False
-        for user in users['logistics coordinator']:
-            if user['username'] == ask_username and user['password'] == ask_password:
-                print('\nLogin successful! Welcome Logistics Coordinator.\n')
-                matched = True
-                login = False
-                logistics_coordinator_menu(users)
-                break
+        if verify_login(ask_username, ask_password, 'logistics coordinator'):
+            print('\nLogin successful! Welcome Logistics Coordinator.\n')
+            matched = True
+            login = False
+            logistics_coordinator_menu(users)
         if not matched:
             print('\nInvalid username or password.\n')
         break
@@ -4,6 +4,7 @@ from features.logistics import (
     top_up_food,
     set_food_stock,
     check_food_shortage,
+    print_food_shortage_sweep,
     dashboard,
     plot_food_stock,
     plot_camper_distribution,
@@ -11,7 +12,7 @@ from features.logistics import (
     plot_engagement_scores,
     set_pay_rate,
 )
-from features.notifications import load_notifications, read_all_from_file
+from features.notifications import load_notifications, mark_all_as_read
 from camp_class import read_from_file
 from utils import get_int
 
@@ -55,8 +56,9 @@ def run(users):
             print("[1] Set Daily Food Stock")
             print("[2] Top-Up Food Stock")
             print("[3] Check Food Shortage")
-            print("[4] Return")
-            sub = get_int("Choice: ", 1, 4)
+            print("[4] Check All Active Camps")
+            print("[5] Return")
+            sub = get_int("Choice: ", 1, 5)
 
             if sub == 1:
                 camp = input("Camp name: ").strip()
@@ -91,6 +93,9 @@ def run(users):
                     continue
                 check_food_shortage(camp)
 
+            elif sub == 4:
+                print_food_shortage_sweep()
+
             else:
                 continue
 
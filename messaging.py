@@ -1,32 +1,27 @@
 # messaging.py
 
-import json
-import os
 from datetime import datetime
 from utils import data_path
 from camp_class import read_from_file, save_to_file
+from records import ChatMessage
+from storage.message_log import MessageLog
 
+# messages.jsonl is append-only; messages.json is the old single-document
+# format and is copied into the log the first time the log is missing.
 MESSAGES_FILE = data_path("messages.json")
+MESSAGES_LOG = data_path("messages.jsonl")
+
+message_store = MessageLog(MESSAGES_LOG, legacy_path=MESSAGES_FILE)
 
 
 # ---------- helpers to load/save ----------
 
 def load_messages():
-    if not os.path.exists(MESSAGES_FILE):
-        return []
-
-    try:
-        with open(MESSAGES_FILE, "r") as f:
-            data = json.load(f)
-            return data.get("messages", [])
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
+    return message_store.all()
 
 
 def save_messages(messages):
-    data = {"messages": messages}
-    with open(MESSAGES_FILE, "w") as f:
-        json.dump(data, f, indent=4)
+    message_store.rewrite(messages)
 
 
 def get_all_usernames(users_dict):
@@ -61,77 +56,50 @@ def count_unread_messages(username, other):
     Count unread messages sent TO `username`.
     If from_user is provided, count only messages from that user.
     """
-    messages = load_messages()
-    if other == None:
-        unread = [
-            msg for msg in messages
-            if msg.get("to") == username and msg.get("read") is False
-        ]
-        return len(unread)
-    else:
-        unread = [
-            msg for msg in messages
-            if msg.get("to") == username
-            and msg.get("from") == other
-            and msg.get("read") is False
-        ]
-    return len(unread)
-        
-        
+    return message_store.unread_count(username, other)
 
-def mark_conversation_as_read(username, other):
-    """Mark all messages sent to 'username' from 'other' as read."""
-    messages = load_messages()
-    changed = False
 
-    for msg in messages:
-        if msg["from"] == other and msg["to"] == username and msg.get("read") is False:
-            msg["read"] = True
-            changed = True
+def unread_counts_for_user(username):
+    """{partner: unread count} for every conversation of `username`, in one pass."""
+    counts = message_store.unread_counts(username)
+    return {other: counts.get(other, 0) for other in message_store.partners(username)}
 
-    if changed:
-        save_messages(messages)
+
+def mark_conversation_as_read(username, other):
+    """Mark all messages sent to 'username' from 'other' as read."""
+    message_store.mark_read(username, other)
 
 
 # ---------- core chat logic ----------
 
 def send_message(sender, recipient, text):
-    messages = load_messages()
-    messages.append({
-        "from": sender,
-        "to": recipient,
-        "text": text,
-        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "read": False
-    })
-    save_messages(messages)
+    message_store.append(ChatMessage(
+        sender=sender,
+        recipient=recipient,
+        text=text,
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        read=False,
+    ))
 
 
 def get_conversations_for_user(username):
     """Return a sorted list of usernames this user has chatted with."""
-    messages = load_messages()
-    others = set()
-
-    for msg in messages:
-        if msg["from"] == username:
-            others.add(msg["to"])
-        elif msg["to"] == username:
-            others.add(msg["from"])
-
-    return sorted(others)
+    return sorted(message_store.partners(username))
 
 
 def get_conversation(username, other):
     """All messages between username and other, ordered by time."""
-    messages = load_messages()
-    thread = [
-        msg for msg in messages
-        if (msg["from"] == username and msg["to"] == other)
-        or (msg["from"] == other and msg["to"] == username)
-    ]
-    # Already roughly ordered by append, but sort just in case
-    thread.sort(key=lambda m: m["timestamp"])
-    return thread
+    # the store keeps each thread sorted by timestamp
+    return message_store.thread(username, other)
+
+
+def get_conversation_page(username, other, limit=50, before=None, offset=0):
+    """
+    A window of the conversation, ordered by time: the last `limit` messages
+    (before timestamp `before` if given, skipping the `offset` newest).
+    Returns (messages, has_more) where has_more means older messages exist.
+    """
+    return message_store.thread_page(username, other, limit, before=before, offset=offset)
 
 
 # ---------- menu shown to a logged-in user ----------
@@ -166,9 +134,10 @@ def messaging_menu(current_user, users_dict):
                 print("\nNo conversations yet. Start a new chat!")
                 continue
 
+            unread_counts = unread_counts_for_user(current_user)
             print("\nYour conversations:")
             for i, other in enumerate(conversations, start=1):
-                unread = count_unread_messages(current_user,other)
+                unread = unread_counts.get(other, 0)
                 if unread > 0:
                     unread_num = f" ({unread} unread)"
                 else:
@@ -204,11 +173,7 @@ def messaging_menu(current_user, users_dict):
             open_chat(current_user, recipient)
 
         elif choice == "3" and user_role == 'scout leader':  
-            assigned_camps = []
-            camps = read_from_file() 
-            for camp in camps:
-                if current_user in camp.scout_leaders:  
-                    assigned_camps.append(camp)
+            assigned_camps = read_from_file().for_leader(current_user)
             if not assigned_camps:
                 print(f"{current_user} is not assigned to any camps.")
                 continue
@@ -0,0 +1,79 @@
+import hashlib
+import hmac
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Stored form: pbkdf2_sha256$<iterations>$<salt hex>$<hash hex> (no commas,
+# so it fits the comma-separated logins.txt). Raise the cost with
+# CAMPTRACK_HASH_ITERATIONS; older hashes are upgraded on the next login.
+ALGORITHM = "pbkdf2_sha256"
+ITERATIONS = int(os.environ.get("CAMPTRACK_HASH_ITERATIONS", "200000"))
+SALT_BYTES = 16
+
+# Successful logins are remembered as a keyed digest of the password, so
+# logging in again (kiosk sessions) skips the slow hash. The key lives only
+# in this process. Turn off with CAMPTRACK_LOGIN_CACHE=0.
+VERIFY_CACHE = os.environ.get("CAMPTRACK_LOGIN_CACHE", "1") != "0"
+VERIFY_CACHE_SIZE = 1024
+_cache_key = os.urandom(32)
+_verified = {}  # stored hash -> digest of the password that matched it
+
+
+def _derive(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+def hash_password(password, iterations=None):
+    iterations = iterations or ITERATIONS
+    salt = os.urandom(SALT_BYTES)
+    return f"{ALGORITHM}${iterations}${salt.hex()}${_derive(password, salt, iterations).hex()}"
+
+
+def hash_passwords(passwords):
+    """hash_password() for many passwords at once, spread over threads
+    (hashlib releases the GIL while hashing)."""
+    passwords = list(passwords)
+    if len(passwords) < 2:
+        return [hash_password(p) for p in passwords]
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as pool:
+        return list(pool.map(hash_password, passwords))
+
+
+def _parse(stored):
+    try:
+        algorithm, iterations, salt, digest = stored.split("$")
+        if algorithm != ALGORITHM:
+            return None
+        return int(iterations), bytes.fromhex(salt), bytes.fromhex(digest)
+    except (AttributeError, ValueError):
+        return None
+
+
+def is_hashed(stored):
+    return _parse(stored) is not None
+
+
+def needs_rehash(stored):
+    parsed = _parse(stored)
+    return parsed is None or parsed[0] != ITERATIONS
+
+
+def verify_password(password, stored):
+    """Constant-time check of `password` against a hash_password() result."""
+    parsed = _parse(stored)
+    if parsed is None:
+        return False
+    tag = None
+    if VERIFY_CACHE:
+        tag = hmac.new(_cache_key, password.encode(), hashlib.sha256).digest()
+        cached = _verified.get(stored)
+        if cached is not None and hmac.compare_digest(cached, tag):
+            return True
+    iterations, salt, digest = parsed
+    if not hmac.compare_digest(_derive(password, salt, iterations), digest):
+        return False
+    if tag is not None:
+        if len(_verified) >= VERIFY_CACHE_SIZE:
+            del _verified[next(iter(_verified))]
+        _verified[stored] = tag
+    return True
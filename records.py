@@ -0,0 +1,159 @@
+from dataclasses import dataclass, field, fields
+
+# Typed records for the small objects CampTrack keeps by the thousand:
+# activity entries, incidents, chat messages (direct and group) and
+# notifications. They are slotted dataclasses, so each one is a fixed
+# set of slots instead of a dict repeating its key strings, and hot code
+# can use attributes (msg.sender, entry.food_used). They also keep the
+# dict-style access the rest of the code was written against
+# (entry.get("notes", ""), msg["read"] = True).
+#
+# from_dict()/to_dict() convert to and from the JSON objects in the data
+# files, which do not change shape: a key absent from the object stays
+# ABSENT (get() falls back to its default and to_dict() leaves it out),
+# and keys a class does not know are kept in `extra` and written back.
+# @record generates both with one line per field (as dataclasses does for
+# __init__), since every camp, message log and notification load goes
+# through them. storage.serialization writes records as their to_dict().
+
+
+class _Absent:
+    __slots__ = ()
+
+    def __repr__(self):
+        return "ABSENT"
+
+    def __bool__(self):
+        return False
+
+
+ABSENT = _Absent()
+
+
+class Record:
+    """Base of the record classes; from_dict() and to_dict() come from @record."""
+    __slots__ = ()
+    _keys = {}  # JSON key -> attribute, in file order; set by @record
+
+    # ---- dict-style access, by JSON key ----
+
+    def get(self, key, default=None):
+        attr = self._keys.get(key)
+        if attr is None:
+            return self.extra.get(key, default) if self.extra else default
+        value = getattr(self, attr)
+        return default if value is ABSENT else value
+
+    def __getitem__(self, key):
+        value = self.get(key, ABSENT)
+        if value is ABSENT:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        attr = self._keys.get(key)
+        if attr is not None:
+            setattr(self, attr, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        return self.get(key, ABSENT) is not ABSENT
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def __iter__(self):
+        return iter(self.to_dict())
+
+    def __len__(self):
+        return len(self.to_dict())
+
+    def __repr__(self):
+        # printed like the JSON object it stands for, as the dicts were
+        return repr(self.to_dict())
+
+
+def record(cls):
+    """Make `cls` a slotted dataclass with from_dict()/to_dict() for its JSON keys.
+
+    A field's JSON key is its name unless given as metadata={"key": ...};
+    the last field must be `extra`.
+    """
+    cls = dataclass(slots=True, repr=False)(cls)
+    cls._keys = {f.metadata.get("key", f.name): f.name for f in fields(cls) if f.name != "extra"}
+    source = (
+        "def from_dict(cls, data):\n"
+        "    if not isinstance(data, dict):\n"
+        "        return data\n"
+        "    get = data.get\n"
+        f"    record = cls({', '.join(f'get({key!r}, ABSENT)' for key in cls._keys)})\n"
+        "    if not known.issuperset(data):\n"
+        "        record.extra = {k: v for k, v in data.items() if k not in known}\n"
+        "    return record\n"
+        "def to_dict(self):\n"
+        "    data = {}\n"
+        + "".join(f"    value = self.{attr}\n"
+                  f"    if value is not ABSENT:\n"
+                  f"        data[{key!r}] = value\n" for key, attr in cls._keys.items())
+        + "    if self.extra:\n"
+        "        data.update(self.extra)\n"
+        "    return data\n"
+    )
+    namespace = {"ABSENT": ABSENT, "known": frozenset(cls._keys)}
+    exec(source, namespace)
+    from_dict = namespace["from_dict"]
+    from_dict.__doc__ = "Record for one JSON object; anything that is not a dict is returned as is."
+    cls.from_dict = classmethod(from_dict)
+    cls.to_dict = namespace["to_dict"]
+    return cls
+
+
+def _key(name):
+    return field(default=ABSENT, metadata={"key": name})
+
+
+@record
+class ActivityEntry(Record):
+    """One entry of Camp.activities[date]."""
+    activity: str = ABSENT
+    time: str = ABSENT
+    notes: str = ABSENT
+    food_used: int = ABSENT
+    campers: list = ABSENT
+    extra: dict = None
+
+
+@record
+class Incident(Record):
+    """One entry of Camp.incidents."""
+    date: str = ABSENT
+    time: str = ABSENT
+    description: str = ABSENT
+    campers: list = ABSENT
+    extra: dict = None
+
+
+@record
+class ChatMessage(Record):
+    """A direct message, or a group chat message (no recipient or read flag)."""
+    sender: str = _key("from")
+    recipient: str = _key("to")
+    text: str = ABSENT
+    timestamp: str = ABSENT
+    read: bool = ABSENT
+    extra: dict = None
+
+
+@record
+class Notification(Record):
+    """One entry of notifications.json."""
+    message: str = ABSENT
+    read: bool = ABSENT
+    timestamp: str = ABSENT
+    extra: dict = None
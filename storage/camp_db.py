@@ -0,0 +1,438 @@
+import os
+import sqlite3
+from contextlib import closing
+from records import Record
+from utils import data_path
+from storage import camp_log, serialization
+from storage.locking import file_lock
+
+# Optional SQLite store for camps (CAMPTRACK_STORAGE=sqlite). It exposes the
+# same functions as storage.camp_log so CampRepository can use either one.
+DB_FILE = data_path("camp_data.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS camps (
+    id INTEGER PRIMARY KEY,
+    uid TEXT NOT NULL,
+    name TEXT NOT NULL,
+    location TEXT,
+    camp_type,
+    start_date TEXT,
+    end_date TEXT,
+    food_stock INTEGER,
+    pay_rate INTEGER
+);
+CREATE INDEX IF NOT EXISTS camps_uid ON camps(uid);
+CREATE INDEX IF NOT EXISTS camps_name ON camps(name);
+
+CREATE TABLE IF NOT EXISTS camp_leaders (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    username TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS camp_leaders_camp ON camp_leaders(camp_id);
+CREATE INDEX IF NOT EXISTS camp_leaders_username ON camp_leaders(username);
+
+CREATE TABLE IF NOT EXISTS campers (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    camper_id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS campers_camp ON campers(camp_id);
+CREATE INDEX IF NOT EXISTS campers_camper_id ON campers(camper_id);
+
+CREATE TABLE IF NOT EXISTS camper_info (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    camper_id TEXT NOT NULL,
+    info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS camper_info_camp_camper ON camper_info(camp_id, camper_id);
+CREATE INDEX IF NOT EXISTS camper_info_camper_id ON camper_info(camper_id);
+
+CREATE TABLE IF NOT EXISTS activities (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    date TEXT NOT NULL,
+    food_used INTEGER,
+    entry TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS activities_camp_date ON activities(camp_id, date);
+
+CREATE TABLE IF NOT EXISTS daily_food_usage (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    date TEXT NOT NULL,
+    units INTEGER
+);
+CREATE INDEX IF NOT EXISTS daily_food_usage_camp_date ON daily_food_usage(camp_id, date);
+
+CREATE TABLE IF NOT EXISTS daily_records (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    date TEXT NOT NULL,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS daily_records_camp_date ON daily_records(camp_id, date);
+
+CREATE TABLE IF NOT EXISTS group_chat (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    timestamp TEXT,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS group_chat_camp ON group_chat(camp_id);
+
+CREATE TABLE IF NOT EXISTS incidents (
+    id INTEGER PRIMARY KEY,
+    camp_id INTEGER NOT NULL REFERENCES camps(id) ON DELETE CASCADE,
+    date TEXT,
+    incident TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS incidents_camp_date ON incidents(camp_id, date);
+"""
+
+# stored in PRAGMA user_version once SCHEMA has been created
+SCHEMA_VERSION = 1
+
+SCALAR_FIELDS = ("id", "name", "location", "camp_type", "start_date", "end_date", "food_stock", "pay_rate")
+
+# camp record field -> camps column, where they differ ("id" is the row id there)
+COLUMNS = {"id": "uid"}
+
+
+def _connect():
+    conn = sqlite3.connect(DB_FILE)
+    conn.execute("PRAGMA foreign_keys = ON")
+    # one header read per connection instead of running the whole script
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        conn.executescript(SCHEMA + f"PRAGMA user_version = {SCHEMA_VERSION};")
+    return conn
+
+
+# ---------- writing rows ----------
+
+def _insert_leader(conn, camp_id, username):
+    conn.execute("INSERT INTO camp_leaders (camp_id, username) VALUES (?, ?)", (camp_id, username))
+
+
+def _insert_camper(conn, camp_id, camper_id):
+    conn.execute("INSERT INTO campers (camp_id, camper_id) VALUES (?, ?)", (camp_id, camper_id))
+
+
+def _insert_camper_info(conn, camp_id, camper_id, info):
+    conn.execute(
+        "INSERT INTO camper_info (camp_id, camper_id, info) VALUES (?, ?, ?)",
+        (camp_id, camper_id, serialization.dumps_line(info)),
+    )
+
+
+def _insert_activity(conn, camp_id, date, entry):
+    food_used = entry.get("food_used") if isinstance(entry, (dict, Record)) else None
+    conn.execute(
+        "INSERT INTO activities (camp_id, date, food_used, entry) VALUES (?, ?, ?, ?)",
+        (camp_id, date, food_used, serialization.dumps_line(entry)),
+    )
+
+
+def _insert_food_usage(conn, camp_id, date, units):
+    conn.execute("INSERT INTO daily_food_usage (camp_id, date, units) VALUES (?, ?, ?)", (camp_id, date, units))
+
+
+def _insert_record(conn, camp_id, date, note):
+    conn.execute("INSERT INTO daily_records (camp_id, date, note) VALUES (?, ?, ?)", (camp_id, date, serialization.dumps_line(note)))
+
+
+def _insert_message(conn, camp_id, message):
+    conn.execute(
+        "INSERT INTO group_chat (camp_id, timestamp, message) VALUES (?, ?, ?)",
+        (camp_id, message.get("timestamp"), serialization.dumps_line(message)),
+    )
+
+
+def _insert_incident(conn, camp_id, incident):
+    conn.execute(
+        "INSERT INTO incidents (camp_id, date, incident) VALUES (?, ?, ?)",
+        (camp_id, incident.get("date"), serialization.dumps_line(incident)),
+    )
+
+
+def _write_field(conn, camp_id, field, value):
+    """Replace every row that stores `field` for one camp."""
+    if field in SCALAR_FIELDS:
+        conn.execute(f"UPDATE camps SET {COLUMNS.get(field, field)} = ? WHERE id = ?", (value, camp_id))
+    elif field == "scout_leaders":
+        conn.execute("DELETE FROM camp_leaders WHERE camp_id = ?", (camp_id,))
+        for username in value:
+            _insert_leader(conn, camp_id, username)
+    elif field == "campers":
+        conn.execute("DELETE FROM campers WHERE camp_id = ?", (camp_id,))
+        for camper_id in value:
+            _insert_camper(conn, camp_id, camper_id)
+    elif field == "campers_info":
+        conn.execute("DELETE FROM camper_info WHERE camp_id = ?", (camp_id,))
+        for camper_id, info in (value or {}).items():
+            _insert_camper_info(conn, camp_id, camper_id, info)
+    elif field == "activities":
+        conn.execute("DELETE FROM activities WHERE camp_id = ?", (camp_id,))
+        for date, entries in value.items():
+            for entry in entries:
+                _insert_activity(conn, camp_id, date, entry)
+    elif field == "daily_food_usage":
+        conn.execute("DELETE FROM daily_food_usage WHERE camp_id = ?", (camp_id,))
+        for date, units in value.items():
+            _insert_food_usage(conn, camp_id, date, units)
+    elif field == "daily_records":
+        conn.execute("DELETE FROM daily_records WHERE camp_id = ?", (camp_id,))
+        for date, notes in value.items():
+            for note in notes:
+                _insert_record(conn, camp_id, date, note)
+    elif field == "incidents":
+        conn.execute("DELETE FROM incidents WHERE camp_id = ?", (camp_id,))
+        for incident in value:
+            _insert_incident(conn, camp_id, incident)
+
+
+def _append_item(conn, camp_id, field, value, key=None):
+    if field == "campers":
+        _insert_camper(conn, camp_id, value)
+    elif field == "activities":
+        _insert_activity(conn, camp_id, key, value)
+    elif field == "daily_records":
+        _insert_record(conn, camp_id, key, value)
+    elif field == "incidents":
+        _insert_incident(conn, camp_id, value)
+
+
+def _put_item(conn, camp_id, field, key, value):
+    if field == "campers_info":
+        conn.execute("DELETE FROM camper_info WHERE camp_id = ? AND camper_id = ?", (camp_id, key))
+        _insert_camper_info(conn, camp_id, key, value)
+    elif field == "daily_food_usage":
+        conn.execute("DELETE FROM daily_food_usage WHERE camp_id = ? AND date = ?", (camp_id, key))
+        _insert_food_usage(conn, camp_id, key, value)
+
+
+def _create_camp(conn, record):
+    cur = conn.execute(
+        "INSERT INTO camps (uid, name, location, camp_type, start_date, end_date, food_stock, pay_rate) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        tuple(record.get(field, 0 if field == "pay_rate" else None) for field in SCALAR_FIELDS),
+    )
+    camp_id = cur.lastrowid
+    for field, value in record.items():
+        if field not in SCALAR_FIELDS and value is not None:
+            _write_field(conn, camp_id, field, value)
+    return camp_id
+
+
+def _camp_row(conn, uid):
+    row = conn.execute("SELECT id FROM camps WHERE uid = ?", (uid,)).fetchone()
+    return row[0] if row else None
+
+
+# ---------- store interface (same as storage.camp_log) ----------
+
+def exists():
+    return os.path.exists(DB_FILE)
+
+
+def lock():
+    # SQLite serialises the writes themselves; this keeps a whole save (and
+    # the repository's version check around it) apart from other sessions'
+    return file_lock(DB_FILE)
+
+
+def file_signature():
+    # mtime and size alone can miss a write: SQLite reuses freed pages, and
+    # two commits can land within one mtime tick. The header's file change
+    # counter (bytes 24-27) goes up on every commit in rollback-journal mode.
+    try:
+        with open(DB_FILE, "rb") as file:
+            st = os.fstat(file.fileno())
+            file.seek(24)
+            counter = file.read(4)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size, counter
+
+
+def needs_compaction():
+    return False
+
+
+def append_changes(changes):
+    """Apply change-log records (see storage.camp_log) in one transaction."""
+    if not changes:
+        return
+    with closing(_connect()) as conn, conn:
+        ids = {}  # camp id -> row id, for the runs of changes to one camp
+        for change in changes:
+            op = change.get("op")
+            if op == "create":
+                _create_camp(conn, change["record"])
+                continue
+            uid = change["id"]
+            if uid not in ids:
+                ids[uid] = _camp_row(conn, uid)
+            camp_id = ids[uid]
+            if camp_id is None:
+                continue
+            if op == "update":
+                for field, value in change["fields"].items():
+                    _write_field(conn, camp_id, field, value)
+            elif op == "append":
+                _append_item(conn, camp_id, change["field"], change["value"], change.get("key"))
+            elif op == "put":
+                _put_item(conn, camp_id, change["field"], change["key"], change["value"])
+            elif op == "delete":
+                conn.execute("DELETE FROM camps WHERE id = ?", (camp_id,))
+                ids.pop(uid, None)
+
+
+def write_snapshot(records):
+    """Replace every camp in the database, keeping each camp's group chat."""
+    with closing(_connect()) as conn, conn:
+        chats = {}
+        for uid, message in conn.execute(
+            "SELECT c.uid, g.message FROM group_chat g JOIN camps c ON c.id = g.camp_id ORDER BY g.id"
+        ):
+            chats.setdefault(uid, []).append(serialization.loads(message))
+        conn.execute("DELETE FROM camps")
+        for record in records:
+            camp_id = _create_camp(conn, record)
+            for message in chats.pop(record["id"], []):
+                _insert_message(conn, camp_id, message)
+
+
+def load_records():
+    """Rebuild the camp dicts (same shape as camp_data.json), in creation order.
+
+    Group chat is not included; see load_group_chat().
+    """
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT id, uid, name, location, camp_type, start_date, end_date, food_stock, pay_rate FROM camps ORDER BY id"
+        ).fetchall()
+
+        records = {}
+        for row in rows:
+            camp_id, uid, name, location, camp_type, start_date, end_date, food_stock, pay_rate = row
+            records[camp_id] = {
+                "id": uid,
+                "name": name,
+                "location": location,
+                "camp_type": camp_type,
+                "start_date": start_date,
+                "end_date": end_date,
+                "food_stock": food_stock,
+                "scout_leaders": [],
+                "campers": [],
+                "campers_info": {},
+                "activities": {},
+                "daily_food_usage": {},
+                "daily_records": {},
+                "pay_rate": pay_rate,
+                "incidents": [],
+            }
+
+        for camp_id, username in conn.execute("SELECT camp_id, username FROM camp_leaders ORDER BY id"):
+            records[camp_id]["scout_leaders"].append(username)
+        for camp_id, camper_id in conn.execute("SELECT camp_id, camper_id FROM campers ORDER BY id"):
+            records[camp_id]["campers"].append(camper_id)
+        for camp_id, camper_id, info in conn.execute("SELECT camp_id, camper_id, info FROM camper_info ORDER BY id"):
+            records[camp_id]["campers_info"][camper_id] = serialization.loads(info)
+        for camp_id, date, entry in conn.execute("SELECT camp_id, date, entry FROM activities ORDER BY id"):
+            records[camp_id]["activities"].setdefault(date, []).append(serialization.loads(entry))
+        for camp_id, date, units in conn.execute("SELECT camp_id, date, units FROM daily_food_usage ORDER BY id"):
+            records[camp_id]["daily_food_usage"][date] = units
+        for camp_id, date, note in conn.execute("SELECT camp_id, date, note FROM daily_records ORDER BY id"):
+            records[camp_id]["daily_records"].setdefault(date, []).append(serialization.loads(note))
+        for camp_id, incident in conn.execute("SELECT camp_id, incident FROM incidents ORDER BY id"):
+            records[camp_id]["incidents"].append(serialization.loads(incident))
+    return list(records.values())
+
+
+def load_group_chat(uid, start=0):
+    """A camp's group chat messages, skipping the first `start` of them."""
+    with closing(_connect()) as conn:
+        rows = conn.execute(
+            "SELECT message FROM group_chat WHERE camp_id = "
+            "(SELECT id FROM camps WHERE uid = ?) ORDER BY id LIMIT -1 OFFSET ?",
+            (uid, start),
+        ).fetchall()
+    return [serialization.loads(message) for (message,) in rows]
+
+
+def append_group_chat(uid, message):
+    with closing(_connect()) as conn, conn:
+        camp_id = _camp_row(conn, uid)
+        if camp_id is not None:
+            _insert_message(conn, camp_id, message)
+
+
+def group_chat_signature(uid):
+    return file_signature()
+
+
+# ---------- indexed queries ----------
+
+def camp_overview(camp_name=None):
+    """Per-camp counts for dashboards and shortage checks, without loading
+    activity/chat payloads. Same keys as logistics._camp_overview()."""
+    query = """
+        SELECT c.name, c.location, c.camp_type, c.start_date, c.end_date, c.food_stock, c.pay_rate,
+            (SELECT COUNT(*) FROM camp_leaders WHERE camp_id = c.id),
+            (SELECT COUNT(*) FROM campers WHERE camp_id = c.id),
+            (SELECT COUNT(*) FROM activities WHERE camp_id = c.id),
+            (SELECT COUNT(*) FROM daily_records WHERE camp_id = c.id)
+        FROM camps c
+    """
+    params = ()
+    if camp_name is not None:
+        query += " WHERE c.id = (SELECT id FROM camps WHERE name = ? ORDER BY id LIMIT 1)"
+        params = (camp_name,)
+    query += " ORDER BY c.id"
+    with closing(_connect()) as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [
+        {
+            "name": name,
+            "location": location,
+            "camp_type": camp_type,
+            "start_date": start_date,
+            "end_date": end_date,
+            "food_stock": food_stock,
+            "pay_rate": pay_rate or 0,
+            "leaders": leaders,
+            "campers": campers,
+            "activity_entries": activity_entries,
+            "record_entries": record_entries,
+        }
+        for (name, location, camp_type, start_date, end_date, food_stock, pay_rate,
+             leaders, campers, activity_entries, record_entries) in rows
+    ]
+
+
+# ---------- migration ----------
+
+def migrate_from_json():
+    """One-shot copy of camp_data.json (+ change log) and the group chat logs into the database."""
+    # both locks: loading may give the JSON camps their ids, and a session
+    # saving to the database meanwhile would be wiped by write_snapshot()
+    with lock(), camp_log.lock():
+        records = camp_log.load_records()
+        write_snapshot(records)
+        with closing(_connect()) as conn, conn:
+            for record in records:
+                camp_id = _camp_row(conn, record["id"])
+                if conn.execute("SELECT 1 FROM group_chat WHERE camp_id = ? LIMIT 1", (camp_id,)).fetchone():
+                    continue  # already copied by an earlier run
+                for message in camp_log.load_group_chat(record["id"]):
+                    _insert_message(conn, camp_id, message)
+    return len(records)
+
+
+if __name__ == "__main__":
+    count = migrate_from_json()
+    print(f"Migrated {count} camp(s) into {DB_FILE}")
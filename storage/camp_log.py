@@ -0,0 +1,186 @@
+import json
+import os
+import uuid
+from utils import data_path
+from storage import durable, group_chat_log, serialization
+from storage.locking import file_lock
+
+# camp_data.json is the snapshot; camp_changes.jsonl holds one change per line
+# written since the last snapshot. Loading = snapshot + replay of the log.
+SNAPSHOT_FILE = data_path("camp_data.json")
+LOG_FILE = data_path("camp_changes.jsonl")
+
+# once the log grows past this many bytes the next save folds it into the snapshot
+COMPACT_BYTES = 1_000_000
+
+
+def new_camp_id():
+    """A unique, permanent id for a camp record (names may repeat and change)."""
+    return "camp_" + uuid.uuid4().hex[:12]
+
+
+def _stat(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def file_signature():
+    """(mtime, size) of the snapshot and the log; changes whenever either is written."""
+    return _stat(SNAPSHOT_FILE), _stat(LOG_FILE)
+
+
+def lock():
+    """Exclusive lock over the snapshot and log for a load or save (see storage.locking)."""
+    return file_lock(SNAPSHOT_FILE)
+
+
+def exists():
+    return os.path.exists(SNAPSHOT_FILE) or os.path.exists(LOG_FILE)
+
+
+def load_snapshot():
+    """Return the list of camp dicts in camp_data.json ([] if empty/missing).
+
+    Raises json.JSONDecodeError if the snapshot is corrupted.
+    """
+    if not os.path.exists(SNAPSHOT_FILE) or os.path.getsize(SNAPSHOT_FILE) == 0:
+        return []
+    return serialization.read_file(SNAPSHOT_FILE)
+
+
+def load_changes():
+    """Return the list of change records in the log.
+
+    A torn last line (crash mid-append) is ignored.
+    """
+    if not os.path.exists(LOG_FILE):
+        return []
+    changes = []
+    with open(LOG_FILE, "r") as file:
+        for line in file:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                changes.append(serialization.loads(line))
+            except json.JSONDecodeError:
+                break
+    return changes
+
+
+def _index(records):
+    """Position of each camp record by id (by name for records from before camps had ids)."""
+    return {record.get("id", record["name"]): i for i, record in enumerate(records)}
+
+
+def apply_changes(records, changes):
+    """Replay change records on top of a list of camp dicts (in place).
+
+    Changes find their camp by "id"; lines written before camps had ids
+    carry only the name in "camp".
+    """
+    index = _index(records)
+
+    for change in changes:
+        op = change.get("op")
+        key = change.get("id", change.get("camp"))
+
+        if op == "create":
+            records.append(change["record"])
+            index[records[-1].get("id", records[-1]["name"])] = len(records) - 1
+            continue
+
+        i = index.get(key)
+        if i is None:
+            continue
+        record = records[i]
+
+        if op == "update":
+            record.update(change["fields"])
+            if "id" not in record and record["name"] != key:
+                del index[key]
+                index[record["name"]] = i
+        elif op == "append":
+            target = record.setdefault(change["field"], [] if change.get("key") is None else {})
+            if change.get("key") is not None:
+                target = target.setdefault(change["key"], [])
+            target.append(change["value"])
+        elif op == "put":
+            record.setdefault(change["field"], {})[change["key"]] = change["value"]
+        elif op == "delete":
+            del records[i]
+            index = _index(records)
+
+    return records
+
+
+def _split_group_chat(records):
+    """Move chat history still embedded in camp records (files written before
+    group chat got its own logs) out into storage.group_chat_log.
+
+    Returns True if any record was changed.
+    """
+    changed = False
+    for record in records:
+        if "group_chat" in record:
+            messages = record.pop("group_chat") or []
+            if messages and not group_chat_log.exists(record["id"]):
+                group_chat_log.write(record["id"], messages)
+            changed = True
+    return changed
+
+
+def _assign_ids(records):
+    """Give an id to camp records written before camps had one, taking
+    over the chat log kept under the camp's name (the first camp with a
+    name gets it).
+
+    Returns True if any record was changed.
+    """
+    missing = [record for record in records if not record.get("id")]
+    for record in missing:
+        record["id"] = new_camp_id()
+        group_chat_log.adopt(record["name"], record["id"])
+    return bool(missing)
+
+
+def load_records():
+    """Snapshot + replayed log, as a list of camp dicts (without group chat)."""
+    records = apply_changes(load_snapshot(), load_changes())
+    assigned = _assign_ids(records)
+    if _split_group_chat(records) or assigned:
+        write_snapshot(records)  # one-off: later loads no longer need migrating
+    return records
+
+
+def append_changes(changes):
+    """Append change records to the log, one JSON object per line.
+
+    Deleted camps take their group chat log with them.
+    """
+    if not changes:
+        return
+    durable.append_lines(LOG_FILE, [serialization.dumps_line(change) for change in changes])
+    for change in changes:
+        if change.get("op") == "delete":
+            group_chat_log.delete(change["id"])
+
+
+def needs_compaction():
+    return os.path.exists(LOG_FILE) and os.path.getsize(LOG_FILE) > COMPACT_BYTES
+
+
+def write_snapshot(records):
+    """Rewrite camp_data.json in full and clear the change log."""
+    durable.write_json(SNAPSHOT_FILE, records)
+    if os.path.exists(LOG_FILE):
+        os.remove(LOG_FILE)
+
+
+# group chat lives in per-camp logs next to the camp data
+load_group_chat = group_chat_log.load
+append_group_chat = group_chat_log.append
+group_chat_signature = group_chat_log.signature
@@ -0,0 +1,67 @@
+import os
+
+# In-process change feed. The storage code publishes a topic whenever it
+# writes (or first sees) a record, and open windows subscribe so they can
+# append just the new rows instead of reloading everything.
+#
+# Topics and payloads:
+#   "message"          a direct message (records.ChatMessage)
+#   "messages_reset"   None; the message log was rewritten, redraw from scratch
+#   "message_read"     {"to": username, "from": other}
+#   "group_chat"       {"camp": camp name, "message": records.ChatMessage}
+#   "notification"     a records.Notification
+#   "food_usage"       {"camp": camp name, "camp_id": camp id, "date": "YYYY-MM-DD",
+#                       "units": units added (negative when removed)}
+
+_subscribers = {}  # topic -> [callbacks]
+
+
+def subscribe(topic, callback):
+    """Call callback(payload) on every publish of `topic`; returns an unsubscribe function."""
+    _subscribers.setdefault(topic, []).append(callback)
+
+    def unsubscribe():
+        callbacks = _subscribers.get(topic, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    return unsubscribe
+
+
+def publish(topic, payload=None):
+    for callback in list(_subscribers.get(topic, [])):
+        callback(payload)
+
+
+def file_signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch(widget, signature, on_change, interval=1000):
+    """Poll `signature()` every `interval` ms on a Tk widget and call
+    on_change() when it differs, so writes from other CampTrack processes
+    reach open windows. Stops by itself when the widget is destroyed.
+    """
+    state = {"last": signature()}
+
+    def tick():
+        if not widget.winfo_exists():
+            return
+        current = signature()
+        if current != state["last"]:
+            state["last"] = current
+            on_change()
+        widget.after(interval, tick)
+
+    widget.after(interval, tick)
+
+
+def subscribe_while_open(widget, topic, callback):
+    """subscribe() for the lifetime of a Tk widget."""
+    unsubscribe = subscribe(topic, callback)
+    widget.bind("<Destroy>", lambda event: unsubscribe() if event.widget is widget else None, add="+")
+    return unsubscribe
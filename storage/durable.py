@@ -0,0 +1,167 @@
+import atexit
+import json
+import os
+import tempfile
+import threading
+from storage import serialization
+from storage.locking import file_lock
+
+# Crash-safe writes for the data files.
+#
+# write_bytes()/write_text()/write_json() replace a whole file: the new contents go to a
+# temp file in the same folder, which is fsynced and renamed over the old
+# one, so readers (and a restart after a crash) see either the old file or
+# the new one, never half of one. append_lines() adds to a log and fsyncs it.
+#
+# fsync is what makes a save durable, and also what makes it slow. With a
+# flush delay (set_flush_delay, or CAMPTRACK_FLUSH_DELAY_MS) the fsyncs of
+# log appends and of the folders holding renamed files are deferred and
+# done together once per delay, so a burst of saves costs one flush. The
+# data itself is written (and visible to readers) straight away; a crash
+# can lose at most the last delay's worth of appends. CAMPTRACK_FSYNC=0
+# turns fsync off entirely (renames stay atomic).
+
+FSYNC = os.environ.get("CAMPTRACK_FSYNC", "1") != "0"
+
+_flush_delay = int(os.environ.get("CAMPTRACK_FLUSH_DELAY_MS", "0")) / 1000
+_pending = set()  # paths (files or folders) written but not yet fsynced
+_timer = None
+_lock = threading.Lock()
+
+# mkstemp makes 0600 files; new data files get the usual umask-based mode
+_umask = os.umask(0)
+os.umask(_umask)
+
+
+def set_flush_delay(ms):
+    """Coalesce fsyncs over `ms` milliseconds (0: fsync on every write)."""
+    global _flush_delay
+    flush()
+    _flush_delay = ms / 1000
+
+
+def _fsync_path(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # removed since, or a folder on a platform that cannot open one
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _sync(path):
+    """fsync `path` now, or queue it for the next coalesced flush."""
+    global _timer
+    if not FSYNC:
+        return
+    if not _flush_delay:
+        _fsync_path(path)
+        return
+    with _lock:
+        _pending.add(path)
+        if _timer is None:
+            _timer = threading.Timer(_flush_delay, flush)
+            _timer.daemon = True
+            _timer.start()
+
+
+def flush():
+    """fsync everything queued by coalesced writes."""
+    global _timer
+    with _lock:
+        paths = list(_pending)
+        _pending.clear()
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    # files before folders, so a rename is only made durable with its contents
+    for path in sorted(paths, key=os.path.isdir):
+        _fsync_path(path)
+
+
+atexit.register(flush)
+
+
+def write_bytes(path, data):
+    """Atomically replace `path` with `data`."""
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            try:
+                os.chmod(tmp, os.stat(path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp, 0o666 & ~_umask)
+            file.write(data)
+            file.flush()
+            if FSYNC:
+                os.fsync(file.fileno())  # contents must be on disk before the rename
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    _sync(folder)
+
+
+def write_text(path, text):
+    write_bytes(path, text.encode())
+
+
+def write_json(path, data):
+    """Write a JSON document in the configured format (see storage.serialization)."""
+    write_bytes(path, serialization.encode(data))
+
+
+class VersionConflict(Exception):
+    """The file kept changing under update_json() on every attempt."""
+
+
+def _version(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+def update_json(path, mutate, default, retries=5):
+    """Read-modify-write a JSON file without losing other processes' writes.
+
+    mutate(data) changes the loaded data in place and returns a result
+    (passed back to the caller). It runs under file_lock(path), and the
+    file's version (inode, mtime, size) is checked again before writing;
+    if a writer that does not take the lock got in between, the update is
+    redone on the new contents. A missing or unreadable file starts from
+    default().
+    """
+    with file_lock(path):
+        for _ in range(retries):
+            version = _version(path)
+            try:
+                data = serialization.read_file(path)
+            except (FileNotFoundError, json.JSONDecodeError):
+                data = default()
+            result = mutate(data)
+            if _version(path) == version:
+                write_json(path, data)
+                return result
+    raise VersionConflict(path)
+
+
+def append_lines(path, lines):
+    """Append lines (without their newlines) to a log file in one write."""
+    created = not os.path.exists(path)
+    with open(path, "a") as file:
+        file.write("".join(line + "\n" for line in lines))
+        file.flush()
+        if FSYNC and not _flush_delay:
+            os.fsync(file.fileno())
+    if _flush_delay:
+        _sync(path)
+    if created:
+        _sync(os.path.dirname(os.path.abspath(path)))
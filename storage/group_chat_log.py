@@ -0,0 +1,81 @@
+import json
+import os
+from urllib.parse import quote
+from storage import durable, serialization
+from utils import data_path
+
+# One append-only JSON Lines file per camp under data/group_chats/, so
+# posting a message writes one line and loading camps never reads chat.
+# Files are named after the camp's permanent id, so renames leave them be
+# and camps sharing a name keep separate chats; older files named after
+# the camp are moved over once (see camp_log.load_records).
+CHAT_DIR = data_path("group_chats")
+
+
+def chat_path(camp_id):
+    # quote() keeps the file name a single, reversible path component
+    return os.path.join(CHAT_DIR, quote(camp_id, safe="") + ".jsonl")
+
+
+def signature(camp_id):
+    """(mtime, size) of a camp's chat log, None if it has no messages yet."""
+    try:
+        st = os.stat(chat_path(camp_id))
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def load(camp_id, start=0):
+    """Messages of a camp's chat, skipping the first `start` of them.
+
+    A torn last line (crash mid-append) is ignored.
+    """
+    path = chat_path(camp_id)
+    if not os.path.exists(path):
+        return []
+    messages = []
+    with open(path, "r") as file:
+        for i, line in enumerate(file):
+            if i < start:
+                continue
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                messages.append(serialization.loads(line))
+            except json.JSONDecodeError:
+                break
+    return messages
+
+
+def append(camp_id, message):
+    os.makedirs(CHAT_DIR, exist_ok=True)
+    durable.append_lines(chat_path(camp_id), [serialization.dumps_line(message)])
+
+
+def write(camp_id, messages):
+    """Replace a camp's chat log (used when migrating old camp records)."""
+    os.makedirs(CHAT_DIR, exist_ok=True)
+    durable.write_text(chat_path(camp_id), "".join(serialization.dumps_line(m) + "\n" for m in messages))
+
+
+def adopt(camp_name, camp_id):
+    """Move a chat log still named after its camp to the camp's id.
+
+    Never replaces an existing log; returns True if the file was moved.
+    """
+    old, new = chat_path(camp_name), chat_path(camp_id)
+    if not os.path.exists(old) or os.path.exists(new):
+        return False
+    os.replace(old, new)
+    return True
+
+
+def delete(camp_id):
+    if os.path.exists(chat_path(camp_id)):
+        os.remove(chat_path(camp_id))
+
+
+def exists(camp_id):
+    return os.path.exists(chat_path(camp_id))
@@ -0,0 +1,42 @@
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: only threads of this process are kept apart
+    fcntl = None
+
+# Advisory locks shared by every CampTrack process using the same data/.
+# file_lock(path) takes an exclusive fcntl lock on "<path>.lock" for the
+# length of a read-modify-write, so a save never works from a copy of the
+# file that another process changed underneath it. The lock is re-entrant
+# within a process (flock would block on a second descriptor of our own).
+
+_locks = {}  # lock file path -> [threading.RLock, depth, fd]
+_locks_guard = threading.Lock()
+
+
+def _entry(path):
+    key = os.path.abspath(path) + ".lock"
+    with _locks_guard:
+        return key, _locks.setdefault(key, [threading.RLock(), 0, None])
+
+
+@contextmanager
+def file_lock(path):
+    key, entry = _entry(path)
+    with entry[0]:
+        if entry[1] == 0 and fcntl is not None:
+            fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o666)
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            entry[2] = fd
+        entry[1] += 1
+        try:
+            yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and entry[2] is not None:
+                fcntl.flock(entry[2], fcntl.LOCK_UN)
+                os.close(entry[2])
+                entry[2] = None
@@ -0,0 +1,230 @@
+import bisect
+import json
+import os
+from records import ChatMessage
+from storage import change_feed, durable, serialization
+from storage.locking import file_lock
+
+
+def pair_key(a, b):
+    """Order-independent key for the conversation between two users."""
+    return (a, b) if a <= b else (b, a)
+
+
+class MessageLog:
+    """Append-only JSON Lines store for direct messages.
+
+    Each line is either a message ({"from", "to", "text", "timestamp",
+    "read"}, held as a records.ChatMessage) or a read marker ({"type":
+    "read", "to", "from"}) that marks every earlier message from "from" to
+    "to" as read. The whole file is
+    parsed once; after that only lines appended since the last look are
+    read, so other sessions' messages are picked up cheaply. Records seen
+    for the first time that way are published on the change feed.
+
+    Writes hold file_lock(path). Compaction (in mark_read) first reads what
+    other sessions appended, so their messages are carried over, not dropped.
+    """
+
+    # rewrite the log once this many read markers have piled up
+    COMPACT_MARKERS = 500
+
+    def __init__(self, path, legacy_path=None):
+        self.path = path
+        self.legacy_path = legacy_path  # old {"messages": [...]} file, migrated once
+        self._reset()
+
+    def _reset(self):
+        self.messages = []
+        self.by_pair = {}       # pair_key -> [messages], kept in timestamp order
+        self.pair_stamps = {}   # pair_key -> [timestamps], parallel to by_pair for bisecting
+        self.partners_of = {}   # username -> {usernames they have messaged with}
+        self.unread = {}        # recipient -> {sender: unread count}
+        self.markers = 0
+        self._offset = 0
+        self._inode = None
+        self._mtime = None
+        self._tail = b""  # the last line read, which must still end at _offset
+
+    # ---------- loading ----------
+
+    def _migrate_legacy(self):
+        if os.path.exists(self.path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            messages = serialization.read_file(self.legacy_path).get("messages", [])
+        except (json.JSONDecodeError, AttributeError):
+            messages = []
+        self.rewrite(messages)
+
+    def refresh(self):
+        """Bring the in-memory index up to date with the file."""
+        self._migrate_legacy()
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._inode is not None:
+                self._reset()
+                change_feed.publish("messages_reset")
+            return
+        if st.st_ino == self._inode and st.st_size == self._offset and st.st_mtime_ns == self._mtime:
+            return
+        # only records appended to a log we already hold are news
+        publish = self._inode is not None
+        data = None
+        if st.st_ino == self._inode and st.st_size >= self._offset:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset - len(self._tail))
+                data = f.read()
+        # a rewrite can get the inode number of the file it replaced, so the
+        # file is only ours if the last line we read is still where it was
+        if data is None or not data.startswith(self._tail):
+            self._reset()  # file was rewritten; start over
+            self._inode = st.st_ino
+            if publish:
+                change_feed.publish("messages_reset")
+            publish = False
+            with open(self.path, "rb") as f:
+                data = f.read()
+        else:
+            data = data[len(self._tail):]
+        self._mtime = st.st_mtime_ns
+        news = []
+
+        end = data.rfind(b"\n") + 1  # leave a half-written last line for next time
+        if end:
+            self._tail = data[data.rfind(b"\n", 0, end - 1) + 1:end]
+        for line in data[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = serialization.loads(line)
+            except json.JSONDecodeError:
+                continue
+            record = self._apply(record)
+            if publish:
+                news.append(record)
+        self._offset += end
+
+        # publish only once the index is consistent: subscribers may call back in
+        for record in news:
+            if record.get("type") == "read":
+                change_feed.publish("message_read", {"to": record["to"], "from": record["from"]})
+            else:
+                change_feed.publish("message", record)
+
+    def _apply(self, record):
+        """Index one parsed line; returns it as kept (messages become ChatMessage)."""
+        if record.get("type") == "read":
+            self.markers += 1
+            self._mark_read_in_memory(record["to"], record["from"])
+            return record
+        msg = ChatMessage.from_dict(record)
+        sender, recipient = msg.sender, msg.recipient
+        self.messages.append(msg)
+        self._insert_sorted(pair_key(sender, recipient), msg)
+        self.partners_of.setdefault(sender, set()).add(recipient)
+        self.partners_of.setdefault(recipient, set()).add(sender)
+        if msg.read is False:
+            senders = self.unread.setdefault(recipient, {})
+            senders[sender] = senders.get(sender, 0) + 1
+        return msg
+
+    def _insert_sorted(self, key, record):
+        thread = self.by_pair.setdefault(key, [])
+        stamps = self.pair_stamps.setdefault(key, [])
+        ts = record.timestamp or ""
+        if not stamps or ts >= stamps[-1]:
+            thread.append(record)  # the usual case: newest message
+            stamps.append(ts)
+        else:
+            i = bisect.bisect_right(stamps, ts)
+            thread.insert(i, record)
+            stamps.insert(i, ts)
+
+    def _mark_read_in_memory(self, username, other):
+        if not self.unread.get(username, {}).get(other):
+            return
+        for msg in self.by_pair.get(pair_key(username, other), []):
+            if msg.sender == other and msg.recipient == username and msg.read is False:
+                msg.read = True
+        del self.unread[username][other]
+
+    # ---------- writing ----------
+
+    def _append_line(self, record):
+        durable.append_lines(self.path, [serialization.dumps_line(record)])
+
+    def append(self, message):
+        with file_lock(self.path):
+            self.refresh()
+            self._append_line(message)
+            self.refresh()
+
+    def mark_read(self, username, other):
+        """Mark messages from `other` to `username` read; returns True if any were unread."""
+        with file_lock(self.path):
+            self.refresh()
+            if not self.unread_count(username, other):
+                return False
+            self._append_line({"type": "read", "to": username, "from": other})
+            self.refresh()
+            if self.markers >= self.COMPACT_MARKERS:
+                self._rewrite(self.messages)
+            return True
+
+    def rewrite(self, messages):
+        """Replace the whole log with `messages` (read flags baked in)."""
+        with file_lock(self.path):
+            self._rewrite(messages)
+
+    def _rewrite(self, messages):
+        durable.write_text(self.path, "".join(serialization.dumps_line(msg) + "\n" for msg in messages))
+        had_state = self._inode is not None
+        self._reset()
+        self.refresh()
+        if had_state:
+            change_feed.publish("messages_reset")
+
+    # ---------- queries ----------
+
+    def thread(self, a, b):
+        self.refresh()
+        return list(self.by_pair.get(pair_key(a, b), []))
+
+    def thread_page(self, a, b, limit, before=None, offset=0):
+        """Up to `limit` messages of a thread, newest last.
+
+        Takes the newest messages older than timestamp `before` (or the
+        newest overall), skipping the `offset` newest of those. Returns
+        (messages, has_more) where has_more means older messages remain.
+        """
+        self.refresh()
+        key = pair_key(a, b)
+        thread = self.by_pair.get(key, [])
+        end = len(thread) if before is None else bisect.bisect_left(self.pair_stamps.get(key, []), before)
+        end = max(end - offset, 0)
+        start = max(end - limit, 0)
+        return thread[start:end], start > 0
+
+    def partners(self, username):
+        self.refresh()
+        return set(self.partners_of.get(username, ()))
+
+    def unread_count(self, username, other=None):
+        """Unread messages sent to `username` (only from `other` if given)."""
+        self.refresh()
+        senders = self.unread.get(username, {})
+        if other is None:
+            return sum(senders.values())
+        return senders.get(other, 0)
+
+    def unread_counts(self, username):
+        """{sender: unread count} for everyone with unread messages to `username`."""
+        self.refresh()
+        return dict(self.unread.get(username, {}))
+
+    def all(self):
+        self.refresh()
+        return list(self.messages)
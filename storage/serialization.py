@@ -0,0 +1,101 @@
+import gzip
+import json
+import os
+from records import Record
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from compression import zstd  # stdlib from Python 3.14
+except ImportError:
+    zstd = None
+
+# On-disk format of the whole-file JSON documents (camp_data.json,
+# notifications.json, food_requirements.json), set by CAMPTRACK_JSON_FORMAT:
+#   pretty   json.dumps(indent=4), as the files have always been (default)
+#   compact  no indentation or spaces
+#   gzip     compact, gzip-compressed
+#   zstd     compact, zstd-compressed (Python 3.14+; gzip otherwise)
+# Files keep their names whatever the format; read_file() tells them apart
+# by their first bytes, so switching formats needs no migration. orjson is
+# used for compact output and for all parsing when it is installed.
+# Typed records (see records.py) are written as their to_dict().
+#
+# The append-only logs (camp_changes.jsonl, messages.jsonl, group chats)
+# stay one compact JSON object per line so they can still be appended to
+# and read incrementally.
+
+FORMATS = ("pretty", "compact", "gzip", "zstd")
+FORMAT = os.environ.get("CAMPTRACK_JSON_FORMAT", "pretty")
+if FORMAT not in FORMATS:
+    raise ValueError(f"CAMPTRACK_JSON_FORMAT must be one of {', '.join(FORMATS)}, not {FORMAT!r}")
+if FORMAT == "zstd" and zstd is None:
+    FORMAT = "gzip"
+
+GZIP_LEVEL = 6
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _default(obj):
+    """JSON object for the typed records (records.Record) nested in the data."""
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def loads(data):
+    """Parse JSON from str or bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_line(record):
+    """One compact JSON line (without the newline) for the append-only logs."""
+    return json.dumps(record, separators=(",", ":"), default=_default)
+
+
+def encode(data, fmt=None):
+    """Bytes of `data` in `fmt` (default: the configured FORMAT)."""
+    fmt = fmt or FORMAT
+    if fmt == "pretty":
+        return json.dumps(data, indent=4, default=_default).encode()
+    if orjson is not None:
+        raw = orjson.dumps(data, default=_default,
+                           option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS)
+    else:
+        raw = json.dumps(data, separators=(",", ":"), default=_default).encode()
+    if fmt == "gzip":
+        return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    if fmt == "zstd":
+        if zstd is None:
+            raise ValueError("zstd needs Python 3.14 or later")
+        return zstd.compress(raw)
+    return raw
+
+
+def decode(blob):
+    """Inverse of encode() for any format.
+
+    Raises json.JSONDecodeError if the data (or its compression) is corrupted.
+    """
+    try:
+        if blob[:2] == _GZIP_MAGIC:
+            blob = gzip.decompress(blob)
+        elif blob[:4] == _ZSTD_MAGIC:
+            if zstd is None:
+                raise OSError("file is zstd-compressed; reading it needs Python 3.14 or later")
+            blob = zstd.decompress(blob)
+    except (OSError, EOFError, ValueError) as exc:
+        raise json.JSONDecodeError(f"cannot decompress: {exc}", "", 0) from exc
+    return loads(blob)
+
+
+def read_file(path):
+    """Load a JSON document written in any of the formats."""
+    with open(path, "rb") as file:
+        return decode(file.read())
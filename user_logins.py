@@ -1,59 +1,179 @@
+import os
+from storage import durable
+from storage.locking import file_lock
+from passwords import hash_password, hash_passwords, is_hashed, needs_rehash, verify_password
+
+# 'password' holds a passwords.hash_password() string, never the password itself
 users = {
     'admin': [],
     'scout leader': [],
     'logistics coordinator': []
 }
 
+_by_username = {}  # username -> {role: user dict}, rebuilt on every load/save
+_loaded_signature = None  # (mtime, size) of logins.txt when it was last read
+
+
+class DisabledAccounts:
+    """The set of disabled usernames kept in disabled_logins.txt.
+
+    Checks are set lookups. The file (comma-separated names) is re-read
+    only when its mtime/size differ from what was last read or written,
+    and every change is one write to a temp file that replaces it. Changes
+    are made under file_lock() on top of a fresh read, so admins in other
+    sessions cannot undo each other's changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._names = set()
+        self._signature = None
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _refresh(self):
+        signature = self._stat()
+        if signature == self._signature:
+            return
+        try:
+            with open(self.path, 'r') as file:
+                self._names = {u.strip() for u in file.read().split(',') if u.strip()}
+        except FileNotFoundError:
+            self._names = set()
+        self._signature = signature
+
+    def _write(self, names):
+        durable.write_text(self.path, ''.join(name + ',' for name in sorted(names)))
+        self._names = names
+        self._signature = self._stat()
+
+    def is_disabled(self, username):
+        self._refresh()
+        return bool(username) and username in self._names
+
+    def names(self):
+        self._refresh()
+        return sorted(self._names)
+
+    def disable(self, *usernames):
+        """Disable every given user with a single write; returns the names newly disabled."""
+        with file_lock(self.path):
+            self._refresh()
+            added = {u for u in usernames if u} - self._names
+            if added:
+                self._write(self._names | added)
+            return added
+
+    def enable(self, *usernames):
+        """Enable every given user with a single write; returns the names that were disabled."""
+        with file_lock(self.path):
+            self._refresh()
+            removed = self._names & set(usernames)
+            if removed:
+                self._write(self._names - removed)
+            return removed
+
+    def rename(self, old, new):
+        with file_lock(self.path):
+            self._refresh()
+            if old in self._names:
+                self._write((self._names - {old}) | {new})
+
+
+disabled_accounts = DisabledAccounts('disabled_logins.txt')
+
 
 def disabled_logins(username):
-    with open('disabled_logins.txt', 'a') as file:
-        file.write(username + ',')
+    disabled_accounts.disable(username)
 
 
 def check_disabled_logins(username):
-    try:
-        with open('disabled_logins.txt', 'r') as file:
-            disabled = file.read()
-            disabled_usernames = [u for u in disabled.split(',') if u]
-            if username and username in disabled_usernames:
-                return True
-    except FileNotFoundError:
-        return False
-    return False
+    return disabled_accounts.is_disabled(username)
 
 
 def enable_login(username):
-    try:
-        with open('disabled_logins.txt', 'r') as file:
-            disabled = file.read()
-            disabled_usernames = disabled.split(',')
+    return bool(disabled_accounts.enable(username))
+
+
+def _index_users():
+    _by_username.clear()
+    for role, role_users in users.items():
+        for user in role_users:
+            _by_username.setdefault(user['username'], {}).setdefault(role, user)
+
 
-            if username in disabled_usernames:
-                disabled_usernames.remove(username)
+def _hash_plaintext():
+    """Hash any password still stored as plain text; True if there were any."""
+    plain = [user for role_users in users.values() for user in role_users if not is_hashed(user['password'])]
+    for user, hashed in zip(plain, hash_passwords(user['password'] for user in plain)):
+        user['password'] = hashed
+    return bool(plain)
 
-                with open('disabled_logins.txt', 'w') as file:
-                    if disabled_usernames:
-                        file.write(','.join(disabled_usernames) + ',')
-                    else:
-                        file.write('')
 
-                return True
+def _file_signature():
+    try:
+        st = os.stat('logins.txt')
     except FileNotFoundError:
-        return False
-    return False
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def find_user(username, role=None):
+    """(role, user dict) for a username, or (None, None). Without `role`,
+    the first role it has (admin, scout leader, logistics coordinator)."""
+    roles = _by_username.get(username, {})
+    if role is None:
+        return next(iter(roles.items()), (None, None))
+    return (role, roles[role]) if role in roles else (None, None)
+
+
+def set_password(user, password):
+    user['password'] = hash_password(password)
+
+
+def verify_login(username, password, role=None):
+    """The role `username` logs in as with `password` (must be `role` if
+    given), or None. Hashes made with an older cost are upgraded."""
+    user_role, user = find_user(username, role)
+    if user is None:
+        return None
+    if not verify_password(password, user['password']):
+        return None
+    if needs_rehash(user['password']):
+        set_password(user, password)
+        save_logins()
+    return user_role
 
 
 def save_logins():
-    with open('logins.txt', 'w') as file:
-        for admin in users['admin']:
-            file.write(f"admin,{admin['username']},{admin['password']}\n")
-        for leader in users['scout leader']:
-            file.write(f"scout leader,{leader['username']},{leader['password']}\n")
-        for coordinator in users['logistics coordinator']:
-            file.write(f"logistics coordinator,{coordinator['username']},{coordinator['password']}\n")
+    global _loaded_signature
+    _hash_plaintext()
+    lines = []
+    for admin in users['admin']:
+        lines.append(f"admin,{admin['username']},{admin['password']}\n")
+    for leader in users['scout leader']:
+        lines.append(f"scout leader,{leader['username']},{leader['password']}\n")
+    for coordinator in users['logistics coordinator']:
+        lines.append(f"logistics coordinator,{coordinator['username']},{coordinator['password']}\n")
+    durable.write_text('logins.txt', ''.join(lines))
+    _index_users()
+    _loaded_signature = _file_signature()
 
 
 def load_logins():
+    """(Re)read logins.txt unless it is unchanged since the last load/save.
+
+    Plain-text passwords from older files are hashed and written back.
+    """
+    global _loaded_signature
+    signature = _file_signature()
+    if signature is not None and signature == _loaded_signature:
+        return
     try:
         with open('logins.txt', 'r') as file:
             lines = file.readlines()
@@ -79,8 +199,13 @@ def load_logins():
                     users['scout leader'].append({'username': username, 'password': password})
                 elif role == 'logistics coordinator':
                     users['logistics coordinator'].append({'username': username, 'password': password})
+            if _hash_plaintext():
+                save_logins()
+            else:
+                _loaded_signature = signature
             if not users['admin']:
-                users['admin'].append({'username': 'admin', 'password': ''})
+                users['admin'].append({'username': 'admin', 'password': hash_password('')})
+            _index_users()
 
     except FileNotFoundError:
         print('\n logins.txt not found')
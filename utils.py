@@ -5,7 +5,8 @@ import os
 #and exist_ok=True avoids errors if it already exists.
 #It’s just a guard to prevent “No such file or directory” on first run.
 
-DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+# CAMPTRACK_DATA_DIR points a session at another data folder (used by benchmarks/concurrency_stress.py)
+DATA_DIR = os.environ.get("CAMPTRACK_DATA_DIR") or os.path.join(os.path.dirname(__file__), "data")
 os.makedirs(DATA_DIR, exist_ok=True)
 
 # func to build full paths to files in the data directory